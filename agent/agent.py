@@ -1,6 +1,8 @@
 from env_simulator.kb import KnowledgeBase as KB
+from env_simulator.sat_kb import SATKnowledgeBase
 from env_simulator.environment import WumpusEnvironment
 from env_simulator.risk_calculator import RiskCalculator
+from env_simulator.events import log
 
 DIRECTION = {
 	"E": 0, "S": 1, "W": 2, "N": 3,
@@ -24,6 +26,11 @@ SCORE = {
 		"esc!": 0
 	}
 
+KB_BACKENDS = {
+	"rules": KB,				# forward chaining over the compiled rule table
+	"sat": SATKnowledgeBase,	# rules plus SAT entailment over the frontier
+}
+
 class Agent:
 	score = 0
 	alive = True
@@ -31,13 +38,15 @@ class Agent:
 	gold_obtain = False
 	position = (0, 0)
 	direction = "E" #East
+	# False when a step pipeline runs the KB's inference pass itself: perceive() and shoot() then only add facts
+	infer_on_update = True
 
-	def __init__(self, environment: WumpusEnvironment, N=8):
+	def __init__(self, environment: WumpusEnvironment, N=8, kb_backend="rules", risk_mode="heuristic"):
 		wumpus_count = environment.get_wumpus_count()
-		self.kb = KB(N=N, wumpus=wumpus_count)
+		self.kb = KB_BACKENDS[kb_backend](N=N, wumpus=wumpus_count)
 		self.N = N
 		self.environment = environment  # No direct map access - only through environment interface
-		self.risk_calculator = RiskCalculator(N)
+		self.risk_calculator = RiskCalculator(N, mode=risk_mode, wumpus_count=wumpus_count)
 		
 		# Initialize starting position as safe
 		i, j = self.position
@@ -48,9 +57,8 @@ class Agent:
 			f"~P({i}, {j})",
 			f"Safe({i}, {j})"
 		)
-		self.kb.forward_chain()
 		
-		# Initial perception
+		# Initial perception (its inference pass covers the facts above too)
 		self.perceive()
 
 	def perceive(self):
@@ -63,36 +71,24 @@ class Agent:
 			self.alive = False
 			self.score += SCORE["die"]
 			if "Death_Wumpus" in percepts:
-				print(f"Agent killed by Wumpus at {self.position}!")
+				log.info("death", "Agent killed by Wumpus at {position}!", position=self.position)
 			if "Death_Pit" in percepts:
-				print(f"Agent fell into pit at {self.position}!")
+				log.info("death", "Agent fell into pit at {position}!", position=self.position)
 			return
 		
-		# Process normal percepts
-		if "Stench" in percepts:
-			self.kb.add_fact(f"S({i}, {j})")
-		else:
-			self.kb.add_fact(f"~S({i}, {j})")
-
-		if "Breeze" in percepts:
-			self.kb.add_fact(f"B({i}, {j})")
-		else:
-			self.kb.add_fact(f"~B({i}, {j})")
-		
-		if "Glitter" in percepts:
-			self.kb.add_fact(f"G({i}, {j})")
-		else:
-			self.kb.add_fact(f"~G({i}, {j})")
-		
 		# Update risk calculator
 		self.risk_calculator.update_perception(self.position, percepts)
 		
-		# Mark current position as safe (agent didn't die)
-		self.kb.add_fact(f"~P({i}, {j})")
-		self.kb.add_fact(f"~W({i}, {j})")
-		self.kb.add_fact(f"Safe({i}, {j})")
-		
-		self.kb.forward_chain()
+		# Normal percepts, and the current position is safe (agent didn't die): one batch, one inference pass
+		tell = self.kb.tell if self.infer_on_update else self.kb.add_fact
+		tell(
+			f"S({i}, {j})" if "Stench" in percepts else f"~S({i}, {j})",
+			f"B({i}, {j})" if "Breeze" in percepts else f"~B({i}, {j})",
+			f"G({i}, {j})" if "Glitter" in percepts else f"~G({i}, {j})",
+			f"~P({i}, {j})",
+			f"~W({i}, {j})",
+			f"Safe({i}, {j})"
+		)
 
 
 	def move_forward(self):
@@ -101,11 +97,11 @@ class Agent:
 
 		move = MOVE[self.direction]
 		i, j = (self.position[0] + move[0], self.position[1] + move[1])
-		print(f"Agent is trying to move {self.direction} to {(i, j)}.")
+		log.debug("move", "Agent is trying to move {direction} to {target}.", direction=self.direction, target=(i, j))
 		self.score += SCORE["move"]
 		
 		if not self.environment.is_valid_position((i, j)):
-			print("Agent cannot move out of bounds.")
+			log.debug("move", "Agent cannot move out of bounds.")
 			return False
 		
 		# Move to the position first
@@ -142,7 +138,7 @@ class Agent:
 		if self.environment.grab_gold(self.position):
 			self.gold_obtain = True
 			self.score += SCORE["grab"]
-			print(f"Grabbed gold at {self.position}!")
+			log.info("gold", "Grabbed gold at {position}!", position=self.position)
 			return True
 		return False
 
@@ -151,7 +147,7 @@ class Agent:
 			return None
 		
 		if self.arrow_hit != 0:
-			print("No arrows left!")
+			log.debug("arrow", "No arrows left!")
 			return False
 
 		self.score += SCORE["shoot"]
@@ -176,11 +172,12 @@ class Agent:
 				i += mi
 				j += mj
 			
-			self.kb.forward_chain()
+			if self.infer_on_update:
+				self.kb.forward_chain()
 			return True
 		else:
 			self.arrow_hit = -1
-			print("Arrow missed!")
+			log.info("arrow", "Arrow missed!")
 			return False
 
 	def escape(self):
@@ -258,7 +255,7 @@ class Agent:
 
 # Agent for Search algorithm
 class Agent2:
-	def __init__(self, position=(0, 0), direction="E", alive=True, arrow_hit=0, gold_obtain=False, N=8, kb=None, risk_calculator=None, wumpus_count=2):
+	def __init__(self, position=(0, 0), direction="E", alive=True, arrow_hit=0, gold_obtain=False, N=8, kb=None, risk_calculator=None, wumpus_count=2, risk_mode="heuristic"):
 		self.position = position
 		self.direction = direction
 		self.alive = alive
@@ -281,7 +278,7 @@ class Agent2:
 			self.kb = kb
 		
 		if risk_calculator is None:
-			self.risk_calculator = RiskCalculator(N)
+			self.risk_calculator = RiskCalculator(N, mode=risk_mode, wumpus_count=wumpus_count)
 		else:
 			self.risk_calculator = risk_calculator
 
@@ -313,7 +310,7 @@ class Agent2:
 		return f"(pos{self.position},direction={self.direction},gold={self.gold_obtain},arrow={self.arrow_hit})"
 	
 	def clone(self):
-		from copy import deepcopy
+		# kb and risk calculator are copy-on-write, a search node only pays for the facts it changes
 		return Agent2(
 			position=self.position,
 			direction=self.direction,
@@ -321,8 +318,8 @@ class Agent2:
 			arrow_hit=self.arrow_hit,
 			gold_obtain=self.gold_obtain,
 			N=self.N,
-			kb=deepcopy(self.kb),
-			risk_calculator=deepcopy(self.risk_calculator)
+			kb=self.kb.copy(),
+			risk_calculator=self.risk_calculator.copy()
 		)
 	
 	def perceive(self, percepts):
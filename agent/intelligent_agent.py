@@ -4,6 +4,7 @@ Uses probability calculations to make safe decisions and explore efficiently
 """
 
 from agent.agent import Agent2
+from env_simulator.events import log
 
 class IntelligentAgent:
     def __init__(self, base_agent, max_risk_threshold=0.3):
@@ -35,7 +36,7 @@ class IntelligentAgent:
         
         # Detect loop - if stuck in same position or oscillating
         if self.stuck_counter > 3 or self._detect_loop():
-            print("Loop detected - trying to break free")
+            log.debug("explore", "Loop detected - trying to break free")
             return self._break_free_from_loop()
         
         # Update visited positions
@@ -79,7 +80,7 @@ class IntelligentAgent:
     
     def _break_free_from_loop(self):
         """Try to break free from detected loop"""
-        print(f"Breaking free from loop at {self.agent.position}")
+        log.debug("explore", "Breaking free from loop at {position}", position=self.agent.position)
         
         # Try shooting first if available
         if self.agent.arrow_hit == 0:
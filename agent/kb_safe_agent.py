@@ -2,13 +2,26 @@ from agent.intelligent_agent import IntelligentAgent
 
 import re
 from typing import List, Tuple, Set
-from search.kb_pathfinding import kb_safe_astar, kb_safe_dijkstra, find_best_kb_safe_path
+from search.kb_pathfinding import kb_safe_astar, kb_safe_dijkstra, find_best_kb_safe_path, KBSafeDStarLite
+from search.distance_field import DistanceField
+from env_simulator.events import log, DEBUG
+from agent.agent import MOVE
+
+# 'step' re-runs perception, inference and planning every step(); 'macro' commits to the whole
+# path home and walks it move by move without replanning (see _follow_committed_plan)
+EXECUTION_MODES = ("step", "macro")
+
+# (di, dj) -> direction letter
+MOVE_DIRECTION = {delta: direction for direction, delta in MOVE.items()}
 
 class KnowledgeBaseSafeAgent:
     """Pure Knowledge Base agent - only moves to cells that KB confirms as safe"""
 
     def __init__(self, base_agent, max_risk_threshold=1.0):
         self.agent = base_agent
+        # facts learned while acting (percepts after a move, a shot) are inferred on at the start
+        # of the next step(), in its single pass
+        self.agent.infer_on_update = False
         self.max_risk_threshold = max_risk_threshold  # Not used, for compatibility
         self.agent_type_name = 'KB-Safe Agent'
         self.visited_positions = set()
@@ -20,15 +33,48 @@ class KnowledgeBaseSafeAgent:
         # Always use Dijkstra algorithm for optimal KB-safe pathfinding
         self.pathfinding_algorithm = 'dijkstra'
         
+        # Distances to (0,0) over KB-safe cells, kept up to date as the safe set grows
+        self.home_distances = DistanceField((0, 0), base_agent.environment.N)
+        
+        # 'dstar_lite': one planner per target, reused while the agent keeps heading there
+        self.dstar_planners = {}
+        self.max_dstar_planners = 32
+        
+        # remaining path to the current exploration target: (target, KB safety_version, cells),
+        # reused while the KB's safe cells stay the same
+        self.plan_cache = None
+        self.plan_cache_hits = 0
+        
+        # inference passes the KB ran during the last step(): 1, or 0 if the step taught it nothing new
+        self.step_inference_passes = 0
+        
+        # one of EXECUTION_MODES; in 'macro' mode committed_plan is (KB safety_version, cells from
+        # the current position to (0,0)) while the agent walks a committed path home
+        self.execution_mode = 'step'
+        self.committed_plan = None
+        self.committed_steps = 0
+        
     def _find_path_with_algorithm(self, start_pos, target_pos, kb_safe_set):
         """Find path using selected pathfinding algorithm"""
         if self.pathfinding_algorithm == 'astar':
             return kb_safe_astar(start_pos, target_pos, kb_safe_set, self.visited_positions, self.agent.environment.N)
         elif self.pathfinding_algorithm == 'dijkstra':
             return kb_safe_dijkstra(start_pos, target_pos, kb_safe_set, self.visited_positions, self.agent.environment.N)
+        elif self.pathfinding_algorithm == 'dstar_lite':
+            return self._dstar_lite_planner(target_pos).plan(start_pos, kb_safe_set, self.visited_positions)
         else:  # BFS fallback
             return self._bfs_pathfind(start_pos, target_pos, kb_safe_set)
     
+    def _dstar_lite_planner(self, target_pos):
+        """D* Lite planner for target_pos, dropping the least recently used one when there are too many"""
+        planner = self.dstar_planners.pop(target_pos, None)
+        if planner is None:
+            planner = KBSafeDStarLite(target_pos, self.agent.environment.N)
+            if len(self.dstar_planners) >= self.max_dstar_planners:
+                del self.dstar_planners[next(iter(self.dstar_planners))]
+        self.dstar_planners[target_pos] = planner
+        return planner
+    
     def _bfs_pathfind(self, start_pos, target_pos, kb_safe_set):
         """Basic BFS pathfinding for fallback"""
         from collections import deque
@@ -70,13 +116,19 @@ class KnowledgeBaseSafeAgent:
             
         current_pos = self.agent.position
         self.visited_positions.add(current_pos)
+        self.agent.kb.mark_visited(current_pos)
         
-        # Force perception update at current position
-        self.agent.perceive()
+        # Macro mode: keep walking the committed plan while nothing contradicts it
+        if self.committed_plan is not None:
+            result = self._follow_committed_plan()
+            if result is not None:
+                return result
         
-        # Update KB with current percepts and deduce new safe positions
-        self._update_kb_with_current_percepts()
-        self._deduce_safe_positions_from_kb()
+        # Everything learned this step goes into the KB as one batch: a single inference pass
+        passes = self.agent.kb.inference_passes
+        with self.agent.kb.batch():
+            self._ingest_step_facts()
+        self.step_inference_passes = self.agent.kb.inference_passes - passes
         
         # Get current percepts
         percepts = []
@@ -84,13 +136,13 @@ class KnowledgeBaseSafeAgent:
         if current_percepts:
             percepts = current_percepts
             
-        print(f"At {current_pos}, percepts: {percepts}")
+        log.debug("percept", "At {current_pos}, percepts: {percepts}", current_pos=current_pos, percepts=percepts)
         
         # Check for gold at current position
         if "Glitter" in percepts and not self.agent.gold_obtain:
             if self.agent.grab_gold():
                 self.returning_home = True
-                print(f"🏆 FOUND AND GRABBED GOLD at {self.agent.position}!")
+                log.info("gold", "🏆 FOUND AND GRABBED GOLD at {position}!", position=self.agent.position)
                 return True, f"Grabbed gold at {self.agent.position}! Now returning home safely."
         
         # Check if reached home with gold
@@ -98,10 +150,10 @@ class KnowledgeBaseSafeAgent:
             # Call escape to get the appropriate bonus points
             self.agent.escape()
             if self.agent.gold_obtain:
-                print(f"🏠 Successfully returned home with gold! Final score: {self.agent.score}")
+                log.info("home", "🏠 Successfully returned home with gold! Final score: {score}", score=self.agent.score)
                 return False, f"Successfully returned home with gold! Final score: {self.agent.score}"
             else:
-                print(f"🏠 Successfully returned home safely! Final score: {self.agent.score}")
+                log.info("home", "🏠 Successfully returned home safely! Final score: {score}", score=self.agent.score)
                 return False, f"Successfully returned home safely! Final score: {self.agent.score}"
         
         # If returning home, use safe path finding to get back to (0,0)
@@ -110,6 +162,16 @@ class KnowledgeBaseSafeAgent:
         
         return self._explore_with_kb()
         
+    def _ingest_step_facts(self):
+        """Add this step's facts to the KB; step() runs it inside kb.batch(), so the
+        forward_chain() calls made on the way are deferred to one pass at the end"""
+        # Force perception update at current position
+        self.agent.perceive()
+        
+        # Update KB with current percepts and deduce new safe positions
+        self._update_kb_with_current_percepts()
+        self._deduce_safe_positions_from_kb()
+        
     def _explore_with_kb(self):
         """Explore using only KB-confirmed safe positions"""
         
@@ -117,121 +179,121 @@ class KnowledgeBaseSafeAgent:
         actions = self.agent.get_safe_moves()  # This gives us all adjacent moves
         
         if not actions:
-            print("NO ADJACENT MOVES AVAILABLE - STOPPING")
+            log.warning("explore", "NO ADJACENT MOVES AVAILABLE - STOPPING")
             self.exploration_complete = True
             return False, "No adjacent moves available"
         
-        print(f"Analyzing moves from {self.agent.position}...")
+        log.debug("explore", "Analyzing moves from {position}...", position=self.agent.position)
         
         # First priority: KB-confirmed safe unvisited positions
         kb_safe_unvisited = []
         for pos, direction, risk in actions:
             if pos not in self.visited_positions and self._is_kb_safe(pos):
                 kb_safe_unvisited.append((pos, direction, risk))
-                print(f"  {pos} -> KB SAFE & UNVISITED")
+                log.debug("explore", "  {pos} -> KB SAFE & UNVISITED", pos=pos)
             elif pos not in self.visited_positions:
-                print(f"  {pos} -> UNVISITED but not KB-confirmed safe")
+                log.debug("explore", "  {pos} -> UNVISITED but not KB-confirmed safe", pos=pos)
             else:
-                print(f"  {pos} -> VISITED")
+                log.debug("explore", "  {pos} -> VISITED", pos=pos)
         
         if kb_safe_unvisited:
             pos, direction, risk = kb_safe_unvisited[0]
             success = self._move_direction(direction)
             self.navigation_attempts = 0  # Reset navigation attempts when finding new safe positions
-            print(f"Moving to KB-safe unvisited {pos}")
+            log.info("move", "Moving to KB-safe unvisited {pos}", pos=pos)
             return success, f"Moving to KB-safe unvisited {pos}"
         
         # Check if we can reach other KB-safe positions by using pathfinding
-        print("Checking for KB-safe positions to navigate to...")
+        log.debug("explore", "Checking for KB-safe positions to navigate to...")
         target_pos, path = self._find_path_to_kb_safe_positions()
         
         if target_pos and path and self.navigation_attempts < self.max_navigation_attempts:
-            print(f"Found path to unvisited KB-safe position {target_pos}: {path}")
+            log.debug("plan", "Found path to unvisited KB-safe position {target_pos}: {path}", target_pos=target_pos, path=path)
             # Move to the first position in the path
             next_pos = path[0]
             for pos, direction, risk in actions:
                 if pos == next_pos:
                     success = self._move_direction(direction)
                     self.navigation_attempts += 1
-                    print(f"  Following path: moving to {next_pos} (step {self.navigation_attempts}/{len(path)})")
+                    log.info("move", "  Following path: moving to {next_pos} (step {navigation_attempts}/{path_length})", next_pos=next_pos, navigation_attempts=self.navigation_attempts, path_length=len(path))
                     return success, f"Following path to KB-safe {target_pos}: step {self.navigation_attempts}"
         
         # Alternative: Check for any unvisited KB-safe position we can reach
         if not target_pos or not path:
-            print("Searching for any reachable KB-safe positions...")
-            all_kb_safe = self._get_all_kb_safe_positions()
-            unvisited_kb_safe = [pos for pos in all_kb_safe if pos not in self.visited_positions]
-            
-            for unvisited_pos in unvisited_kb_safe:
+            log.debug("explore", "Searching for any reachable KB-safe positions...")
+            for unvisited_pos in self._get_unvisited_kb_safe_positions():
                 found_target, found_path = self._find_path_to_specific_position(unvisited_pos)
                 if found_target and found_path and self.navigation_attempts < self.max_navigation_attempts:
-                    print(f"Found alternative path to {found_target}: {found_path}")
+                    log.debug("plan", "Found alternative path to {found_target}: {found_path}", found_target=found_target, found_path=found_path)
                     # Move to the first position in the path
                     next_pos = found_path[0]
                     for pos, direction, risk in actions:
                         if pos == next_pos:
                             success = self._move_direction(direction)
                             self.navigation_attempts += 1
-                            print(f"  Alternative path: moving to {next_pos} (step 1/{len(found_path)})")
+                            log.info("move", "  Alternative path: moving to {next_pos} (step 1/{path_length})", next_pos=next_pos, path_length=len(found_path))
                             return success, f"Alternative path to KB-safe {found_target}: step 1"
         
         if target_pos and path:
-            print(f"  Found path but navigation attempts exhausted ({self.navigation_attempts}/{self.max_navigation_attempts})")
+            log.debug("plan", "  Found path but navigation attempts exhausted ({navigation_attempts}/{max_navigation_attempts})", navigation_attempts=self.navigation_attempts, max_navigation_attempts=self.max_navigation_attempts)
         else:
-            print(f"  No path found to unvisited KB-safe positions")
+            log.debug("plan", "  No path found to unvisited KB-safe positions")
         
         # Second priority: Navigation through visited KB-safe positions to reach unvisited ones
         if self._has_reachable_kb_safe_positions() and self.navigation_attempts < self.max_navigation_attempts:
-            print("Searching for path through KB-safe visited positions...")
+            log.debug("explore", "Searching for path through KB-safe visited positions...")
             kb_safe_visited = []
             for pos, direction, risk in actions:
                 if pos in self.visited_positions and self._is_kb_safe(pos):
                     kb_safe_visited.append((pos, direction, risk))
-                    print(f"  {pos} -> KB SAFE & VISITED (for navigation)")
+                    log.debug("explore", "  {pos} -> KB SAFE & VISITED (for navigation)", pos=pos)
             
             if kb_safe_visited:
                 pos, direction, risk = kb_safe_visited[0]
                 success = self._move_direction(direction)
                 self.navigation_attempts += 1
-                print(f"Navigating via KB-safe visited {pos} [attempt {self.navigation_attempts}]")
+                log.info("move", "Navigating via KB-safe visited {pos} [attempt {navigation_attempts}]", pos=pos, navigation_attempts=self.navigation_attempts)
                 return success, f"Navigating via KB-safe visited {pos}"
         
         # Try shooting Wumpus to open new paths - Enhanced strategy
         if hasattr(self.agent, 'arrow_hit') and self.agent.arrow_hit == 0:
-            print("Trying enhanced Wumpus hunting to open new KB-safe paths...")
+            log.debug("hunt", "Trying enhanced Wumpus hunting to open new KB-safe paths...")
             wumpus_hunt_result = self._try_enhanced_wumpus_hunting()
             if wumpus_hunt_result:
                 return True, wumpus_hunt_result
         
         # Before stopping exploration, try to return home safely if not already at (0,0)
         if self.agent.position != (0, 0):
-            print("NO MORE KB-SAFE EXPLORATION OPTIONS - ATTEMPTING TO RETURN HOME SAFELY")
-            print(f"Current position: {self.agent.position}, attempting to return to (0,0)")
+            log.info("explore", "NO MORE KB-SAFE EXPLORATION OPTIONS - ATTEMPTING TO RETURN HOME SAFELY")
+            log.debug("explore", "Current position: {position}, attempting to return to (0,0)", position=self.agent.position)
             
             # Check if there's a safe path home
-            home_target, home_path = self._find_path_to_specific_position((0, 0))
-            if home_target and home_path:
-                print(f"Found safe path home: {home_path}")
+            self.home_distances.sync(self._get_kb_safe_set(), self.visited_positions)
+            if self.home_distances.is_reachable(self.agent.position):
+                if log.enabled(DEBUG):
+                    log.debug("plan", "Found safe path home: {path}", path=self.home_distances.path_from(self.agent.position)[1:])
                 self.returning_home = True  # Set returning home flag
                 return self._return_home_safely()
             else:
-                print("⚠️ No safe path home found!")
-                print(f"Final visited positions: {sorted(list(self.visited_positions))}")
-                print(f"Total positions explored: {len(self.visited_positions)}")
+                log.warning("home", "⚠️ No safe path home found!")
+                if log.enabled(DEBUG):
+                    log.debug("explore", "Final visited positions: {visited}", visited=sorted(self.visited_positions))
+                log.debug("explore", "Total positions explored: {visited_count}", visited_count=len(self.visited_positions))
                 self._analyze_kb_state()
                 self.exploration_complete = True
                 return False, "Exploration complete - no safe path home available"
         else:
-            print("NO MORE KB-SAFE EXPLORATION OPTIONS AND ALREADY AT HOME")
-            print(f"Final visited positions: {sorted(list(self.visited_positions))}")
-            print(f"Total positions explored: {len(self.visited_positions)}")
+            log.info("explore", "NO MORE KB-SAFE EXPLORATION OPTIONS AND ALREADY AT HOME")
+            if log.enabled(DEBUG):
+                log.debug("explore", "Final visited positions: {visited}", visited=sorted(self.visited_positions))
+            log.debug("explore", "Total positions explored: {visited_count}", visited_count=len(self.visited_positions))
             self._analyze_kb_state()
             self.exploration_complete = True
             return False, "Exploration complete - already at home (0,0)"
         
     def _return_home_safely(self):
-        """Return to (0,0) using selected pathfinding algorithm through KB-confirmed safe positions"""
-        print(f"🏠 Returning home safely from {self.agent.position} to (0,0) using {self.pathfinding_algorithm.upper()}")
+        """Return to (0,0) by following the home distance field through KB-confirmed safe positions"""
+        log.info("home", "🏠 Returning home safely from {position} to (0,0) using DISTANCE FIELD", position=self.agent.position)
         
         start_pos = self.agent.position
         target_pos = (0, 0)
@@ -239,51 +301,86 @@ class KnowledgeBaseSafeAgent:
         if start_pos == target_pos:
             return False, "Already at home!"
         
-        # Get all KB-safe positions
-        kb_safe_positions = set(self._get_all_kb_safe_positions())
-        
-        # Use selected pathfinding algorithm
-        path = self._find_path_with_algorithm(start_pos, target_pos, kb_safe_positions)
+        # Get all KB-safe positions; the field only relaxes the cells whose distance changed
+        self.home_distances.sync(self._get_kb_safe_set(), self.visited_positions)
         
-        if path and len(path) > 1:
-            next_pos = path[1]  # Skip current position
-            print(f"  🗺️ {self.pathfinding_algorithm.upper()} found path to home: {path[:5]}{'...' if len(path) > 5 else ''}")
+        next_pos = self.home_distances.next_step(start_pos)
+        if next_pos is not None:
+            total_steps = self.home_distances.steps_to_source(start_pos)
+            if log.enabled(DEBUG):
+                log.debug("plan", "  🗺️ Distance field path to home: {path}{more}",
+                          path=self.home_distances.path_from(start_pos, limit=5), more='...' if total_steps > 4 else '')
             
             # Find direction to next position
             actions = self.agent.get_safe_moves()
             for pos, direction, risk in actions:
                 if pos == next_pos:
-                    success = self._move_direction(direction)
-                    remaining_steps = len(path) - 2
-                    print(f"  Moving home: {start_pos} -> {next_pos} (remaining: {remaining_steps} steps)")
-                    
-                    # Check if we reached home
-                    if next_pos == target_pos:
-                        self.agent.escape()
-                        if self.agent.gold_obtain:
-                            print(f"🏠 Successfully reached home with gold! Final score: {self.agent.score}")
-                            return False, f"Successfully reached home with gold at (0,0)! Final score: {self.agent.score}"
-                        else:
-                            print(f"🏠 Successfully reached home safely! Final score: {self.agent.score}")
-                            return False, f"Successfully reached home safely at (0,0)! Final score: {self.agent.score}"
-                    
-                    return success, f"Returning home safely via {self.pathfinding_algorithm.upper()}: step of {len(path)-1} total steps"
+                    if self.execution_mode == 'macro':
+                        # commit to the rest of the path; the next steps walk it without replanning
+                        self.committed_plan = (self.agent.kb.safety_version, self.home_distances.path_from(next_pos))
+                    return self._move_home(next_pos, direction, total_steps)
         
         # No safe path found - stay put and end game
-        print(f"⚠️ No safe {self.pathfinding_algorithm.upper()} path home found! Staying at current position.")
+        log.warning("home", "⚠️ No safe path home found! Staying at current position.")
         self.exploration_complete = True
         return False, "No safe path home available - mission incomplete"
 
+    def _move_home(self, next_pos, direction, total_steps):
+        """Move one cell along the path home, escaping once (0,0) is reached"""
+        start_pos = self.agent.position
+        success = self._move_direction(direction)
+        remaining_steps = total_steps - 1
+        log.info("move", "  Moving home: {start_pos} -> {next_pos} (remaining: {remaining_steps} steps)", start_pos=start_pos, next_pos=next_pos, remaining_steps=remaining_steps)
+        
+        # Check if we reached home
+        if next_pos == (0, 0):
+            self.committed_plan = None
+            self.agent.escape()
+            if self.agent.gold_obtain:
+                log.info("home", "🏠 Successfully reached home with gold! Final score: {score}", score=self.agent.score)
+                return False, f"Successfully reached home with gold at (0,0)! Final score: {self.agent.score}"
+            else:
+                log.info("home", "🏠 Successfully reached home safely! Final score: {score}", score=self.agent.score)
+                return False, f"Successfully reached home safely at (0,0)! Final score: {self.agent.score}"
+        
+        return success, f"Returning home safely via distance field: step of {total_steps} total steps"
+
+    def _follow_committed_plan(self):
+        """Take the next move of the committed plan home, or drop the plan and return None
+        
+        The plan stays valid while the KB's safe cells are unchanged and the last move taught
+        the KB nothing (move_forward() perceives into the KB without inferring, so a percept
+        that is new or contradicts what the KB knew leaves it dirty). A dropped plan sends
+        step() through the full pipeline, which infers and plans again.
+        """
+        version, path = self.committed_plan
+        position = self.agent.position
+        kb = self.agent.kb
+        if version != kb.safety_version or kb.dirty or len(path) < 2 or path[0] != position:
+            log.debug("plan", "Dropping committed plan at {position}", position=position)
+            self.committed_plan = None
+            return None
+        
+        next_pos = path[1]
+        self.committed_plan = (version, path[1:])
+        self.committed_steps += 1
+        direction = MOVE_DIRECTION[(next_pos[0] - position[0], next_pos[1] - position[1])]
+        return self._move_home(next_pos, direction, len(path) - 1)
+
     def _find_path_to_kb_safe_positions(self):
         """Use A* to find optimal path to any unvisited KB-safe position"""
-        all_kb_safe_positions = self._get_all_kb_safe_positions()
-        unvisited_kb_safe = [pos for pos in all_kb_safe_positions if pos not in self.visited_positions]
+        cached = self._cached_plan()
+        if cached:
+            self.plan_cache_hits += 1
+            return cached
+        
+        unvisited_kb_safe = self._get_unvisited_kb_safe_positions()
         
         if not unvisited_kb_safe:
             return None, None  # No unvisited KB-safe positions
             
         # Get all KB-safe positions as set
-        kb_safe_set = set(all_kb_safe_positions)
+        kb_safe_set = self._get_kb_safe_set()
         
         # Find best path using A*
         result = find_best_kb_safe_path(
@@ -298,22 +395,42 @@ class KnowledgeBaseSafeAgent:
         if result:
             best_target, best_path = result
             if len(best_path) > 1:
+                self.plan_cache = (best_target, self.agent.kb.safety_version, best_path)
                 # Return target and path excluding current position
                 return best_target, best_path[1:]
         
+        self.plan_cache = None
         return None, None
-
-    def _get_all_kb_safe_positions(self):
-        """Get all positions that KB has confirmed as safe"""
-        kb_safe_positions = []
-        
-        # Check all positions in the grid (not just nearby ones)
-        for i in range(self.agent.environment.N):
-            for j in range(self.agent.environment.N):
-                if self._is_kb_safe((i, j)):
-                    kb_safe_positions.append((i, j))
+    
+    def _cached_plan(self):
+        """Rest of the last exploration path if the KB's safe cells have not changed since it was planned
         
-        return kb_safe_positions
+        Returns (target, path excluding current position) like _find_path_to_kb_safe_positions,
+        or None when the path has to be planned again.
+        """
+        if self.plan_cache is None:
+            return None
+        target, version, path = self.plan_cache
+        position = self.agent.position
+        if position in path:
+            # drop the cells already walked
+            path = path[path.index(position):]
+        else:
+            path = None
+        if (path is None or len(path) < 2 or version != self.agent.kb.safety_version
+                or target in self.visited_positions or not self._is_kb_safe(path[1])):
+            self.plan_cache = None
+            return None
+        self.plan_cache = (target, version, path)
+        return target, path[1:]
+
+    def _get_kb_safe_set(self):
+        """Set of all positions that KB has confirmed as safe, read from the KB's safe-cell index"""
+        return self.agent.kb.safe_cells | self.visited_positions
+    
+    def _get_unvisited_kb_safe_positions(self):
+        """KB-safe positions not visited yet, in row-major order"""
+        return sorted(self.agent.kb.unvisited_safe_cells)
     
     def _update_kb_with_current_percepts(self):
         """Update KB with current position's percepts"""
@@ -379,7 +496,7 @@ class KnowledgeBaseSafeAgent:
             
             if no_wumpus and no_pit:
                 self.agent.kb.add_fact(f"Safe({adj_i},{adj_j})")
-                print(f"  Deduced ({adj_i},{adj_j}) is SAFE from KB inference")
+                log.debug("kb", "  Deduced ({adj_i},{adj_j}) is SAFE from KB inference", adj_i=adj_i, adj_j=adj_j)
         
         # Run forward chaining again after deductions
         self.agent.kb.forward_chain()
@@ -392,16 +509,8 @@ class KnowledgeBaseSafeAgent:
         if position in self.visited_positions:
             return True
         
-        # ONLY use KB's definitive safe conclusions
-        # Check if KB has explicitly concluded this position is safe
-        if f"Safe({i},{j})" in self.agent.kb.facts:
-            return True
-            
-        # Check if KB has definitive negative facts about both dangers
-        no_wumpus = self.agent.kb.is_premise_true(f"~W({i},{j})") == True
-        no_pit = self.agent.kb.is_premise_true(f"~P({i},{j})") == True
-        
-        if no_wumpus and no_pit:
+        # ONLY use KB's definitive safe conclusions: a Safe fact, or both ~W and ~P
+        if position in self.agent.kb.safe_cells:
             return True
         
         # For starting position neighbors with no danger signals, allow movement
@@ -412,7 +521,7 @@ class KnowledgeBaseSafeAgent:
                 self.agent.kb.add_fact(f"~W({i},{j})")
                 self.agent.kb.add_fact(f"~P({i},{j})")
                 self.agent.kb.forward_chain()
-                print(f"  {position} -> KB UPDATED SAFE (no danger signals at start)")
+                log.debug("kb", "  {position} -> KB UPDATED SAFE (no danger signals at start)", position=position)
                 return True
         
         return False
@@ -421,9 +530,8 @@ class KnowledgeBaseSafeAgent:
     def _has_reachable_kb_safe_positions(self):
         """Check if there are unvisited KB-safe positions reachable through visited KB-safe positions"""
         
-        # Get all KB-safe positions and check if any unvisited ones are reachable
-        all_kb_safe = self._get_all_kb_safe_positions()
-        unvisited_kb_safe = [pos for pos in all_kb_safe if pos not in self.visited_positions]
+        # Get all unvisited KB-safe positions and check if any of them is reachable
+        unvisited_kb_safe = self._get_unvisited_kb_safe_positions()
         
         if not unvisited_kb_safe:
             return False
@@ -442,8 +550,7 @@ class KnowledgeBaseSafeAgent:
             return target_pos, []
         
         # Get all KB-safe positions
-        all_kb_safe = self._get_all_kb_safe_positions()
-        kb_safe_set = set(all_kb_safe)
+        kb_safe_set = self._get_kb_safe_set()
         
         # Use selected pathfinding algorithm
         path = self._find_path_with_algorithm(self.agent.position, target_pos, kb_safe_set)
@@ -476,7 +583,10 @@ class KnowledgeBaseSafeAgent:
         
     def _analyze_kb_state(self):
         """Analyze current KB state and show safe/dangerous positions"""
-        print("\n=== KB STATE ANALYSIS ===")
+        if not log.enabled(DEBUG):
+            return
+        
+        log.debug("analysis", "\n=== KB STATE ANALYSIS ===")
         
         kb_safe_positions = []
         kb_dangerous_positions = []
@@ -494,38 +604,38 @@ class KnowledgeBaseSafeAgent:
                 else:
                     kb_unknown_positions.append((pos, "UNKNOWN"))
         
-        print("KB-Safe positions:")
+        log.debug("analysis", "KB-Safe positions:")
         for pos, status in kb_safe_positions:
-            print(f"  {pos}: {status}")
+            log.debug("analysis", "  {pos}: {status}", pos=pos, status=status)
         
-        print("KB-Dangerous positions:")
+        log.debug("analysis", "KB-Dangerous positions:")
         for pos, status in kb_dangerous_positions:
-            print(f"  {pos}: {status}")
+            log.debug("analysis", "  {pos}: {status}", pos=pos, status=status)
             
-        print("KB-Unknown positions:")
+        log.debug("analysis", "KB-Unknown positions:")
         for pos, status in kb_unknown_positions:
-            print(f"  {pos}: {status}")
+            log.debug("analysis", "  {pos}: {status}", pos=pos, status=status)
         
-        print(f"\nSummary:")
-        print(f"  KB-Safe: {len(kb_safe_positions)}")
-        print(f"  KB-Dangerous: {len(kb_dangerous_positions)}")
-        print(f"  KB-Unknown: {len(kb_unknown_positions)}")
-        print(f"  Visited: {len(self.visited_positions)}")
+        log.debug("analysis", "\nSummary:")
+        log.debug("analysis", "  KB-Safe: {kb_safe_positions_count}", kb_safe_positions_count=len(kb_safe_positions))
+        log.debug("analysis", "  KB-Dangerous: {kb_dangerous_positions_count}", kb_dangerous_positions_count=len(kb_dangerous_positions))
+        log.debug("analysis", "  KB-Unknown: {kb_unknown_positions_count}", kb_unknown_positions_count=len(kb_unknown_positions))
+        log.debug("analysis", "  Visited: {visited_count}", visited_count=len(self.visited_positions))
         
         # Show which KB-Safe positions were not visited
         unvisited_safe = [pos for pos, status in kb_safe_positions if status == "KB_SAFE"]
         if unvisited_safe:
-            print(f"\n⚠️  KB-Safe positions NOT visited:")
+            log.debug("analysis", "\n⚠️  KB-Safe positions NOT visited:")
             for pos in unvisited_safe:
                 reachable_target, reachable_path = self._find_path_to_specific_position(pos)
                 reachable_status = "REACHABLE" if reachable_target else "NOT REACHABLE"
-                print(f"    {pos}: {reachable_status}")
+                log.debug("analysis", "    {pos}: {reachable_status}", pos=pos, reachable_status=reachable_status)
         else:
-            print(f"\n✅ ALL KB-Safe positions were visited!")
+            log.debug("analysis", "\n✅ ALL KB-Safe positions were visited!")
             
         # Show summary of Safe facts in KB  
         safe_facts = [f for f in self.agent.kb.facts if 'Safe(' in f and not f.startswith('~')]
-        print(f"\nKB Safe Facts Summary: {len(safe_facts)} total")
+        log.debug("analysis", "\nKB Safe Facts Summary: {safe_facts_count} total", safe_facts_count=len(safe_facts))
         # Remove duplicates and show unique positions
         unique_safe_positions = set()
         for fact in safe_facts:
@@ -534,10 +644,10 @@ class KnowledgeBaseSafeAgent:
             if match:
                 pos = (int(match.group(1)), int(match.group(2)))
                 unique_safe_positions.add(pos)
-        print(f"Unique Safe positions in KB: {len(unique_safe_positions)}")
+        log.debug("analysis", "Unique Safe positions in KB: {unique_safe_positions_count}", unique_safe_positions_count=len(unique_safe_positions))
         for pos in sorted(unique_safe_positions):
             visited_status = "VISITED" if pos in self.visited_positions else "NOT VISITED"
-            print(f"  {pos}: {visited_status}")
+            log.debug("analysis", "  {pos}: {visited_status}", pos=pos, visited_status=visited_status)
         
     def _face_direction(self, target_direction):
         """Turn to face the target direction"""
@@ -560,7 +670,7 @@ class KnowledgeBaseSafeAgent:
         
         # Check if we have arrows left
         if self.agent.arrow_hit > 0:
-            print("  🚫 No arrows left - cannot hunt Wumpus")
+            log.debug("hunt", "  🚫 No arrows left - cannot hunt Wumpus")
             return None
         
         # Step 1: Find all known Wumpus positions from KB
@@ -574,23 +684,23 @@ class KnowledgeBaseSafeAgent:
                     known_wumpus_positions.append(wumpus_pos)
         
         if not known_wumpus_positions:
-            print("  ℹ️ No known Wumpus positions found in KB")
+            log.debug("hunt", "  ℹ️ No known Wumpus positions found in KB")
             return None
             
-        print(f"  🎯 Found {len(known_wumpus_positions)} known Wumpus positions: {known_wumpus_positions}")
+        log.debug("hunt", "  🎯 Found {known_wumpus_positions_count} known Wumpus positions: {known_wumpus_positions}", known_wumpus_positions_count=len(known_wumpus_positions), known_wumpus_positions=known_wumpus_positions)
         
         # Step 2: For each known Wumpus, find safe shooting positions
         for wumpus_pos in known_wumpus_positions:
             shooting_plan = self._find_safe_shooting_position(wumpus_pos)
             if shooting_plan:
                 shooting_pos, target_pos, direction = shooting_plan
-                print(f"  📍 Found shooting plan: Move to {shooting_pos}, face {direction}, shoot Wumpus at {target_pos}")
+                log.debug("hunt", "  📍 Found shooting plan: Move to {shooting_pos}, face {direction}, shoot Wumpus at {target_pos}", shooting_pos=shooting_pos, direction=direction, target_pos=target_pos)
                 
                 # Step 3: Execute the shooting plan
                 if self._execute_shooting_plan(shooting_pos, target_pos, direction):
                     return f"Successfully hunted Wumpus at {target_pos} - new paths opened!"
         
-        print("  ❌ No safe shooting positions found for known Wumpus")
+        log.debug("hunt", "  ❌ No safe shooting positions found for known Wumpus")
         return None
     
     def _find_safe_shooting_position(self, wumpus_pos):
@@ -628,7 +738,7 @@ class KnowledgeBaseSafeAgent:
         
         # If not at shooting position, move there first
         if self.agent.position != shooting_pos:
-            print(f"  🚶‍♂️ Moving to shooting position {shooting_pos}")
+            log.debug("hunt", "  🚶‍♂️ Moving to shooting position {shooting_pos}", shooting_pos=shooting_pos)
             path_target, path = self._find_path_to_specific_position(shooting_pos)
             if path and len(path) > 0:
                 # Move to first position in path
@@ -638,29 +748,29 @@ class KnowledgeBaseSafeAgent:
                     if pos == next_pos:
                         success = self._move_direction(direction)
                         if success:
-                            print(f"    ✅ Moved to {next_pos} on way to shooting position")
+                            log.debug("hunt", "    ✅ Moved to {next_pos} on way to shooting position", next_pos=next_pos)
                             return f"Moving to shooting position {shooting_pos}"
                         break
             return None
         
         # Now at shooting position, face the Wumpus and shoot
-        print(f"  🎯 At shooting position {shooting_pos}, targeting Wumpus at {target_pos}")
+        log.debug("hunt", "  🎯 At shooting position {shooting_pos}, targeting Wumpus at {target_pos}", shooting_pos=shooting_pos, target_pos=target_pos)
         self._face_direction(shoot_direction)
         
         # Shoot the arrow
         if hasattr(self.agent, 'shoot') and self.agent.arrow_hit == 0:
             shot_success = self.agent.shoot()
             if shot_success:
-                print(f"  🏹 Successfully shot Wumpus at {target_pos}!")
+                log.info("hunt", "  🏹 Successfully shot Wumpus at {target_pos}!", target_pos=target_pos)
                 
                 # Update KB - mark Wumpus as dead and affected areas as safe
                 self._update_kb_after_wumpus_kill(target_pos)
                 return True
             else:
-                print(f"  ❌ Arrow missed Wumpus at {target_pos}")
+                log.info("hunt", "  ❌ Arrow missed Wumpus at {target_pos}", target_pos=target_pos)
                 return False
         else:
-            print(f"  🚫 Cannot shoot: arrow_hit={self.agent.arrow_hit}")
+            log.debug("hunt", "  🚫 Cannot shoot: arrow_hit={arrow_hit}", arrow_hit=self.agent.arrow_hit)
         
         return False
     
@@ -670,12 +780,12 @@ class KnowledgeBaseSafeAgent:
         
         # Mark Wumpus position as no longer having Wumpus
         self.agent.kb.add_fact(f"~W({wi},{wj})")
-        print(f"    📝 Updated KB: Wumpus at ({wi},{wj}) is dead")
+        log.debug("kb", "    📝 Updated KB: Wumpus at ({wi},{wj}) is dead", wi=wi, wj=wj)
         
         # Mark Wumpus position as safe (no Wumpus, and pits can't be in same cell as Wumpus)
         self.agent.kb.add_fact(f"~P({wi},{wj})")
         self.agent.kb.add_fact(f"Safe({wi},{wj})")
-        print(f"    ✅ Updated KB: ({wi},{wj}) is now SAFE")
+        log.debug("kb", "    ✅ Updated KB: ({wi},{wj}) is now SAFE", wi=wi, wj=wj)
         
         # Update adjacent cells - remove stench caused by this Wumpus
         adjacent_positions = [
@@ -695,20 +805,19 @@ class KnowledgeBaseSafeAgent:
                 # If no other Wumpus nearby, remove stench
                 if not other_wumpus_nearby:
                     self.agent.kb.add_fact(f"~S({adj_i},{adj_j})")
-                    print(f"    📝 Updated KB: No stench at ({adj_i},{adj_j}) - Wumpus killed")
+                    log.debug("kb", "    📝 Updated KB: No stench at ({adj_i},{adj_j}) - Wumpus killed", adj_i=adj_i, adj_j=adj_j)
                     
                     # If no breeze either, mark as safe
                     if self.agent.kb.is_premise_true(f"~B({adj_i},{adj_j})") == True:
                         self.agent.kb.add_fact(f"~P({adj_i},{adj_j})")
                         self.agent.kb.add_fact(f"Safe({adj_i},{adj_j})")
-                        print(f"    ✅ Updated KB: ({adj_i},{adj_j}) is now SAFE (no stench, no breeze)")
+                        log.debug("kb", "    ✅ Updated KB: ({adj_i},{adj_j}) is now SAFE (no stench, no breeze)", adj_i=adj_i, adj_j=adj_j)
         
-        # Run forward chaining to deduce new facts
-        self.agent.kb.forward_chain()
+        # No forward chaining here: the next step() infers on these facts in its single pass
         
         # Reset navigation attempts to allow exploring newly safe areas
         self.navigation_attempts = 0
-        print(f"    🔄 Reset navigation attempts - ready to explore newly safe areas")
+        log.debug("kb", "    🔄 Reset navigation attempts - ready to explore newly safe areas")
 
     def get_current_state(self):
         """Get current state of the agent for UI display"""
@@ -720,6 +829,8 @@ class KnowledgeBaseSafeAgent:
             'gold': self.agent.gold_obtain,
             'arrow': self.agent.arrow_hit,
             'visited': list(self.visited_positions),  # Add visited cells for UI display
+            'inference_passes': self.step_inference_passes,
+            'committed_plan': list(self.committed_plan[1]) if self.committed_plan else [],
             'state': 'returning_home' if self.returning_home else ('complete' if self.exploration_complete else 'exploring')
         }
     
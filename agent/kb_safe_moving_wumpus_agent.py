@@ -1,17 +1,21 @@
 # agent/kb_safe_moving_wumpus_agent.py
 from agent.kb_safe_agent import KnowledgeBaseSafeAgent
 from module.moving_Wumpus import update_wumpus_position
+from env_simulator.events import log, DEBUG
 
 class KnowledgeBaseSafeMovingWumpusAgent(KnowledgeBaseSafeAgent):
     """
     Enhanced KB-Safe Agent with Moving Wumpus capability
     - Wumpuses move every 5 actions
-    - Maintains all KB-safe exploration and Dijkstra pathfinding
+    - Maintains all KB-safe exploration, replanning incrementally with D* Lite
     - Adapts to dynamic Wumpus positions
     """
     
     def __init__(self, agent, pathfinding_algorithm='dijkstra'):
         super().__init__(agent, pathfinding_algorithm)
+        # KB facts get retracted as Wumpuses move, so keep a search tree per target and
+        # repair it instead of re-running Dijkstra from scratch (same path costs)
+        self.pathfinding_algorithm = 'dstar_lite'
         
         # Moving Wumpus specific attributes
         self.action_count = 0
@@ -23,9 +27,9 @@ class KnowledgeBaseSafeMovingWumpusAgent(KnowledgeBaseSafeAgent):
         # Initialize Wumpus tracking
         self._initialize_wumpus_tracking()
         
-        print("🐺 KB-Safe Moving Wumpus Agent initialized")
-        print(f"   - Wumpuses will move every {self.wumpus_move_interval} actions")
-        print(f"   - Using {pathfinding_algorithm.upper()} pathfinding")
+        log.info("agent", "🐺 KB-Safe Moving Wumpus Agent initialized")
+        log.debug("agent", "   - Wumpuses will move every {wumpus_move_interval} actions", wumpus_move_interval=self.wumpus_move_interval)
+        log.debug("agent", "   - Using {algorithm} pathfinding", algorithm=self.pathfinding_algorithm.upper())
         
     def _initialize_wumpus_tracking(self):
         """Initialize Wumpus position tracking from environment"""
@@ -41,10 +45,10 @@ class KnowledgeBaseSafeMovingWumpusAgent(KnowledgeBaseSafeAgent):
             self.current_wumpus_positions = wumpus_positions.copy()
             self.wumpus_alive_status = [True] * len(wumpus_positions)
             
-            print(f"   🎯 Tracking {len(wumpus_positions)} Wumpuses: {wumpus_positions}")
+            log.debug("wumpus", "   🎯 Tracking {wumpus_positions_count} Wumpuses: {wumpus_positions}", wumpus_positions_count=len(wumpus_positions), wumpus_positions=wumpus_positions)
             
         except Exception as e:
-            print(f"   ⚠️ Warning: Could not initialize Wumpus tracking: {e}")
+            log.warning("wumpus", "   ⚠️ Warning: Could not initialize Wumpus tracking: {error}", error=e)
             self.initial_wumpus_positions = []
             self.current_wumpus_positions = []
             self.wumpus_alive_status = []
@@ -84,7 +88,7 @@ class KnowledgeBaseSafeMovingWumpusAgent(KnowledgeBaseSafeAgent):
             if target_idx >= 0:
                 dead_wumpus_pos = self.current_wumpus_positions[target_idx]
                 self.wumpus_alive_status[target_idx] = False
-                print(f"   🏹 Wumpus at {dead_wumpus_pos} marked as dead")
+                log.info("wumpus", "   🏹 Wumpus at {dead_wumpus_pos} marked as dead", dead_wumpus_pos=dead_wumpus_pos)
                 
                 # Remove dead Wumpus from environment and update stench
                 self._remove_dead_wumpus_from_environment(dead_wumpus_pos)
@@ -97,7 +101,7 @@ class KnowledgeBaseSafeMovingWumpusAgent(KnowledgeBaseSafeAgent):
         if not self.current_wumpus_positions:
             return
             
-        print(f"\n🐺 === WUMPUS MOVEMENT TIME (Action #{self.action_count}) ===")
+        log.debug("wumpus", "\n🐺 === WUMPUS MOVEMENT TIME (Action #{action_count}) ===", action_count=self.action_count)
         
         # Update which Wumpuses are alive
         self._update_wumpus_alive_status()
@@ -124,7 +128,7 @@ class KnowledgeBaseSafeMovingWumpusAgent(KnowledgeBaseSafeAgent):
                     movements.append(f"{old_pos} → {new_pos}")
             
             if movements:
-                print(f"   🔄 Wumpus movements: {', '.join(movements)}")
+                log.info("wumpus", "   🔄 Wumpus movements: {movements}", movements=', '.join(movements))
                 
                 # Clear and rebuild KB facts about Wumpus positions
                 self._update_kb_after_wumpus_movement()
@@ -132,16 +136,16 @@ class KnowledgeBaseSafeMovingWumpusAgent(KnowledgeBaseSafeAgent):
                 # Verify stench patterns are correctly updated in environment
                 self._verify_stench_patterns()
             else:
-                print("   🏠 No Wumpuses moved this turn")
+                log.debug("wumpus", "   🏠 No Wumpuses moved this turn")
                 
         except Exception as e:
-            print(f"   ⚠️ Error moving Wumpuses: {e}")
+            log.warning("wumpus", "   ⚠️ Error moving Wumpuses: {error}", error=e)
             
-        print("🐺 === END WUMPUS MOVEMENT ===\n")
+        log.debug("wumpus", "🐺 === END WUMPUS MOVEMENT ===\n")
 
     def _update_kb_after_wumpus_movement(self):
         """Update Knowledge Base after Wumpus movement"""
-        print("   🧠 Updating KB after Wumpus movement...")
+        log.debug("kb", "   🧠 Updating KB after Wumpus movement...")
         
         # Step 1: Clear old Wumpus position facts (since they moved)
         self._clear_old_wumpus_facts()
@@ -155,7 +159,20 @@ class KnowledgeBaseSafeMovingWumpusAgent(KnowledgeBaseSafeAgent):
         # Step 4: Re-evaluate dangerous positions based on new stench
         self._reevaluate_safety_status()
         
-        print(f"   ✅ KB updated - agent now aware of new Wumpus positions and dangers")
+        log.debug("kb", "   ✅ KB updated - agent now aware of new Wumpus positions and dangers")
+
+    def _get_kb_safe_set(self):
+        """Positions _is_kb_safe accepts: the KB's safe-cell index minus the dangerous cells,
+        plus starting-area neighbours with no stench around"""
+        dangerous = set(self.agent.kb.get_dangerous_cells())
+        safe = {pos for pos in self.agent.kb.safe_cells if pos not in dangerous}
+        for pos in (0, 1), (1, 0), (1, 1):
+            if pos not in safe and pos not in dangerous and self._is_kb_safe(pos):
+                safe.add(pos)
+        return safe | self.visited_positions
+
+    def _get_unvisited_kb_safe_positions(self):
+        return sorted(self._get_kb_safe_set() - self.visited_positions)
 
     def _is_kb_safe(self, position):
         """Enhanced safety check for Moving Wumpus environment"""
@@ -217,7 +234,7 @@ class KnowledgeBaseSafeMovingWumpusAgent(KnowledgeBaseSafeAgent):
 
     def _rescan_environment_for_new_stenches(self):
         """Only update stench knowledge when agent actually visits positions - no cheating!"""
-        print("   🔍 Checking stench knowledge at visited positions only...")
+        log.debug("stench", "   🔍 Checking stench knowledge at visited positions only...")
         
         new_stench_count = 0
         removed_stench_count = 0
@@ -234,27 +251,27 @@ class KnowledgeBaseSafeMovingWumpusAgent(KnowledgeBaseSafeAgent):
                 # Agent would smell new stench when revisiting this position
                 self.agent.kb.tell(f"S({i},{j})")
                 new_stench_count += 1
-                print(f"     + Agent detects NEW STENCH at visited position {visited_pos}")
+                log.debug("kb", "     + Agent detects NEW STENCH at visited position {visited_pos}", visited_pos=visited_pos)
                 
                 # Try to deduce Wumpus position from this stench
                 self._deduce_wumpus_from_visited_stench(visited_pos)
                 
             elif not has_stench_now and had_stench_in_kb:
                 # Stench gone from visited position
-                self.agent.kb.facts.discard(f"S({i},{j})")
+                self.agent.kb.retract_fact(f"S({i},{j})")
                 self.agent.kb.tell(f"~S({i},{j})")
                 removed_stench_count += 1
-                print(f"     - Stench DISAPPEARED at visited position {visited_pos}")
+                log.debug("stench", "     - Stench DISAPPEARED at visited position {visited_pos}", visited_pos=visited_pos)
         
         if new_stench_count > 0 or removed_stench_count > 0:
-            print(f"   📊 Stench changes at visited positions: +{new_stench_count} new, -{removed_stench_count} removed")
-            print("   🚨 Agent realizes environment has changed!")
+            log.debug("stench", "   📊 Stench changes at visited positions: +{new_stench_count} new, -{removed_stench_count} removed", new_stench_count=new_stench_count, removed_stench_count=removed_stench_count)
+            log.debug("kb", "   🚨 Agent realizes environment has changed!")
         else:
-            print("   📊 No stench changes at previously visited positions")
+            log.debug("stench", "   📊 No stench changes at previously visited positions")
 
     def _deduce_wumpus_from_visited_stench(self, stench_pos):
         """Deduce Wumpus position from stench at a visited position"""
-        print(f"     🧠 Analyzing stench at visited position {stench_pos}...")
+        log.debug("stench", "     🧠 Analyzing stench at visited position {stench_pos}...", stench_pos=stench_pos)
         
         adjacent_positions = self._get_adjacent_positions(stench_pos)
         
@@ -281,19 +298,19 @@ class KnowledgeBaseSafeMovingWumpusAgent(KnowledgeBaseSafeAgent):
             
             if wumpus_fact not in self.agent.kb.facts:
                 self.agent.kb.add_fact(wumpus_fact)
-                print(f"       🎯 DEDUCED Wumpus at {wumpus_pos} from stench at {stench_pos}")
+                log.debug("stench", "       🎯 DEDUCED Wumpus at {wumpus_pos} from stench at {stench_pos}", wumpus_pos=wumpus_pos, stench_pos=stench_pos)
                 
                 # Mark as unsafe
                 self.agent.kb.add_fact(f"~Safe({w_i},{w_j})")
         
         elif len(possible_wumpus_positions) > 1:
-            print(f"       ❓ Multiple possibilities: {possible_wumpus_positions} - no definitive deduction")
+            log.debug("kb", "       ❓ Multiple possibilities: {possible_wumpus_positions} - no definitive deduction", possible_wumpus_positions=possible_wumpus_positions)
         else:
-            print(f"       ℹ️ No possible Wumpus positions found")
+            log.debug("kb", "       ℹ️ No possible Wumpus positions found")
 
     def _invalidate_old_safety_assumptions(self):
         """Invalidate old safety assumptions around previous Wumpus positions"""
-        print("   ❌ Invalidating old safety assumptions...")
+        log.debug("safety", "   ❌ Invalidating old safety assumptions...")
         
         positions_to_recheck = set()
         
@@ -320,16 +337,16 @@ class KnowledgeBaseSafeMovingWumpusAgent(KnowledgeBaseSafeAgent):
                     if pos in positions_to_recheck:
                         facts_to_remove.append(fact)
         
-        # Remove invalidated facts
+        # Remove invalidated facts together with the conclusions derived from them
         for fact in facts_to_remove:
-            self.agent.kb.facts.discard(fact)
-            print(f"     - Removed old assumption: {fact}")
+            self.agent.kb.retract_fact(fact)
+            log.debug("kb", "     - Removed old assumption: {fact}", fact=fact)
         
-        print(f"   🔄 Invalidated {len(facts_to_remove)} old safety assumptions")
+        log.debug("safety", "   🔄 Invalidated {facts_to_remove_count} old safety assumptions", facts_to_remove_count=len(facts_to_remove))
 
     def _reevaluate_safety_status(self):
         """Re-evaluate safety status of all positions based on current KB"""
-        print("   🎯 Re-evaluating safety status...")
+        log.debug("safety", "   🎯 Re-evaluating safety status...")
         
         # Force KB to re-run forward chaining with new facts
         self.agent.kb.forward_chain()
@@ -342,92 +359,53 @@ class KnowledgeBaseSafeMovingWumpusAgent(KnowledgeBaseSafeAgent):
         # Re-deduce safe positions
         self._deduce_safe_positions_from_kb()
         
-        print(f"   📈 Dangerous positions: {old_dangerous_count} → {new_dangerous_count}")
+        log.debug("safety", "   📈 Dangerous positions: {old_dangerous_count} → {new_dangerous_count}", old_dangerous_count=old_dangerous_count, new_dangerous_count=new_dangerous_count)
         
         # Warn if agent's current path might be affected
         current_pos = self.agent.position
         if current_pos in self.agent.kb.get_dangerous_cells():
-            print(f"   ⚠️  WARNING: Agent's current position {current_pos} is now considered dangerous!")
+            log.warning("safety", "   ⚠️  WARNING: Agent's current position {current_pos} is now considered dangerous!", current_pos=current_pos)
         
         # Check if any planned moves are now dangerous
         if hasattr(self, 'current_path') and self.current_path:
             dangerous_path_cells = [pos for pos in self.current_path if pos in self.agent.kb.get_dangerous_cells()]
             if dangerous_path_cells:
-                print(f"   ⚠️  WARNING: Planned path contains dangerous cells: {dangerous_path_cells}")
+                log.warning("safety", "   ⚠️  WARNING: Planned path contains dangerous cells: {dangerous_path_cells}", dangerous_path_cells=dangerous_path_cells)
                 self.current_path = []  # Clear potentially dangerous path
 
     def _remove_dead_wumpus_from_environment(self, dead_wumpus_pos):
         """Remove dead Wumpus from environment and update stench patterns"""
         try:
-            # Remove Wumpus from game map
-            if 'W' in self.agent.environment.game_map[dead_wumpus_pos[0]][dead_wumpus_pos[1]]:
-                self.agent.environment.game_map[dead_wumpus_pos[0]][dead_wumpus_pos[1]].remove('W')
-                print(f"   🗑️ Removed dead Wumpus from map at {dead_wumpus_pos}")
+            # The environment drops the stench no other Wumpus keeps up
+            stenches_removed = self.agent.environment.remove_wumpus(dead_wumpus_pos)
+            log.debug("wumpus", "   🗑️ Removed dead Wumpus from map at {dead_wumpus_pos}", dead_wumpus_pos=dead_wumpus_pos)
             
-            # Update stench patterns - remove stench around dead Wumpus
-            self._update_stench_after_wumpus_death(dead_wumpus_pos)
+            self._update_stench_after_wumpus_death(stenches_removed)
             
         except Exception as e:
-            print(f"   ⚠️ Error removing dead Wumpus: {e}")
+            log.warning("wumpus", "   ⚠️ Error removing dead Wumpus: {error}", error=e)
     
-    def _update_stench_after_wumpus_death(self, dead_wumpus_pos):
-        """Update stench patterns after Wumpus death"""
-        N = self.agent.environment.N
-        
-        # Get adjacent positions to dead Wumpus
-        adjacent_positions = []
-        for di, dj in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            ni, nj = dead_wumpus_pos[0] + di, dead_wumpus_pos[1] + dj
-            if 0 <= ni < N and 0 <= nj < N:
-                adjacent_positions.append((ni, nj))
-        
-        # For each adjacent position, check if stench should be removed
-        stenches_removed = []
-        for adj_pos in adjacent_positions:
-            i, j = adj_pos
-            
-            if 'S' not in self.agent.environment.game_map[i][j]:
-                continue  # No stench to remove
-            
-            # Check if any other living Wumpus can cause stench here
-            has_other_wumpus_nearby = False
-            other_adjacent = []
-            for di, dj in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                ni, nj = i + di, j + dj
-                if 0 <= ni < N and 0 <= nj < N:
-                    other_adjacent.append((ni, nj))
-            
-            # Check if any living Wumpus is adjacent to this position
-            for other_adj in other_adjacent:
-                if other_adj != dead_wumpus_pos:  # Skip the dead Wumpus
-                    for idx, wumpus_pos in enumerate(self.current_wumpus_positions):
-                        if (self.wumpus_alive_status[idx] and 
-                            wumpus_pos == other_adj):
-                            has_other_wumpus_nearby = True
-                            break
-                    if has_other_wumpus_nearby:
-                        break
-            
-            # Remove stench only if no other living Wumpus causes it
-            if not has_other_wumpus_nearby:
-                self.agent.environment.game_map[i][j].remove('S')
-                stenches_removed.append(adj_pos)
-                
-                # Also update KB to remove stench fact if agent has visited this position
-                if adj_pos in self.visited_positions:
-                    stench_fact = f"S({i},{j})"
-                    if stench_fact in self.agent.kb.facts:
-                        self.agent.kb.facts.discard(stench_fact)
-                        self.agent.kb.tell(f"~S({i},{j})")
-                        print(f"   🧠 Updated KB: removed stench fact at {adj_pos}")
+    def _update_stench_after_wumpus_death(self, stenches_removed):
+        """Update KB stench facts for the cells that stopped smelling after a Wumpus death"""
+        for adj_pos in stenches_removed:
+            # Only positions the agent has visited have a stench fact in the KB
+            if adj_pos in self.visited_positions:
+                i, j = adj_pos
+                stench_fact = f"S({i},{j})"
+                if stench_fact in self.agent.kb.facts:
+                    self.agent.kb.retract_fact(stench_fact)
+                    self.agent.kb.tell(f"~S({i},{j})")
+                    log.debug("stench", "   🧠 Updated KB: removed stench fact at {adj_pos}", adj_pos=adj_pos)
         
         if stenches_removed:
-            print(f"   🌬️ Removed stench from positions: {stenches_removed}")
+            log.debug("stench", "   🌬️ Removed stench from positions: {stenches_removed}", stenches_removed=stenches_removed)
         else:
-            print(f"   ℹ️ No stench removed (other Wumpuses still nearby)")
+            log.debug("stench", "   ℹ️ No stench removed (other Wumpuses still nearby)")
 
     def _verify_stench_patterns(self):
         """Verify that stench patterns match current living Wumpus positions"""
+        if not log.enabled(DEBUG):
+            return
         N = self.agent.environment.N
         stench_positions = []
         
@@ -442,8 +420,10 @@ class KnowledgeBaseSafeMovingWumpusAgent(KnowledgeBaseSafeAgent):
         living_wumpus_positions = [pos for i, pos in enumerate(self.current_wumpus_positions) 
                                   if self.wumpus_alive_status[i]]
         
-        print(f"   🔍 Stench verification: {len(stench_positions)} stench cells, "
-              f"{living_wumpus_count} living Wumpuses at {living_wumpus_positions}")
+        log.debug("stench", "   🔍 Stench verification: {stench_count} stench cells, "
+                  "{living_wumpus_count} living Wumpuses at {living_wumpus_positions}",
+                  stench_count=len(stench_positions), living_wumpus_count=living_wumpus_count,
+                  living_wumpus_positions=living_wumpus_positions)
 
     def step(self):
         """Execute one step with Moving Wumpus capability and proper KB updates"""
@@ -453,9 +433,6 @@ class KnowledgeBaseSafeMovingWumpusAgent(KnowledgeBaseSafeAgent):
         # Increment action counter
         self.action_count += 1
         
-        # Move Wumpuses if needed (every 5 actions)
-        self._move_wumpuses_if_needed()
-        
         # Get position before move
         old_position = self.agent.position
         
@@ -471,6 +448,20 @@ class KnowledgeBaseSafeMovingWumpusAgent(KnowledgeBaseSafeAgent):
         
         return result
     
+    def _ingest_step_facts(self):
+        """Move Wumpuses if needed (every 5 actions) before perceiving, so the KB updates
+        after a move share the step's single inference pass"""
+        self._move_wumpuses_if_needed()
+        super()._ingest_step_facts()
+
+    def _follow_committed_plan(self):
+        """Wumpuses only move inside the step pipeline, so steps where they are due never
+        follow a committed plan blindly"""
+        if self.action_count % self.wumpus_move_interval == 0:
+            self.committed_plan = None
+            return None
+        return super()._follow_committed_plan()
+
     def _update_kb_at_current_position(self):
         """Update KB based on sensory information at current position - NO CHEATING"""
         current_pos = self.agent.position
@@ -485,7 +476,7 @@ class KnowledgeBaseSafeMovingWumpusAgent(KnowledgeBaseSafeAgent):
             stench_fact = f"S({i},{j})"
             if stench_fact not in self.agent.kb.facts:
                 self.agent.kb.add_fact(stench_fact)
-                print(f"Agent smells stench at new position {current_pos}")
+                log.debug("stench", "Agent smells stench at new position {current_pos}", current_pos=current_pos)
                 
                 # Try to deduce Wumpus from this new stench information
                 self._deduce_wumpus_from_visited_stench(current_pos)
@@ -542,7 +533,7 @@ class KnowledgeBaseSafeMovingWumpusAgent(KnowledgeBaseSafeAgent):
 
     def _deduce_wumpus_positions_from_stench(self):
         """Deduce possible Wumpus positions from stench patterns using advanced constraint solving"""
-        print(f"   🧠 Deducing Wumpus positions from stench patterns...")
+        log.debug("stench", "   🧠 Deducing Wumpus positions from stench patterns...")
         
         # Get all known stench positions
         stench_positions = []
@@ -553,7 +544,7 @@ class KnowledgeBaseSafeMovingWumpusAgent(KnowledgeBaseSafeAgent):
                 if match:
                     stench_positions.append((int(match.group(1)), int(match.group(2))))
         
-        print(f"     💨 Known stench positions: {stench_positions}")
+        log.debug("stench", "     💨 Known stench positions: {stench_positions}", stench_positions=stench_positions)
         deduction_count = 0
         
         # Method 1: Single stench deduction
@@ -576,7 +567,7 @@ class KnowledgeBaseSafeMovingWumpusAgent(KnowledgeBaseSafeAgent):
                 
                 if wumpus_fact not in self.agent.kb.facts:
                     self.agent.kb.tell(wumpus_fact)
-                    print(f"     🎯 DEDUCED Wumpus at {wumpus_pos} from single stench at {stench_pos}")
+                    log.debug("stench", "     🎯 DEDUCED Wumpus at {wumpus_pos} from single stench at {stench_pos}", wumpus_pos=wumpus_pos, stench_pos=stench_pos)
                     deduction_count += 1
                     self._mark_wumpus_unsafe(wumpus_pos)
         
@@ -586,15 +577,15 @@ class KnowledgeBaseSafeMovingWumpusAgent(KnowledgeBaseSafeAgent):
             deduction_count += advanced_deductions
         
         if deduction_count > 0:
-            print(f"     ✅ Successfully deduced {deduction_count} Wumpus position(s)")
+            log.debug("kb", "     ✅ Successfully deduced {deduction_count} Wumpus position(s)", deduction_count=deduction_count)
             # Update KB reasoning
             self.agent.kb.forward_chain()
         else:
-            print(f"     ℹ️ No definitive Wumpus positions could be deduced")
+            log.debug("kb", "     ℹ️ No definitive Wumpus positions could be deduced")
 
     def _solve_stench_constraints(self, stench_positions):
         """Advanced constraint solving to deduce Wumpus positions from multiple stenches"""
-        print(f"     🔍 Applying advanced constraint solving...")
+        log.debug("kb", "     🔍 Applying advanced constraint solving...")
         deduction_count = 0
         
         # Build candidate Wumpus positions
@@ -614,7 +605,7 @@ class KnowledgeBaseSafeMovingWumpusAgent(KnowledgeBaseSafeAgent):
             
             stench_to_candidates[stench_pos] = candidates
         
-        print(f"       Candidate Wumpus positions: {sorted(all_candidates)}")
+        log.debug("kb", "       Candidate Wumpus positions: {candidates}", candidates=sorted(all_candidates))
         
         # For each candidate position, check if it's the ONLY explanation for ANY stench
         for candidate in all_candidates:
@@ -637,7 +628,7 @@ class KnowledgeBaseSafeMovingWumpusAgent(KnowledgeBaseSafeAgent):
                 
                 if wumpus_fact not in self.agent.kb.facts:
                     self.agent.kb.tell(wumpus_fact)
-                    print(f"       🎯 CONSTRAINT DEDUCED Wumpus at {candidate} (unique explanation)")
+                    log.debug("kb", "       🎯 CONSTRAINT DEDUCED Wumpus at {candidate} (unique explanation)", candidate=candidate)
                     deduction_count += 1
                     self._mark_wumpus_unsafe(candidate)
         
@@ -650,7 +641,7 @@ class KnowledgeBaseSafeMovingWumpusAgent(KnowledgeBaseSafeAgent):
     
     def _analyze_stench_intersections(self, stench_to_candidates):
         """Analyze intersections between stench candidate sets"""
-        print(f"       📊 Analyzing stench intersections...")
+        log.debug("stench", "       📊 Analyzing stench intersections...")
         deduction_count = 0
         
         # Find positions that could explain multiple stenches
@@ -675,7 +666,7 @@ class KnowledgeBaseSafeMovingWumpusAgent(KnowledgeBaseSafeAgent):
                 
                 if wumpus_fact not in self.agent.kb.facts:
                     self.agent.kb.tell(wumpus_fact)
-                    print(f"       🎯 INTERSECTION DEDUCED Wumpus at {candidate} (only shared candidate)")
+                    log.debug("kb", "       🎯 INTERSECTION DEDUCED Wumpus at {candidate} (only shared candidate)", candidate=candidate)
                     deduction_count += 1
                     self._mark_wumpus_unsafe(candidate)
         
@@ -683,18 +674,18 @@ class KnowledgeBaseSafeMovingWumpusAgent(KnowledgeBaseSafeAgent):
     
     def _clear_old_wumpus_facts(self):
         """Clear old Wumpus position facts since they may have moved"""
-        print("   🧹 Clearing old Wumpus position facts...")
+        log.debug("kb", "   🧹 Clearing old Wumpus position facts...")
         
-        # Remove positive Wumpus facts (W(i,j))
+        # Remove positive Wumpus facts (W(i,j)) and everything the KB concluded from them
         old_wumpus_facts = [fact for fact in self.agent.kb.facts if fact.startswith('W(')]
         for fact in old_wumpus_facts:
-            self.agent.kb.facts.discard(fact)
-            print(f"     ❌ Removed old Wumpus fact: {fact}")
+            self.agent.kb.retract_fact(fact)
+            log.debug("kb", "     ❌ Removed old Wumpus fact: {fact}", fact=fact)
         
         if old_wumpus_facts:
-            print(f"   🧹 Cleared {len(old_wumpus_facts)} old Wumpus position facts")
+            log.debug("kb", "   🧹 Cleared {old_wumpus_facts_count} old Wumpus position facts", old_wumpus_facts_count=len(old_wumpus_facts))
         else:
-            print(f"   ℹ️ No old Wumpus facts to clear")
+            log.debug("kb", "   ℹ️ No old Wumpus facts to clear")
     
     def _mark_wumpus_unsafe(self, wumpus_pos):
         """Mark a Wumpus position and its surroundings as unsafe"""
@@ -0,0 +1,105 @@
+"""
+Benchmark: rule-based forward chaining vs SAT entailment on the testcases/map maps
+
+Each engine drives its own explorer that, like KnowledgeBaseSafeAgent, only ever
+enters cells the engine has proven safe (BFS from (0, 0)). A more complete engine
+proves more cells safe and so reaches more of the map. At the end we count the
+cells each engine proves safe / deadly, check them against the real map, and
+report the time spent in forward_chain.
+
+Run from the repository root:
+    python -m benchmarks.kb_backends
+"""
+import glob
+import json
+import os
+import time
+from collections import deque
+
+from env_simulator.kb import KnowledgeBase, PIT, WUMPUS, POS
+from env_simulator.sat_kb import SATKnowledgeBase
+
+MAP_DIR = os.path.join("testcases", "map")
+BACKENDS = [("rules", KnowledgeBase), ("sat", SATKnowledgeBase)]
+
+
+def load_map(path):
+    with open(path, 'r') as f:
+        data = json.load(f)
+    return data['map'], [tuple(pos) for pos in data['wumpus_positions']]
+
+
+def is_deadly(cell_contents):
+    return 'W' in cell_contents or 'P' in cell_contents
+
+
+def perceive(kb, game_map, i, j):
+    """Same facts Agent.perceive adds after surviving a move to (i, j)"""
+    contents = game_map[i][j]
+    kb.add_fact(
+        f"{'' if 'S' in contents else '~'}S({i}, {j})",
+        f"{'' if 'B' in contents else '~'}B({i}, {j})",
+        f"~P({i}, {j})",
+        f"~W({i}, {j})",
+        f"Safe({i}, {j})",
+    )
+
+
+def run_backend(kb_class, game_map, wumpus_count):
+    N = len(game_map)
+    kb = kb_class(N=N, wumpus=wumpus_count)
+    timings = []
+    visited = set()
+    queue = deque([(0, 0)])
+    while queue:
+        i, j = queue.popleft()
+        if (i, j) in visited:
+            continue
+        visited.add((i, j))
+        perceive(kb, game_map, i, j)
+        start = time.perf_counter()
+        kb.forward_chain()
+        timings.append(time.perf_counter() - start)
+
+        # the frontier may have grown anywhere, not just around (i, j)
+        for vi, vj in visited:
+            for ni, nj in kb.get_adjacent_cells(vi, vj):
+                if (ni, nj) not in visited and kb.is_safe(ni, nj):
+                    queue.append((ni, nj))
+
+    safe, deadly, wrong = 0, 0, 0
+    for i in range(N):
+        for j in range(N):
+            cell = i * N + j
+            if kb.is_safe(i, j):
+                safe += 1
+                wrong += is_deadly(game_map[i][j])
+            elif kb.truth[WUMPUS * kb.NN + cell] & POS or kb.truth[PIT * kb.NN + cell] & POS:
+                deadly += 1
+                wrong += not is_deadly(game_map[i][j])
+
+    return {
+        'safe': safe,
+        'deadly': deadly,
+        'wrong': wrong,
+        'visited': len(visited),
+        'total_ms': sum(timings) * 1000,
+        'max_ms': max(timings) * 1000,
+        'calls': len(timings),
+    }
+
+
+def main():
+    header = f"{'map':<20} {'backend':<7} {'visited':>7} {'safe':>5} {'deadly':>6} {'wrong':>5} {'calls':>5} {'total ms':>9} {'max ms':>8}"
+    print(header)
+    print("-" * len(header))
+    for path in sorted(glob.glob(os.path.join(MAP_DIR, "*.json"))):
+        game_map, wumpus_positions = load_map(path)
+        for name, kb_class in BACKENDS:
+            result = run_backend(kb_class, game_map, len(wumpus_positions))
+            print(f"{os.path.basename(path):<20} {name:<7} {result['visited']:>7} {result['safe']:>5} {result['deadly']:>6} "
+                  f"{result['wrong']:>5} {result['calls']:>5} {result['total_ms']:>9.1f} {result['max_ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: per-target searches vs one multi-target pass in find_best_kb_safe_path
+
+Builds KnowledgeBaseSafeAgent-like situations on random 64x64 grids: about a quarter of
+the cells are deadly, the agent has visited a BFS region around (0, 0), every visited
+cell and its non-deadly neighbours are KB-safe, and the targets are the safe cells not
+visited yet. Both modes must pick a target with the same score.
+
+Run from the repository root:
+    python -m benchmarks.kb_pathfinding
+"""
+import random
+import time
+from collections import deque
+
+from search.kb_pathfinding import find_best_kb_safe_path, get_neighbors
+
+N = 64
+DEADLY_FRACTION = 0.25
+VISITED_SIZES = [50, 200, 800]
+SEEDS = range(3)
+
+
+def make_situation(seed, visited_size):
+    rng = random.Random(seed)
+    deadly = {(i, j) for i in range(N) for j in range(N) if rng.random() < DEADLY_FRACTION}
+    deadly.discard((0, 0))
+
+    visited = set()
+    queue = deque([(0, 0)])
+    while queue and len(visited) < visited_size:
+        pos = queue.popleft()
+        if pos in visited or pos in deadly:
+            continue
+        visited.add(pos)
+        neighbors = get_neighbors(pos, N)
+        rng.shuffle(neighbors)
+        queue.extend(neighbors)
+
+    safe = set(visited)
+    for pos in visited:
+        safe.update(n for n in get_neighbors(pos, N) if n not in deadly)
+    targets = sorted(safe - visited)
+    start = rng.choice(sorted(visited))
+    return start, targets, safe, visited
+
+
+def score(result, visited):
+    if result is None:
+        return None
+    target, path = result
+    return len(path) - (0.5 if target not in visited else 0)
+
+
+def main():
+    header = f"{'visited':>7} {'seed':>4} {'targets':>7} {'per-target ms':>13} {'single-pass ms':>14} {'speedup':>8} {'same score':>10}"
+    print(header)
+    print("-" * len(header))
+    for visited_size in VISITED_SIZES:
+        for seed in SEEDS:
+            start, targets, safe, visited = make_situation(seed, visited_size)
+
+            begin = time.perf_counter()
+            old = find_best_kb_safe_path(start, targets, safe, visited, N, use_astar=True, single_pass=False)
+            old_ms = (time.perf_counter() - begin) * 1000
+
+            begin = time.perf_counter()
+            new = find_best_kb_safe_path(start, targets, safe, visited, N)
+            new_ms = (time.perf_counter() - begin) * 1000
+
+            same = score(old, visited) == score(new, visited)
+            print(f"{len(visited):>7} {seed:>4} {len(targets):>7} {old_ms:>13.1f} {new_ms:>14.2f} "
+                  f"{old_ms / max(new_ms, 1e-6):>7.0f}x {str(same):>10}")
+
+
+if __name__ == "__main__":
+    main()
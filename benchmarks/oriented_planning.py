@@ -0,0 +1,64 @@
+"""
+Benchmark: cell-path planners vs the orientation-aware planner on turn-inclusive step counts
+
+Uses the same random 64x64 situations as benchmarks.kb_pathfinding. For each one the
+agent, facing a random direction, plans a route to a few random unvisited KB-safe cells.
+kb_safe_dijkstra and kb_safe_astar return cells, which KnowledgeBaseSafeAgent walks by
+turning right until it faces the next cell (_face_direction); kb_safe_oriented_astar
+returns the turns and moves directly. Steps count every turn and move, each of which
+costs one point.
+
+Run from the repository root:
+    python -m benchmarks.oriented_planning
+"""
+import random
+import time
+
+from agent.agent import DIRECTION
+from benchmarks.kb_pathfinding import N, SEEDS, VISITED_SIZES, make_situation
+from search.kb_pathfinding import kb_safe_astar, kb_safe_dijkstra, kb_safe_oriented_astar
+
+GOALS_PER_SITUATION = 5
+
+
+def cell_path_steps(path, heading):
+    """Turns and moves KnowledgeBaseSafeAgent makes to follow a cell path, turning right only"""
+    facing = DIRECTION[heading]
+    steps = 0
+    for (i, j), (ni, nj) in zip(path, path[1:]):
+        target = DIRECTION[{(0, 1): "E", (1, 0): "S", (0, -1): "W", (-1, 0): "N"}[(ni - i, nj - j)]]
+        steps += (target - facing) % 4 + 1
+        facing = target
+    return steps
+
+
+def main():
+    planners = [
+        ("dijkstra", lambda start, heading, goal, safe, visited: kb_safe_dijkstra(start, goal, safe, visited, N)),
+        ("astar", lambda start, heading, goal, safe, visited: kb_safe_astar(start, goal, safe, visited, N)),
+        ("oriented", lambda start, heading, goal, safe, visited: kb_safe_oriented_astar(start, heading, goal, safe, visited, N)),
+    ]
+    header = f"{'visited':>7} {'seed':>4} " + " ".join(f"{name + ' steps':>14} {name + ' ms':>11}" for name, _ in planners)
+    print(header)
+    print("-" * len(header))
+    for visited_size in VISITED_SIZES:
+        for seed in SEEDS:
+            start, targets, safe, visited = make_situation(seed, visited_size)
+            rng = random.Random(seed)
+            queries = [(rng.choice("ESWN"), rng.choice(targets)) for _ in range(GOALS_PER_SITUATION)]
+
+            row = f"{len(visited):>7} {seed:>4} "
+            for name, plan in planners:
+                steps = 0
+                begin = time.perf_counter()
+                results = [plan(start, heading, goal, safe, visited) for heading, goal in queries]
+                elapsed_ms = (time.perf_counter() - begin) * 1000
+                for (heading, _), result in zip(queries, results):
+                    if result is not None:
+                        steps += len(result) if name == "oriented" else cell_path_steps(result, heading)
+                row += f"{steps:>14} {elapsed_ms:>11.1f} "
+            print(row.rstrip())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,346 @@
+"""
+WumpusEnvironment backed by a NumPy uint8 grid of bit flags instead of nested lists of letters
+"""
+import json
+import random
+
+import numpy as np
+
+from env_simulator.events import log
+
+# one bit per cell content; a cell's percept bitmask uses the same bits
+WUMPUS_BIT = 1
+PIT_BIT = 2
+GOLD_BIT = 4
+STENCH_BIT = 8
+BREEZE_BIT = 16
+OUT_OF_BOUNDS_BIT = 32  # percepts only, never stored in the grid
+
+DEADLY_BITS = WUMPUS_BIT | PIT_BIT
+LETTER_BITS = {"W": WUMPUS_BIT, "P": PIT_BIT, "G": GOLD_BIT, "S": STENCH_BIT, "B": BREEZE_BIT}
+
+ADJACENT = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+
+
+def _percept_names(bits):
+    """The percept list WumpusEnvironment.get_percept returns for a percept bitmask"""
+    if bits & OUT_OF_BOUNDS_BIT:
+        return ("OutOfBounds",)
+    if bits & DEADLY_BITS:
+        return tuple(name for bit, name in ((WUMPUS_BIT, "Death_Wumpus"), (PIT_BIT, "Death_Pit")) if bits & bit)
+    return ("Stench" if bits & STENCH_BIT else "NoStench",
+            "Breeze" if bits & BREEZE_BIT else "NoBreeze",
+            "Glitter" if bits & GOLD_BIT else "NoGlitter")
+
+
+PERCEPT_NAMES = [_percept_names(bits) for bits in range(2 * OUT_OF_BOUNDS_BIT)]
+
+
+def encode_map(game_map):
+    """uint8 bit-flag grid for a map in the list format (a list of letters per cell)"""
+    N = len(game_map)
+    grid = np.zeros((N, len(game_map[0]) if N else 0), dtype=np.uint8)
+    for i, row in enumerate(game_map):
+        for j, cell in enumerate(row):
+            for letter in cell:
+                grid[i, j] |= LETTER_BITS[letter]
+    return grid
+
+
+def decode_map(grid):
+    """The list format (a fresh list of letters per cell, in W, P, G, S, B order) for a grid"""
+    return [[[letter for letter, bit in LETTER_BITS.items() if cell & bit] for cell in row]
+            for row in grid.tolist()]
+
+
+def _adjacent_counts(mask):
+    """Number of set cells of a boolean grid next to each cell, as a uint8 grid"""
+    counts = np.zeros(mask.shape, dtype=np.uint8)
+    counts[1:, :] += mask[:-1, :]
+    counts[:-1, :] += mask[1:, :]
+    counts[:, 1:] += mask[:, :-1]
+    counts[:, :-1] += mask[:, 1:]
+    return counts
+
+
+def generate_grid(N=8, wumpus=2, pits_probability=0.2, rng=None):
+    """Random world as (grid, wumpus_positions, pit_positions), built directly as a bit-flag grid
+
+    Same placement rules as WumpusWorldGenerator: gold anywhere, Wumpuses on empty cells off
+    the protected corner, then int((N^2 - 1) * pits_probability) pits on cells without a
+    Wumpus, pit, gold or stench (fewer if the world runs out of such cells). Placement is
+    vectorised, so large worlds never go through per-cell lists.
+    """
+    rng = np.random.default_rng(rng)
+    grid = np.zeros((N, N), dtype=np.uint8)
+    protected = np.zeros((N, N), dtype=bool)
+    protected[:2, :2] = True
+    protected[1, 1] = False
+
+    gold = divmod(int(rng.integers(N * N)), N)
+    grid[gold] |= GOLD_BIT
+
+    # one at a time: a Wumpus needs an empty cell, so not one that already smells of another
+    wumpus_positions = []
+    for _ in range(wumpus):
+        free = np.flatnonzero(~protected & (grid == 0))
+        if not len(free):
+            break
+        i, j = divmod(int(rng.choice(free)), N)
+        grid[i, j] |= WUMPUS_BIT
+        for di, dj in ADJACENT:
+            if 0 <= i + di < N and 0 <= j + dj < N:
+                grid[i + di, j + dj] |= STENCH_BIT
+        wumpus_positions.append((i, j))
+
+    free = np.flatnonzero(~protected & ((grid & (WUMPUS_BIT | PIT_BIT | GOLD_BIT | STENCH_BIT)) == 0))
+    pit_cells = rng.choice(free, size=min(int((N ** 2 - 1) * pits_probability), len(free)), replace=False)
+    pit_mask = np.zeros(N * N, dtype=bool)
+    pit_mask[pit_cells] = True
+    pit_mask = pit_mask.reshape(N, N)
+    grid[pit_mask] |= PIT_BIT
+    # no breeze on a pit cell
+    grid[(_adjacent_counts(pit_mask) > 0) & ~pit_mask] |= BREEZE_BIT
+
+    pit_positions = [tuple(cell) for cell in np.argwhere(pit_mask).tolist()]
+    return grid, wumpus_positions, pit_positions
+
+
+class CellView:
+    """One cell of an ArrayWumpusEnvironment seen as a list of letters; writes go to the grid"""
+
+    __slots__ = ("grid", "index")
+
+    def __init__(self, grid, index):
+        self.grid = grid
+        self.index = index
+
+    def __contains__(self, letter):
+        return bool(self.grid[self.index] & LETTER_BITS.get(letter, 0))
+
+    def __iter__(self):
+        cell = self.grid[self.index]
+        return iter([letter for letter, bit in LETTER_BITS.items() if cell & bit])
+
+    def __len__(self):
+        return bin(int(self.grid[self.index])).count("1")
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def append(self, letter):
+        self.grid[self.index] |= LETTER_BITS[letter]
+
+    def remove(self, letter):
+        if letter not in self:
+            raise ValueError(f"{letter!r} not in cell {self.index}")
+        self.grid[self.index] &= ~LETTER_BITS[letter] & 0xFF
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class RowView:
+    __slots__ = ("grid", "i")
+
+    def __init__(self, grid, i):
+        self.grid = grid
+        self.i = i
+
+    def __getitem__(self, j):
+        if not -self.grid.shape[1] <= j < self.grid.shape[1]:
+            raise IndexError(j)
+        return CellView(self.grid, (self.i, j % self.grid.shape[1]))
+
+    def __len__(self):
+        return self.grid.shape[1]
+
+    def __iter__(self):
+        return (self[j] for j in range(len(self)))
+
+
+class GridView:
+    """game_map of an ArrayWumpusEnvironment: game_map[i][j] behaves like the list of letters at (i, j)"""
+
+    __slots__ = ("grid",)
+
+    def __init__(self, grid):
+        self.grid = grid
+
+    def __getitem__(self, i):
+        if not -self.grid.shape[0] <= i < self.grid.shape[0]:
+            raise IndexError(i)
+        return RowView(self.grid, i % self.grid.shape[0])
+
+    def __len__(self):
+        return self.grid.shape[0]
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+class ArrayWumpusEnvironment:
+    """Drop-in WumpusEnvironment over an N x N uint8 grid of WUMPUS/PIT/GOLD/STENCH/BREEZE bits
+
+    game_map may be a map in the list format (encoded into a new grid) or a uint8 grid,
+    which is used in place. get_percept() returns the same lists as WumpusEnvironment;
+    get_percept_bits() returns the percepts as a bitmask over the same bits (plus
+    OUT_OF_BOUNDS_BIT) without building any list. game_map is a view that reads and
+    writes the grid, for code that indexes game_map[i][j] directly.
+    """
+
+    def __init__(self, game_map, wumpus_positions, pit_positions):
+        self.grid = game_map if isinstance(game_map, np.ndarray) else encode_map(game_map)
+        self.wumpus_positions = wumpus_positions
+        self.pit_positions = pit_positions
+        self.N = len(self.grid)
+        self.gold_collected = False
+        # how many Wumpuses / pits are next to each cell, as in WumpusEnvironment
+        self.stench_counts = _adjacent_counts((self.grid & WUMPUS_BIT) > 0)
+        self.breeze_counts = _adjacent_counts((self.grid & PIT_BIT) > 0)
+
+    @classmethod
+    def from_json(cls, source):
+        """Environment for a map in the testcases/map JSON format (a path or the parsed dict)"""
+        if not isinstance(source, dict):
+            with open(source, 'r') as f:
+                source = json.load(f)
+        return cls(encode_map(source['map']), [tuple(pos) for pos in source['wumpus_positions']],
+                   [tuple(pos) for pos in source['pit_positions']])
+
+    @classmethod
+    def generate(cls, N=8, wumpus=2, pits_probability=0.2, rng=None):
+        """Random environment straight from generate_grid"""
+        return cls(*generate_grid(N, wumpus, pits_probability, rng))
+
+    @property
+    def game_map(self):
+        return GridView(self.grid)
+
+    def to_map(self):
+        """The current world in the list format"""
+        return decode_map(self.grid)
+
+    def to_json(self):
+        """The current world as a dict in the testcases/map JSON format"""
+        return {
+            'map': self.to_map(),
+            'wumpus_positions': [list(pos) for pos in self.wumpus_positions],
+            'pit_positions': [list(pos) for pos in self.pit_positions],
+        }
+
+    def get_percept_bits(self, position):
+        """Percepts at position as a bitmask: WUMPUS_BIT/PIT_BIT alone mean death, otherwise
+        STENCH_BIT, BREEZE_BIT and GOLD_BIT (glitter); OUT_OF_BOUNDS_BIT off the grid"""
+        i, j = position
+        if not (0 <= i < self.N and 0 <= j < self.N):
+            return OUT_OF_BOUNDS_BIT
+        cell = self.grid.item(i, j)
+        if cell & DEADLY_BITS:
+            return cell & DEADLY_BITS
+        if self.gold_collected:
+            cell &= ~GOLD_BIT
+        return cell
+
+    def get_percept(self, position):
+        """Get percepts at given position - this is the ONLY way agents can sense environment"""
+        return list(PERCEPT_NAMES[self.get_percept_bits(position)])
+
+    def get_wumpus_count(self):
+        """Get the total number of wumpus in the world"""
+        return len(self.wumpus_positions)
+
+    def grab_gold(self, position):
+        """Try to grab gold at position"""
+        if self.grid[position] & GOLD_BIT and not self.gold_collected:
+            self.grid[position] &= ~GOLD_BIT & 0xFF
+            self.gold_collected = True
+            return True
+        return False
+
+    def shoot_arrow(self, position, direction):
+        """Shoot arrow from position in given direction"""
+        from agent.agent import MOVE
+
+        mi, mj = MOVE[direction]
+        i, j = position
+        # every cell from the next one to the edge of the grid
+        if mi:
+            reach = self.N - 1 - i if mi > 0 else i
+        else:
+            reach = self.N - 1 - j if mj > 0 else j
+        steps = np.arange(1, reach + 1)
+        rows, cols = i + mi * steps, j + mj * steps
+        hits = np.flatnonzero(self.grid[rows, cols] & WUMPUS_BIT)
+        if not len(hits):
+            return False
+
+        i, j = int(rows[hits[0]]), int(cols[hits[0]])
+        log.info("arrow", "Scream! Wumpus at {position} is dead.", position=(i, j))
+
+        # Stench around the dead Wumpus goes where no other Wumpus keeps it
+        self.remove_wumpus((i, j))
+
+        # Update wumpus positions
+        if (i, j) in self.wumpus_positions:
+            self.wumpus_positions.remove((i, j))
+        return True
+
+    def _adjacent_cells(self, i, j):
+        return [(i + di, j + dj) for di, dj in ADJACENT if 0 <= i + di < self.N and 0 <= j + dj < self.N]
+
+    def add_wumpus(self, position):
+        """Put a Wumpus on position, returns the cells that started to smell"""
+        grid = self.grid
+        if grid.item(position) & WUMPUS_BIT:
+            return []
+        grid[position] |= WUMPUS_BIT
+        smelling = []
+        for cell in self._adjacent_cells(*position):
+            self.stench_counts[cell] += 1
+            if not grid.item(cell) & STENCH_BIT:
+                grid[cell] |= STENCH_BIT
+                smelling.append(cell)
+        return smelling
+
+    def remove_wumpus(self, position):
+        """Take the Wumpus off position (killed), returns the cells that stopped smelling"""
+        grid = self.grid
+        if not grid.item(position) & WUMPUS_BIT:
+            return []
+        grid[position] &= ~WUMPUS_BIT & 0xFF
+        cleared = []
+        for cell in self._adjacent_cells(*position):
+            self.stench_counts[cell] -= 1
+            if not self.stench_counts[cell] and grid.item(cell) & STENCH_BIT:
+                grid[cell] &= ~STENCH_BIT & 0xFF
+                cleared.append(cell)
+                log.debug("stench", "Removed stench at {position} - no more Wumpus nearby", position=cell)
+        return cleared
+
+    def relocate_wumpus(self, old_position, new_position):
+        """Move a Wumpus; cells next to both positions keep smelling throughout"""
+        if old_position == new_position:
+            return
+        self.add_wumpus(new_position)
+        self.remove_wumpus(old_position)
+
+    def is_valid_position(self, position):
+        """Check if position is within bounds"""
+        i, j = position
+        return 0 <= i < self.N and 0 <= j < self.N
+
+    def move_wumpus(self):
+        """Move Wumpuses to random adjacent positions (for dynamic agent), like WumpusEnvironment.move_wumpus"""
+        grid = self.grid
+        new_wumpus_positions = []
+
+        for i, j in self.wumpus_positions:
+            # Move to a random adjacent position that is not a pit, or stay in place
+            adjacent_positions = [cell for cell in self._adjacent_cells(i, j) if not grid.item(cell) & PIT_BIT]
+            new_pos = random.choice(adjacent_positions) if adjacent_positions else (i, j)
+            new_wumpus_positions.append(new_pos)
+            self.relocate_wumpus((i, j), new_pos)
+
+        self.wumpus_positions = new_wumpus_positions
+        return new_wumpus_positions
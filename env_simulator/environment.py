@@ -2,6 +2,9 @@
 Environment interface for Wumpus World - provides only perception-based information
 No direct map access allowed for agents
 """
+from env_simulator.events import log
+
+ADJACENT = [(0, 1), (0, -1), (1, 0), (-1, 0)]
 
 class WumpusEnvironment:
     def __init__(self, game_map, wumpus_positions, pit_positions):
@@ -10,6 +13,59 @@ class WumpusEnvironment:
         self.pit_positions = pit_positions
         self.N = len(game_map)
         self.gold_collected = False
+        # how many Wumpuses / pits are next to each cell; add_wumpus and remove_wumpus keep
+        # stench_counts current and a cell smells exactly while its count is positive
+        self.stench_counts = self._adjacent_counts("W")
+        self.breeze_counts = self._adjacent_counts("P")
+        
+    def _adjacent_cells(self, i, j):
+        return [(i + di, j + dj) for di, dj in ADJACENT if 0 <= i + di < self.N and 0 <= j + dj < self.N]
+    
+    def _adjacent_counts(self, letter):
+        counts = [[0] * self.N for _ in range(self.N)]
+        for i, row in enumerate(self.game_map):
+            for j, cell in enumerate(row):
+                if letter in cell:
+                    for ni, nj in self._adjacent_cells(i, j):
+                        counts[ni][nj] += 1
+        return counts
+        
+    def add_wumpus(self, position):
+        """Put a Wumpus on position, returns the cells that started to smell"""
+        i, j = position
+        if "W" in self.game_map[i][j]:
+            return []
+        self.game_map[i][j].append("W")
+        smelling = []
+        for ni, nj in self._adjacent_cells(i, j):
+            self.stench_counts[ni][nj] += 1
+            if "S" not in self.game_map[ni][nj]:
+                self.game_map[ni][nj].append("S")
+                smelling.append((ni, nj))
+        return smelling
+    
+    def remove_wumpus(self, position):
+        """Take the Wumpus off position (killed), returns the cells that stopped smelling"""
+        i, j = position
+        if "W" not in self.game_map[i][j]:
+            return []
+        self.game_map[i][j].remove("W")
+        cleared = []
+        for ni, nj in self._adjacent_cells(i, j):
+            self.stench_counts[ni][nj] -= 1
+            # another Wumpus next to the cell keeps its count, and its stench, up
+            if not self.stench_counts[ni][nj] and "S" in self.game_map[ni][nj]:
+                self.game_map[ni][nj].remove("S")
+                cleared.append((ni, nj))
+                log.debug("stench", "Removed stench at {position} - no more Wumpus nearby", position=(ni, nj))
+        return cleared
+    
+    def relocate_wumpus(self, old_position, new_position):
+        """Move a Wumpus; cells next to both positions keep smelling throughout"""
+        if old_position == new_position:
+            return
+        self.add_wumpus(new_position)
+        self.remove_wumpus(old_position)
         
     def get_percept(self, position):
         """Get percepts at given position - this is the ONLY way agents can sense environment"""
@@ -72,12 +128,11 @@ class WumpusEnvironment:
         j += mj
         while (0 <= i < self.N) and (0 <= j < self.N):
             if "W" in self.game_map[i][j]:
-                self.game_map[i][j].remove("W")
                 hit_any = True
-                print(f"Scream! Wumpus at {(i,j)} is dead.")
+                log.info("arrow", "Scream! Wumpus at {position} is dead.", position=(i,j))
                 
-                # Remove Stench around dead Wumpus more carefully
-                self._remove_stench_around_dead_wumpus(i, j)
+                # Stench around the dead Wumpus goes where no other Wumpus keeps it
+                self.remove_wumpus((i, j))
                 
                 # Update wumpus positions
                 if (i, j) in self.wumpus_positions:
@@ -89,37 +144,6 @@ class WumpusEnvironment:
             
         return hit_any
     
-    def _remove_stench_around_dead_wumpus(self, dead_wumpus_row, dead_wumpus_col):
-        """Remove stench around dead Wumpus, but only if no other living Wumpus causes it"""
-        adjacent_positions = []
-        for di, dj in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-            ni, nj = dead_wumpus_row + di, dead_wumpus_col + dj
-            if (0 <= ni < self.N) and (0 <= nj < self.N):
-                adjacent_positions.append((ni, nj))
-        
-        for adj_pos in adjacent_positions:
-            ni, nj = adj_pos
-            if "S" in self.game_map[ni][nj]:
-                # Check if any other living Wumpus can cause stench at this position
-                has_other_wumpus_causing_stench = False
-                
-                # Check all positions adjacent to this stench position
-                for di2, dj2 in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                    check_i, check_j = ni + di2, nj + dj2
-                    if (0 <= check_i < self.N) and (0 <= check_j < self.N):
-                        # Skip the dead Wumpus position
-                        if (check_i, check_j) == (dead_wumpus_row, dead_wumpus_col):
-                            continue
-                        # If there's another Wumpus here, it can cause the stench
-                        if "W" in self.game_map[check_i][check_j]:
-                            has_other_wumpus_causing_stench = True
-                            break
-                
-                # Remove stench only if no other Wumpus causes it
-                if not has_other_wumpus_causing_stench:
-                    self.game_map[ni][nj].remove("S")
-                    print(f"Removed stench at {(ni, nj)} - no more Wumpus nearby")
-    
     def is_valid_position(self, position):
         """Check if position is within bounds"""
         i, j = position
@@ -134,19 +158,9 @@ class WumpusEnvironment:
         for wumpus_pos in self.wumpus_positions:
             i, j = wumpus_pos
             
-            # Remove current stench
-            for di, dj in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                ni, nj = i + di, j + dj
-                if self.is_valid_position((ni, nj)) and "S" in self.game_map[ni][nj]:
-                    self.game_map[ni][nj].remove("S")
-            
-            # Remove Wumpus from current position
-            if "W" in self.game_map[i][j]:
-                self.game_map[i][j].remove("W")
-            
             # Find valid adjacent positions
             adjacent_positions = []
-            for di, dj in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
+            for di, dj in ADJACENT:
                 ni, nj = i + di, j + dj
                 if (self.is_valid_position((ni, nj)) and 
                     "P" not in self.game_map[ni][nj]):  # Don't move into pits
@@ -161,16 +175,8 @@ class WumpusEnvironment:
             
             new_wumpus_positions.append(new_pos)
             
-            # Add Wumpus to new position
-            ni, nj = new_pos
-            if "W" not in self.game_map[ni][nj]:
-                self.game_map[ni][nj].append("W")
-            
-            # Add stench around new position
-            for di, dj in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                si, sj = ni + di, nj + dj
-                if self.is_valid_position((si, sj)) and "S" not in self.game_map[si][sj]:
-                    self.game_map[si][sj].append("S")
+            # Move the Wumpus and its stench; stench another Wumpus causes stays
+            self.relocate_wumpus(wumpus_pos, new_pos)
         
         # Update wumpus positions
         self.wumpus_positions = new_wumpus_positions
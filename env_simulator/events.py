@@ -0,0 +1,109 @@
+"""
+Structured event log used by the agents and the environment instead of print()
+"""
+import collections
+import json
+import time
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+SILENT = 100  # above every event level: nothing is recorded
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING"}
+
+
+class Event:
+    """One log record: a kind ("move", "percept", "kb", ...), a message template and its fields
+
+    The template is only formatted when the message is read, so recording an event
+    costs no string work.
+    """
+
+    __slots__ = ("time", "level", "kind", "template", "fields")
+
+    def __init__(self, level, kind, template, fields):
+        self.time = time.time()
+        self.level = level
+        self.kind = kind
+        self.template = template
+        self.fields = fields
+
+    @property
+    def message(self):
+        return self.template.format(**self.fields) if self.fields else self.template
+
+    def to_dict(self):
+        record = {"time": self.time, "level": LEVEL_NAMES.get(self.level, self.level),
+                  "kind": self.kind, "message": self.message}
+        record.update(self.fields)
+        return record
+
+    def __repr__(self):
+        return f"Event({LEVEL_NAMES.get(self.level, self.level)}, {self.kind!r}, {self.message!r})"
+
+
+class EventLog:
+    """Level-gated event sink: an in-memory ring buffer, plus optional echo to stdout and a JSONL file
+
+    Events below the current level are dropped before an Event is even built, so call
+    sites pass a template and raw fields, never a formatted string. Code that has to do
+    real work just to describe an event should check enabled(level) first.
+    """
+
+    def __init__(self, level=INFO, capacity=1000, echo=False, path=None):
+        self.buffer = collections.deque(maxlen=capacity)
+        self.file = None
+        self.configure(level, capacity, echo, path)
+
+    def configure(self, level=INFO, capacity=1000, echo=False, path=None):
+        """Change the level, buffer size, echo and JSONL file in place (modules hold on to this object)"""
+        self.level = level
+        if capacity != self.buffer.maxlen:
+            self.buffer = collections.deque(self.buffer, maxlen=capacity)
+        self.echo = echo
+        self.close()
+        if path is not None:
+            self.file = open(path, 'a')
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def enabled(self, level):
+        return level >= self.level
+
+    def emit(self, level, kind, template, **fields):
+        if level < self.level:
+            return
+        event = Event(level, kind, template, fields)
+        self.buffer.append(event)
+        if self.echo:
+            print(event.message)
+        if self.file is not None:
+            self.file.write(json.dumps(event.to_dict(), default=str) + "\n")
+
+    def debug(self, kind, template, **fields):
+        if DEBUG >= self.level:
+            self.emit(DEBUG, kind, template, **fields)
+
+    def info(self, kind, template, **fields):
+        if INFO >= self.level:
+            self.emit(INFO, kind, template, **fields)
+
+    def warning(self, kind, template, **fields):
+        if WARNING >= self.level:
+            self.emit(WARNING, kind, template, **fields)
+
+    def recent(self, count=None, level=DEBUG):
+        """The last count buffered events at or above level, oldest first"""
+        events = [event for event in self.buffer if event.level >= level]
+        return events if count is None else events[-count:]
+
+    def clear(self):
+        self.buffer.clear()
+
+
+# process-wide sink: records INFO and above in the buffer, prints nothing until configured to
+log = EventLog()
@@ -1,164 +1,552 @@
+import re
+from collections.abc import MutableSet
+from contextlib import contextmanager
+from functools import lru_cache
+
+import numpy as np
+
+# predicates kept in the integer-coded fact table, any other symbol is stored as a plain string
+PREDICATES = ('P', 'W', 'B', 'S', 'G', 'Safe')
+PREDICATE_INDEX = {name: index for index, name in enumerate(PREDICATES)}
+PIT, WUMPUS, BREEZE, STENCH, GOLD, SAFE = range(len(PREDICATES))
+SAFETY_PREDICATES = (PIT, WUMPUS, SAFE)
+
+# per-atom truth bits: an atom can hold its positive fact, its negated fact or (inconsistently) both
+POS = 1
+NEG = 2
+
+FACT_PATTERN = re.compile(r'\s*(~?)(\w+)\((\d+),\s*(\d+)\)\s*$')
+
+
+@lru_cache(maxsize=None)
+def parse_fact(fact):
+  """Split a fact string like '~W(3, 4)' into (negated, predicate, i, j), or None if it has no cell."""
+  match = FACT_PATTERN.match(fact)
+  if match is None:
+    return None
+  negated, predicate, i, j = match.groups()
+  return negated == '~', predicate, int(i), int(j)
+
+
+def adjacent_cells(i, j, N):
+  adj = []
+  for di, dj in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+    ni, nj = i + di, j + dj
+    if 0 <= ni < N and 0 <= nj < N:
+      adj.append((ni, nj))
+  return adj
+
+
+@lru_cache(maxsize=None)
+def build_rule_table(N):
+  """Compile the Wumpus-world rules for an N x N grid into (rules, watchers).
+
+  rules is a tuple of (premise literals, rule type, conclusion literals), watchers[atom]
+  is the tuple of rule indices mentioning atom. Both are shared by every KB of size N.
+  """
+  NN = N * N
+
+  def lit(predicate, i, j, negated=False):
+    return ((predicate * NN + i * N + j) << 1) | negated
+
+  rules = []
+  for i in range(0, N):
+    for j in range(0, N):
+      adj_cells = adjacent_cells(i, j, N)
+
+      # breeze implies at least one adjacent pit
+      if adj_cells:
+        pit_symbols = tuple(lit(PIT, ai, aj) for ai, aj in adj_cells)
+        rules.append(((lit(BREEZE, i, j),), 'DISJUNCTION', pit_symbols))
+
+      # no breeze implies no pits in adjacent cells
+      for ai, aj in adj_cells:
+        rules.append(((lit(BREEZE, i, j, True),), 'IMPLIES', (lit(PIT, ai, aj, True),)))
+
+      # stench implies at least one wumpus
+      if adj_cells:
+        wumpus_symbols = tuple(lit(WUMPUS, ai, aj) for ai, aj in adj_cells)
+        rules.append(((lit(STENCH, i, j),), 'DISJUNCTION', wumpus_symbols))
+
+      # no stench implies no wumpus in adjacent cells
+      for ai, aj in adj_cells:
+        rules.append(((lit(STENCH, i, j, True),), 'IMPLIES', (lit(WUMPUS, ai, aj, True),)))
+
+      # no pit and no wumpus implies safe
+      rules.append(((lit(PIT, i, j, True), lit(WUMPUS, i, j, True)), 'IMPLIES', (lit(SAFE, i, j),)))
+
+  watchers = [[] for _ in range(len(PREDICATES) * NN)]
+  for index, (premises, _, conclusions) in enumerate(rules):
+    for literal in premises + conclusions:
+      watchers[literal >> 1].append(index)
+
+  return tuple(rules), tuple(tuple(w) for w in watchers)
+
+
+class FactSet(MutableSet):
+  """String view over the integer fact table, kept for the UI and legacy callers"""
+
+  def __init__(self, kb):
+    self.kb = kb
+
+  @classmethod
+  def _from_iterable(cls, iterable):
+    return set(iterable)
+
+  def __contains__(self, fact):
+    literal = self.kb.encode(fact)
+    if literal is None:
+      return fact in self.kb.extra_facts
+    return self.kb.holds(literal)
+
+  def __iter__(self):
+    kb = self.kb
+    for atom, bits in enumerate(kb.truth):
+      if bits & POS:
+        yield kb.decode(atom << 1)
+      if bits & NEG:
+        yield kb.decode(atom << 1 | 1)
+    yield from list(kb.extra_facts)
+
+  def __len__(self):
+    return self.kb.fact_count + len(self.kb.extra_facts)
+
+  def add(self, fact):
+    self.kb.add_fact(fact)
+
+  def discard(self, fact):
+    literal = self.kb.encode(fact)
+    if literal is None:
+      if fact in self.kb.extra_facts:
+        self.kb._own_state()
+        self.kb.extra_facts.discard(fact)
+    else:
+      self.kb.remove_literal(literal)
+
+  def __repr__(self):
+    return f"FactSet({set(self)!r})"
+
+
 class KnowledgeBase:
   def __init__(self, N=8, wumpus=2):
-    self.facts = set()
-    self.rules = []
     self.N = N
+    self.NN = N * N
     self.wumpus = wumpus
+    # truth[atom] holds POS/NEG bits, atom = predicate * N^2 + i * N + j, literal = atom * 2 + negated
+    self.truth = bytearray(len(PREDICATES) * self.NN)
+    self.fact_count = 0
+    self.extra_facts = set()
+    self.facts = FactSet(self)
+    # agenda holds the rules (indices into the shared table) to re-evaluate
+    self.agenda = set()
+    self.blocked_rules = set()
+    # cells holding a W fact, and whether the "all wumpus found -> ~W elsewhere" closure is due
+    self.wumpus_cells = set()
+    self.wumpus_closure_pending = wumpus <= 0
+    # truth maintenance: derived literal -> literals it was concluded from (told facts have no entry),
+    # and literal -> derived literals citing it (entries can go stale, retract_literal re-checks them)
+    self.justifications = {}
+    self.dependents = {}
     self.stench_cells = [[False]*N for _ in range(N)]
     self.dangerous = []
+    # set while the mutable state above is shared with a copy(), the first write then copies it
+    self.shared = False
+    # whole-grid boolean masks, recomputed from the fact table on first access after a change
+    self.masks = None
+    # bumped whenever a P, W or Safe fact comes or goes, so callers can tell the safe cells are unchanged
+    self.safety_version = 0
+    # set by every fact that comes or goes, forward_chain() skips the pass while it is clear;
+    # batch_depth > 0 defers inference until the outermost batch() exits
+    self.dirty = True
+    self.batch_depth = 0
+    self.inference_passes = 0
+    # KB-safe cells (a Safe fact, or both ~W and ~P), kept up to date by add_literal/remove_literal,
+    # and the ones the agent has not been to yet (mark_visited)
+    self.safe_cells = set()
+    self.visited_cells = set()
+    self.unvisited_safe_cells = set()
     self.initialize_rules()
 
+  def copy(self):
+    """O(1) copy-on-write clone: both KBs share their fact table until one of them changes it"""
+    clone = object.__new__(type(self))
+    clone.__dict__.update(self.__dict__)
+    clone.facts = FactSet(clone)
+    self.shared = clone.shared = True
+    return clone
+
+  __copy__ = copy
+
+  def _own_state(self):
+    if not self.shared:
+      return
+    self.shared = False
+    self.truth = bytearray(self.truth)
+    self.extra_facts = set(self.extra_facts)
+    self.agenda = set(self.agenda)
+    self.blocked_rules = set(self.blocked_rules)
+    self.wumpus_cells = set(self.wumpus_cells)
+    self.justifications = dict(self.justifications)
+    self.dependents = dict(self.dependents)
+    self.safe_cells = set(self.safe_cells)
+    self.visited_cells = set(self.visited_cells)
+    self.unvisited_safe_cells = set(self.unvisited_safe_cells)
+
+  def literal(self, predicate, i, j, negated=False):
+    return ((predicate * self.NN + i * self.N + j) << 1) | negated
+
+  def encode(self, fact):
+    parsed = parse_fact(fact)
+    if parsed is None:
+      return None
+    negated, name, i, j = parsed
+    predicate = PREDICATE_INDEX.get(name)
+    if predicate is None or not (0 <= i < self.N and 0 <= j < self.N):
+      return None
+    return self.literal(predicate, i, j, negated)
+
+  def decode(self, literal):
+    predicate, cell = divmod(literal >> 1, self.NN)
+    i, j = divmod(cell, self.N)
+    return f"{'~' if literal & 1 else ''}{PREDICATES[predicate]}({i}, {j})"
+
+  def holds(self, literal):
+    return bool(self.truth[literal >> 1] & (NEG if literal & 1 else POS))
+
+  def value(self, literal):
+    # same three-valued answer as is_premise_true, the positive fact wins if both are present
+    bits = self.truth[literal >> 1]
+    if bits & POS:
+      return not literal & 1
+    if bits & NEG:
+      return bool(literal & 1)
+    return None
+
+  def add_literal(self, literal, justification=None):
+    """Add literal, justification is the tuple of literals it was derived from (None for a told fact)"""
+    atom = literal >> 1
+    bit = NEG if literal & 1 else POS
+    if self.truth[atom] & bit:
+      if justification is None and literal in self.justifications:
+        # told after being derived, it no longer goes away with its old premises
+        self._own_state()
+        del self.justifications[literal]
+      return False
+    self._own_state()
+    self.truth[atom] |= bit
+    self.fact_count += 1
+    self.masks = None
+    self.dirty = True
+    if atom // self.NN in SAFETY_PREDICATES:
+      self.safety_version += 1
+      self._index_safety(atom % self.NN)
+    self.agenda.update(self.watchers[atom])
+    if bit == POS and atom // self.NN == WUMPUS:
+      self.wumpus_cells.add(atom % self.NN)
+      if len(self.wumpus_cells) >= self.wumpus:
+        self.wumpus_closure_pending = True
+    if justification is not None:
+      self.justifications[literal] = justification
+      for premise in justification:
+        self.dependents[premise] = self.dependents.get(premise, ()) + (literal,)
+    return True
+
+  def remove_literal(self, literal):
+    atom = literal >> 1
+    bit = NEG if literal & 1 else POS
+    if not self.truth[atom] & bit:
+      return False
+    self._own_state()
+    self.truth[atom] &= ~bit
+    self.fact_count -= 1
+    self.masks = None
+    self.dirty = True
+    if atom // self.NN in SAFETY_PREDICATES:
+      self.safety_version += 1
+      self._index_safety(atom % self.NN)
+    self.justifications.pop(literal, None)
+    self.agenda.update(self.watchers[atom])
+    if atom // self.NN == WUMPUS:
+      if bit == POS:
+        self.wumpus_cells.discard(atom % self.NN)
+        # a disjunction skipped because every wumpus was placed may fire again
+        self.agenda.update(self.blocked_rules)
+        self.blocked_rules.clear()
+      elif len(self.wumpus_cells) >= self.wumpus:
+        self.wumpus_closure_pending = True
+    return True
+
+  def _index_safety(self, cell):
+    """Re-check one cell for safe_cells after a P, W or Safe fact about it came or went"""
+    truth, NN = self.truth, self.NN
+    position = divmod(cell, self.N)
+    # same test as the agents' KB-safe check: Safe holds, or ~W and ~P hold without W or P
+    if truth[SAFE * NN + cell] & POS or (truth[WUMPUS * NN + cell] == NEG and truth[PIT * NN + cell] == NEG):
+      if position not in self.safe_cells:
+        self.safe_cells.add(position)
+        if position not in self.visited_cells:
+          self.unvisited_safe_cells.add(position)
+    elif position in self.safe_cells:
+      self.safe_cells.discard(position)
+      self.unvisited_safe_cells.discard(position)
+
+  def mark_visited(self, position):
+    """Record that the agent has been to position, so it leaves unvisited_safe_cells"""
+    if position in self.visited_cells:
+      return
+    self._own_state()
+    self.visited_cells.add(position)
+    self.unvisited_safe_cells.discard(position)
+
+  def retract_literal(self, literal):
+    """Remove literal and every derived fact that depends on it, returns how many facts were removed
+
+    Conclusions that still have another derivation come back on the next forward_chain,
+    since removing a fact puts the rules watching it back on the agenda.
+    """
+    removed = 0
+    stack = [literal]
+    while stack:
+      literal = stack.pop()
+      if not self.remove_literal(literal):
+        continue
+      removed += 1
+      for dependent in self.dependents.pop(literal, ()):
+        if literal in self.justifications.get(dependent, ()):
+          stack.append(dependent)
+    return removed
+
   def initialize_rules(self):
-    for i in range(0, self.N):
-      for j in range(0, self.N):
-        adj_cells = self.get_adjacent_cells(i, j)
-        
-        # breeze implies at least one adjacent pit
-        if adj_cells:
-          pit_symbols = [f'P({adj[0]}, {adj[1]})' for adj in adj_cells]
-          self.rules.append((f'B({i}, {j})', 'DISJUNCTION', pit_symbols))
-
-        # no breeze implies no pits in adjacent cells
-        for adj in adj_cells:
-          self.rules.append((f'~B({i}, {j})', 'IMPLIES', [f'~P({adj[0]}, {adj[1]})']))
-
-        # stench implies at least one wumpus
-        if adj_cells:
-          wumpus_symbols = [f'W({adj[0]}, {adj[1]})' for adj in adj_cells]
-          self.rules.append((f'S({i}, {j})', 'DISJUNCTION', wumpus_symbols))
-
-        # no stench implies no wumpus in adjacent cells
-        for adj in adj_cells:
-          self.rules.append((f'~S({i}, {j})', 'IMPLIES', [f'~W({adj[0]}, {adj[1]})']))
-
-        # no pit and no wumpus implies safe
-        self.rules.append((f'~P({i}, {j}) AND ~W({i}, {j})', 'IMPLIES', [f'Safe({i}, {j})']))
+    # the rule table only depends on N, so every KB of the same size shares one immutable copy
+    self.rules, self.watchers = build_rule_table(self.N)
 
   def get_adjacent_cells(self, i, j):
-    adj = []
-    for di, dj in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-      ni, nj = i + di, j + dj
-      if 0 <= ni < self.N and 0 <= nj < self.N:
-        adj.append((ni, nj))
-    return adj
+    return adjacent_cells(i, j, self.N)
 
   def add_fact(self, *symbols):
     for symbol in symbols:
-      if symbol not in self.facts:
-        normalized_symbol = self._normalize_fact_format(symbol)
-        if normalized_symbol not in self.facts:
-          self.facts.add(normalized_symbol)
+      literal = self.encode(symbol)
+      if literal is None:
+        self._own_state()
+        self.extra_facts.add(self._normalize_fact_format(symbol))
+      else:
+        self.add_literal(literal)
+
+  def tell(self, *symbols):
+    """Add facts and bring the KB to fixpoint, one inference pass for the whole group
+    (deferred to the end of the enclosing batch(), if any)"""
+    self.add_fact(*symbols)
+    self.forward_chain()
+
+  @contextmanager
+  def batch(self):
+    """Ingest a group of facts with a single inference pass
+
+    forward_chain() calls made inside the block are deferred, and one pass runs when
+    the outermost block exits, so a step that learns facts from several places still
+    infers once.
+    """
+    self.batch_depth += 1
+    try:
+      yield self
+    finally:
+      self.batch_depth -= 1
+    if not self.batch_depth:
+      self.forward_chain()
+
+  def retract_fact(self, *symbols):
+    removed = 0
+    for symbol in symbols:
+      literal = self.encode(symbol)
+      if literal is not None:
+        removed += self.retract_literal(literal)
+        continue
+      symbol = self._normalize_fact_format(symbol)
+      if symbol in self.extra_facts:
+        self._own_state()
+        self.extra_facts.discard(symbol)
+        removed += 1
+    return removed
 
   def _normalize_fact_format(self, fact):
-    import re
-    pattern = r'(\w+)\((\d+),\s*(\d+)\)'
-    match = re.match(pattern, fact)
-    if match:
-      predicate, x, y = match.groups()
-      return f"{predicate}({x}, {y})"
+    parsed = parse_fact(fact)
+    if parsed:
+      negated, predicate, x, y = parsed
+      return f"{'~' if negated else ''}{predicate}({x}, {y})"
     return fact
 
-  def forward_chain(self):
+  def forward_chain(self, incremental=True):
+    """Derive new facts until fixpoint; incremental mode only re-evaluates rules on the agenda
+
+    Skipped while no fact changed since the last pass, and deferred inside batch().
+    inference_passes counts the passes that actually ran.
+    """
+    if self.batch_depth or (incremental and not self.dirty):
+      return
+    self.inference_passes += 1
+    self._infer(incremental)
+    self.dirty = False
+    self.update_dangerous()
+
+  def _infer(self, incremental):
+    if incremental:
+      if self.agenda or self.wumpus_closure_pending:
+        self._own_state()
+      agenda = self.agenda
+      while True:
+        while agenda:
+          self._apply_rule(agenda.pop())
+        if not self._check_all_wumpus_found():
+          break
+    else:
+      self._own_state()
+      self._forward_chain_full()
+
+  def _forward_chain_full(self):
     new_facts = True
     iteration = 0
     while new_facts and iteration < 50:
       new_facts = False
       iteration += 1
-      
-      for premise, rule_type, conclusions in self.rules:
-        if rule_type == 'DISJUNCTION':
-          if self.is_premise_true(premise):
-            possible = [c for c in conclusions if self.is_premise_true(c) is not False]
-            
-            if len(possible) == 1:
-              wumpus_fact = possible[0]
-              if wumpus_fact.startswith('W(') and not self._can_add_wumpus():
-                continue
-                
-              if possible[0] not in self.facts:
-                self.facts.add(possible[0])
-                new_facts = True
-        elif rule_type == 'IMPLIES':
-            if 'AND' in premise:
-              p1, p2 = premise.split(' AND ')
-              premise_satisfied = self.is_premise_true(p1) is True and self.is_premise_true(p2) is True
-            else:
-              premise_satisfied = self.is_premise_true(premise) is True
-
-            if premise_satisfied:
-              for conclusion in conclusions:
-                if conclusion not in self.facts:
-                  self.facts.add(conclusion)
-                  new_facts = True
-      
+
+      for index in range(len(self.rules)):
+        if self._apply_rule(index):
+          new_facts = True
+
       if self._check_all_wumpus_found():
-        new_facts = True 
-    
-    self.update_dangerous()
+        new_facts = True
+
+    self.agenda.clear()
+
+  def _apply_rule(self, index):
+    value = self.value
+    premises, rule_type, conclusions = self.rules[index]
+    new_facts = False
+    if rule_type == 'DISJUNCTION':
+      if value(premises[0]):
+        possible = [c for c in conclusions if value(c) is not False]
+
+        if len(possible) == 1:
+          conclusion = possible[0]
+          if (conclusion >> 1) // self.NN == WUMPUS and not conclusion & 1 and not self._can_add_wumpus():
+            self.blocked_rules.add(index)
+            return False
+
+          # the conclusion rests on the premise and on every other disjunct being false
+          justification = premises + tuple(c ^ 1 for c in conclusions if c != conclusion)
+          if self.add_literal(conclusion, justification):
+            new_facts = True
+    elif rule_type == 'IMPLIES':
+        premise_satisfied = all(value(p) is True for p in premises)
+
+        if premise_satisfied:
+          for conclusion in conclusions:
+            if self.add_literal(conclusion, premises):
+              new_facts = True
+    return new_facts
 
   def _can_add_wumpus(self):
-    known_wumpus_count = 0
-    for i in range(self.N):
-      for j in range(self.N):
-        if f"W({i}, {j})" in self.facts:
-          known_wumpus_count += 1
-    return known_wumpus_count < self.wumpus
+    return len(self.wumpus_cells) < self.wumpus
 
   def _check_all_wumpus_found(self):
-    known_wumpus = []
-    for i in range(self.N):
-      for j in range(self.N):
-        if f"W({i}, {j})" in self.facts:
-          known_wumpus.append((i, j))
-    
-    if len(known_wumpus) >= self.wumpus:
-      facts_added = False
-      for i in range(self.N):
-        for j in range(self.N):
-          if (i, j) not in known_wumpus:
-            if f"~W({i}, {j})" not in self.facts:
-              self.facts.add(f"~W({i}, {j})")
-              facts_added = True
-      return facts_added
-    
-    return False              
-    
+    # only runs when the wumpus count reached its limit or a ~W was retracted after that
+    if not self.wumpus_closure_pending:
+      return False
+    self.wumpus_closure_pending = False
+    if len(self.wumpus_cells) < self.wumpus:
+      return False
+
+    base = WUMPUS * self.NN
+    support = tuple((base + cell) << 1 for cell in self.wumpus_cells)
+    facts_added = False
+    for cell in range(self.NN):
+      if cell not in self.wumpus_cells:
+        if self.add_literal(((base + cell) << 1) | 1, support):
+          facts_added = True
+    return facts_added
+
   # check if a premise is in facts or not
   def is_premise_true(self, premise):
+    literal = self.encode(premise)
+    if literal is not None:
+      return self.value(literal)
+
     if premise.startswith('~'):
       symbol = premise[1:]
-      if symbol in self.facts:
+      if symbol in self.extra_facts:
         return False
-      elif f'~{symbol}' in self.facts:
+      elif f'~{symbol}' in self.extra_facts:
         return True
       else:
         return None
     else:
-      if premise in self.facts:
+      if premise in self.extra_facts:
         return True
-      elif f'~{premise}' in self.facts:
+      elif f'~{premise}' in self.extra_facts:
         return False
       else:
-        return None  
-  
+        return None
+
+  def get_masks(self):
+    """Read-only N x N boolean arrays: known_safe, known_pit, known_wumpus, possible_wumpus, unknown, dangerous"""
+    if self.masks is None:
+      bits = np.frombuffer(self.truth, dtype=np.uint8).reshape(len(PREDICATES), self.N, self.N)
+      pit, wumpus, stench = bits[PIT], bits[WUMPUS], bits[STENCH]
+      known_pit = (pit & POS).astype(bool)
+      known_wumpus = (wumpus & POS).astype(bool)
+      # same answer as is_safe: ~P and ~W both hold and the positive fact is absent
+      known_safe = (pit == NEG) & (wumpus == NEG)
+
+      # is_possible_wumpus: a W fact, or no ~W fact and an adjacent stench
+      stench_near = np.zeros((self.N, self.N), dtype=bool)
+      stenched = (stench & POS).astype(bool)
+      stench_near[1:, :] |= stenched[:-1, :]
+      stench_near[:-1, :] |= stenched[1:, :]
+      stench_near[:, 1:] |= stenched[:, :-1]
+      stench_near[:, :-1] |= stenched[:, 1:]
+      possible_wumpus = known_wumpus | (stench_near & (wumpus == 0))
+
+      masks = {
+        'known_safe': known_safe,
+        'known_pit': known_pit,
+        'known_wumpus': known_wumpus,
+        'possible_wumpus': possible_wumpus,
+        'unknown': ~(known_safe | known_pit | known_wumpus),
+        'dangerous': ~known_safe & (known_pit | possible_wumpus | (pit == 0)),
+      }
+      for mask in masks.values():
+        mask.setflags(write=False)
+      self.masks = masks
+    return self.masks
+
+  @property
+  def known_safe(self):
+    return self.get_masks()['known_safe']
+
+  @property
+  def known_pit(self):
+    return self.get_masks()['known_pit']
+
+  @property
+  def known_wumpus(self):
+    return self.get_masks()['known_wumpus']
+
+  @property
+  def possible_wumpus(self):
+    return self.get_masks()['possible_wumpus']
+
+  @property
+  def unknown(self):
+    return self.get_masks()['unknown']
+
   def update_dangerous(self):
-    self.dangerous.clear()
-    for i in range(self.N):
-      for j in range(self.N):
-        if self.is_safe(i, j):
-          continue
-
-        if f"W({i}, {j})" in self.facts or f"P({i}, {j})" in self.facts:
-          self.dangerous.append((i, j))
-        elif self.is_possible_wumpus(i, j): 
-          self.dangerous.append((i, j))
-        elif self.is_premise_true(f"P({i}, {j})") is None:
-          self.dangerous.append((i, j))
+    # rebuilt as a new list rather than in place, copies may still share the old one
+    self.dangerous = [tuple(cell) for cell in np.argwhere(self.get_masks()['dangerous']).tolist()]
 
   def get_dangerous_cells(self):
     self.update_dangerous()
-    return self.dangerous    
-  
+    return self.dangerous
+
   def current_facts(self):
     return self.facts
 
@@ -167,25 +555,26 @@ class KnowledgeBase:
       print(fact)
 
   def remove_wumpus(self, i, j):
-    self.add_fact(f"~W({i}, {j})")
+    self.add_literal(self.literal(WUMPUS, i, j, True))
     self.forward_chain()
 
   def is_possible_wumpus(self, i, j):
-    if f"W({i}, {j})" in self.facts:
-        return True 
-    if f"~W({i}, {j})" in self.facts:
-        return False 
-    
-    adj = self.get_adjacent_cells(i, j)
-    for ni, nj in adj:
-        if f"S({ni}, {nj})" in self.facts: 
-            return True 
+    bits = self.truth[WUMPUS * self.NN + i * self.N + j]
+    if bits & POS:
+        return True
+    if bits & NEG:
+        return False
+
+    base = STENCH * self.NN
+    for ni, nj in self.get_adjacent_cells(i, j):
+        if self.truth[base + ni * self.N + nj] & POS:
+            return True
     return False
-  
+
   def is_safe(self, i, j):
-    return self.is_premise_true(f"~W({i}, {j})") and self.is_premise_true(f"~P({i}, {j})")
+    return self.value(self.literal(WUMPUS, i, j, True)) and self.value(self.literal(PIT, i, j, True))
 
   def is_stench(self, i, j):
     if 0 <= i < self.N and 0 <= j < self.N:
         return self.stench_cells[i][j]
-    return False
\ No newline at end of file
+    return False
@@ -0,0 +1,270 @@
+"""
+Monte Carlo particle filter over whole Wumpus worlds, used by RiskCalculator(mode="particles")
+"""
+import copy
+
+import numpy as np
+
+# WumpusWorldGenerator never puts a Wumpus or a pit on these cells
+PROTECTED_CELLS = [(0, 0), (0, 1), (1, 0)]
+
+
+class ParticleFilter:
+    """Population of candidate worlds consistent with every percept seen so far
+
+    Each particle is a pit bitmask and a Wumpus bitmask over the N*N cells (one row of
+    self.pits / self.wumpus), drawn with WumpusWorldGenerator's priors: wumpus_count
+    Wumpuses uniformly off the protected cells, then int((N^2 - 1) * pits_probability)
+    pits uniformly over the remaining cells that are not next to a Wumpus. The gold cell
+    is not modelled. Percepts are hard evidence, so after filtering every particle has
+    the same weight and a cell's risk is the fraction of particles with a hazard there.
+
+    Every observation is a resample-move step: particles contradicting the new percept
+    are dropped, the population is topped up (with fresh prior samples that pass every
+    observation while that still works, otherwise by duplicating survivors) and then
+    every particle takes Metropolis moves (move one Wumpus or one pit) that keep it
+    consistent, so duplicates drift apart. If no particle survives a percept, the old
+    population is repaired by moves that never increase the number of contradicted
+    percepts until some worlds fit again.
+    """
+
+    def __init__(self, N, wumpus_count=2, pits_probability=0.2, budget=2048,
+                 prior_batches=2, mcmc_steps=4, repair_steps=64, seed=None):
+        self.N = N
+        self.NN = N * N
+        self.wumpus_count = wumpus_count
+        self.pit_count = int((self.NN - 1) * pits_probability)
+        self.budget = budget
+        self.prior_batches = prior_batches
+        self.mcmc_steps = mcmc_steps
+        self.repair_steps = repair_steps
+        self.rng = np.random.default_rng(seed)
+
+        # the 4 neighbours of every cell, padded with the cell itself at the edges: a hazard on
+        # the cell already contradicts its percept, so the padding never changes a violation count
+        self.neighbours = np.empty((self.NN, 4), dtype=np.int64)
+        for i in range(N):
+            for j in range(N):
+                for k, (di, dj) in enumerate([(0, 1), (1, 0), (0, -1), (-1, 0)]):
+                    ni, nj = i + di, j + dj
+                    inside = 0 <= ni < N and 0 <= nj < N
+                    self.neighbours[i * N + j, k] = ni * N + nj if inside else i * N + j
+        self.protected = np.zeros(self.NN, dtype=bool)
+        for i, j in PROTECTED_CELLS:
+            if i < N and j < N:
+                self.protected[i * N + j] = True
+
+        # observations: visited cell -> (stench, breeze)
+        self.observations = {}
+        self.observed_cells = np.zeros(0, dtype=np.int64)
+        self.observed_stench = np.zeros(0, dtype=bool)
+        self.observed_breeze = np.zeros(0, dtype=bool)
+
+        self.wumpus, self.pits = self._sample_prior(budget)
+        self.failed = False
+        self.estimates = None
+        self.sample_size = None
+
+    def copy(self):
+        clone = object.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        # arrays are replaced, not written in place, so only the mutable containers need copying
+        clone.observations = dict(self.observations)
+        # an independent copy of the generator: cloning must not advance the original's stream
+        clone.rng = copy.deepcopy(self.rng)
+        return clone
+
+    def observe(self, position, stench, breeze):
+        """Condition the population on surviving at position with the given percepts"""
+        i, j = position
+        cell = i * self.N + j
+        if self.observations.get(cell) == (stench, breeze):
+            return
+        changed = cell in self.observations
+        self.observations[cell] = (stench, breeze)
+        self._index_observations()
+        if changed:
+            # the percept at a visited cell changed (a Wumpus moved or died): every particle
+            # was conditioned on the stale percept, so rescore against everything
+            violations = self._violations(self.wumpus, self.pits)
+        else:
+            violations = self._violations(self.wumpus, self.pits, np.array([cell]),
+                                          np.array([stench]), np.array([breeze]))
+
+        keep = violations == 0
+        if not keep.any():
+            self._repair(violations)
+            keep = self._violations(self.wumpus, self.pits) == 0
+        self.wumpus, self.pits = self.wumpus[keep], self.pits[keep]
+        self._refill()
+        self.failed = len(self.wumpus) == 0
+        self.estimates = None
+
+    def _index_observations(self):
+        cells = sorted(self.observations)
+        self.observed_cells = np.array(cells, dtype=np.int64)
+        self.observed_stench = np.array([self.observations[c][0] for c in cells], dtype=bool)
+        self.observed_breeze = np.array([self.observations[c][1] for c in cells], dtype=bool)
+
+    def _sample_prior(self, count):
+        """Draw count worlds the way WumpusWorldGenerator places Wumpuses and pits"""
+        NN = self.NN
+        wumpus = np.zeros((count, NN), dtype=bool)
+        pits = np.zeros((count, NN), dtype=bool)
+        rows = np.arange(count)[:, None]
+
+        # a uniform k-subset per row: the k smallest of independent uniform keys
+        keys = self.rng.random((count, NN))
+        keys[:, self.protected] = np.inf
+        k = min(self.wumpus_count, int((~self.protected).sum()))
+        if k:
+            chosen = np.argpartition(keys, k - 1, axis=1)[:, :k]
+            wumpus[rows, chosen] = True
+
+        blocked = wumpus | self._spread(wumpus) | self.protected
+        keys = self.rng.random((count, NN))
+        keys[blocked] = np.inf
+        m = min(self.pit_count, NN)
+        if m:
+            chosen = np.argpartition(keys, m - 1, axis=1)[:, :m]
+            # rows with fewer than m free cells just get every free cell
+            pits[rows, chosen] = np.isfinite(keys[rows, chosen])
+        return wumpus, pits
+
+    def _spread(self, mask):
+        """Cells next to at least one set cell, for every particle at once"""
+        grid = mask.reshape(-1, self.N, self.N)
+        near = np.zeros_like(grid)
+        near[:, 1:, :] |= grid[:, :-1, :]
+        near[:, :-1, :] |= grid[:, 1:, :]
+        near[:, :, 1:] |= grid[:, :, :-1]
+        near[:, :, :-1] |= grid[:, :, 1:]
+        return near.reshape(mask.shape)
+
+    def _violations(self, wumpus, pits, cells=None, stench=None, breeze=None):
+        """Per row, how many observed cells the world contradicts (all observations by default)"""
+        if cells is None:
+            cells, stench, breeze = self.observed_cells, self.observed_stench, self.observed_breeze
+        if len(cells) == 0:
+            return np.zeros(len(wumpus), dtype=np.int64)
+        around = self.neighbours[cells]
+        wrong = wumpus[:, cells] | pits[:, cells]
+        wrong |= wumpus[:, around].any(axis=2) != stench
+        wrong |= pits[:, around].any(axis=2) != breeze
+        return wrong.sum(axis=1)
+
+    def _valid_prior(self, wumpus, pits):
+        """Rows the generator could have produced: nothing protected, no pit on or next to a Wumpus"""
+        hazards = wumpus | pits
+        return ~((hazards & self.protected).any(axis=1) |
+                 (pits & (wumpus | self._spread(wumpus))).any(axis=1))
+
+    def _refill(self):
+        """Top the population back up to the budget, then let every particle move"""
+        wumpus, pits = [self.wumpus], [self.pits]
+        have = len(self.wumpus)
+        for _ in range(self.prior_batches):
+            if have >= self.budget:
+                break
+            fresh_wumpus, fresh_pits = self._sample_prior(self.budget)
+            keep = self._violations(fresh_wumpus, fresh_pits) == 0
+            if not keep.any():
+                # the evidence has outgrown the prior, later batches would be wasted too
+                break
+            wumpus.append(fresh_wumpus[keep])
+            pits.append(fresh_pits[keep])
+            have += int(keep.sum())
+        wumpus = np.concatenate(wumpus)[:self.budget]
+        pits = np.concatenate(pits)[:self.budget]
+        if len(wumpus) == 0:
+            self.wumpus, self.pits = wumpus, pits
+            return
+
+        if len(wumpus) < self.budget:
+            picks = self.rng.integers(len(wumpus), size=self.budget - len(wumpus))
+            wumpus = np.concatenate([wumpus, wumpus[picks]])
+            pits = np.concatenate([pits, pits[picks]])
+        violations = np.zeros(len(wumpus), dtype=np.int64)
+        for _ in range(self.mcmc_steps):
+            wumpus, pits, violations = self._metropolis_step(wumpus, pits, violations)
+        self.wumpus, self.pits = wumpus, pits
+
+    def _repair(self, violations):
+        """Move particles towards the evidence until at least one contradicts no percept"""
+        wumpus, pits = self.wumpus, self.pits
+        for _ in range(self.repair_steps):
+            wumpus, pits, violations = self._metropolis_step(wumpus, pits, violations)
+            if (violations == 0).any():
+                break
+        self.wumpus, self.pits = wumpus, pits
+
+    @staticmethod
+    def _random_member(mask, keys):
+        """One random set cell per row (rows must have at least one), picked by the largest key"""
+        return np.where(mask, keys, -1.0).argmax(axis=1)
+
+    def _metropolis_step(self, wumpus, pits, violations):
+        """Move one Wumpus or one pit per particle, accepting moves that keep the prior valid
+        and do not contradict more percepts than before
+
+        For consistent particles that means staying consistent: the posterior is uniform over
+        valid consistent worlds and picking (occupied cell, free cell) uniformly is symmetric,
+        so accepting every such proposal is exact Metropolis-Hastings.
+        """
+        count = len(wumpus)
+        if count == 0:
+            return wumpus, pits, violations
+        rows = np.arange(count)
+        move_wumpus = (self.rng.random(count) < 0.5)[:, None]
+        layer = np.where(move_wumpus, wumpus, pits)
+        movable = layer.any(axis=1) & ~layer.all(axis=1)
+        # rows that cannot move get an all-True mask so _random_member stays well defined; one key
+        # array serves both picks since the occupied and free cells of a movable row are disjoint
+        keys = self.rng.random(layer.shape, dtype=np.float32)
+        source = self._random_member(layer | ~movable[:, None], keys)
+        target = self._random_member(~layer | ~movable[:, None], keys)
+
+        moved = layer.copy()
+        moved[rows[movable], source[movable]] = False
+        moved[rows[movable], target[movable]] = True
+        new_wumpus = np.where(move_wumpus, moved, wumpus)
+        new_pits = np.where(move_wumpus, pits, moved)
+
+        new_violations = self._violations(new_wumpus, new_pits)
+        accept = self._valid_prior(new_wumpus, new_pits) & (new_violations <= violations)
+        return (np.where(accept[:, None], new_wumpus, wumpus), np.where(accept[:, None], new_pits, pits),
+                np.where(accept, new_violations, violations))
+
+    def distinct_particles(self):
+        """Number of distinct worlds in the population, used as the sample size for intervals"""
+        if len(self.wumpus) == 0:
+            return 0
+        return len(np.unique(np.packbits(np.concatenate([self.wumpus, self.pits], axis=1), axis=1), axis=0))
+
+    def estimate(self):
+        """(wumpus, pit, total) N x N arrays of hazard frequencies, None once no particle is left"""
+        if self.failed:
+            return None
+        if self.estimates is None:
+            shape = (self.N, self.N)
+            self.estimates = (
+                self.wumpus.mean(axis=0).reshape(shape),
+                self.pits.mean(axis=0).reshape(shape),
+                (self.wumpus | self.pits).mean(axis=0).reshape(shape),
+            )
+            self.sample_size = None
+        return self.estimates
+
+    def interval(self, position, z=1.96):
+        """Wilson score interval for the total risk at position, None once no particle is left"""
+        estimates = self.estimate()
+        if estimates is None:
+            return None
+        risk = float(estimates[2][position])
+        if self.sample_size is None:
+            self.sample_size = self.distinct_particles()
+        n = self.sample_size
+        denominator = 1 + z * z / n
+        center = (risk + z * z / (2 * n)) / denominator
+        half = z * (risk * (1 - risk) / n + z * z / (4 * n * n)) ** 0.5 / denominator
+        return max(0.0, center - half), min(1.0, center + half)
@@ -1,9 +1,26 @@
 """
 Risk Calculator for Wumpus World - calculates probability of danger in each cell
 """
+from math import comb
+
+import numpy as np
+
+from env_simulator.particle_filter import ParticleFilter
+
+RISK_MODES = ("heuristic", "exact", "particles")
+
+
 class RiskCalculator:
-    def __init__(self, N):
+    def __init__(self, N, mode="heuristic", wumpus_count=2, pit_probability=0.2, max_component_size=20,
+                 particles=2048, seed=None):
+        if mode not in RISK_MODES:
+            raise ValueError(f"Unknown risk mode {mode!r}, expected one of {RISK_MODES}")
         self.N = N
+        self.mode = mode
+        self.wumpus_count = wumpus_count
+        self.pit_probability = pit_probability
+        # frontier components needing more placements than 2 ** max_component_size use the heuristic
+        self.max_component_size = max_component_size
         self.visited = set()
         self.safe_cells = set()
         self.dangerous_cells = set()
@@ -11,9 +28,47 @@ class RiskCalculator:
         self.breeze_cells = set()
         self.no_stench_cells = set()
         self.no_breeze_cells = set()
+        # True while the cell sets are shared with a copy(), the next update copies them first
+        self.shared = False
+        # exact mode: posteriors per hazard ('P' / 'W'), dropped on every new percept, and the
+        # enumeration result of each frontier component keyed by its constraints, so components
+        # a percept did not touch are reused. Both dicts are replaced, never updated in place.
+        self.posteriors = {}
+        self.component_cache = {}
+        self.enumerations = 0
+        # whole-grid risk arrays from risk_grid(), valid until the next percept
+        self.grid = None
+        # particles mode: sampled worlds conditioned on every percept, for maps too big to enumerate
+        self.particle_filter = None
+        if mode == "particles":
+            self.particle_filter = ParticleFilter(N, wumpus_count, pit_probability, budget=particles, seed=seed)
+
+    def copy(self):
+        """O(1) copy-on-write clone, the cell sets are only copied when one side updates"""
+        clone = object.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        self.shared = clone.shared = True
+        return clone
+
+    __copy__ = copy
+
+    def _own_state(self):
+        if not self.shared:
+            return
+        self.shared = False
+        for name in ('visited', 'safe_cells', 'dangerous_cells', 'stench_cells',
+                     'breeze_cells', 'no_stench_cells', 'no_breeze_cells'):
+            setattr(self, name, set(getattr(self, name)))
+        if self.particle_filter is not None:
+            self.particle_filter = self.particle_filter.copy()
         
     def update_perception(self, position, percepts):
         """Update risk calculations based on new perceptions"""
+        self._own_state()
+        self.posteriors = {}
+        self.grid = None
+        if self.particle_filter is not None:
+            self.particle_filter.observe(position, "Stench" in percepts, "Breeze" in percepts)
         self.visited.add(position)
         
         if "Stench" in percepts:
@@ -40,6 +95,15 @@ class RiskCalculator:
         i, j = position
         if not (0 <= i < self.N and 0 <= j < self.N):
             return 1.0  # Out of bounds = dangerous
+
+        if self.mode == "exact":
+            probability = self._exact_probability('W', position)
+            if probability is not None:
+                return probability
+        elif self.mode == "particles":
+            estimates = self.particle_filter.estimate()
+            if estimates is not None:
+                return float(estimates[0][position])
             
         # Base probability (assume uniform distribution of remaining Wumpuses)
         unvisited_cells = []
@@ -88,6 +152,15 @@ class RiskCalculator:
         i, j = position
         if not (0 <= i < self.N and 0 <= j < self.N):
             return 1.0  # Out of bounds = dangerous
+
+        if self.mode == "exact":
+            probability = self._exact_probability('P', position)
+            if probability is not None:
+                return probability
+        elif self.mode == "particles":
+            estimates = self.particle_filter.estimate()
+            if estimates is not None:
+                return float(estimates[1][position])
             
         # Base pit probability (typically 0.2 in Wumpus World)
         base_prob = 0.2
@@ -116,8 +189,290 @@ class RiskCalculator:
         
         return min(1.0, base_prob)
     
+    def _exact_probability(self, hazard, position):
+        """Posterior probability of hazard at position, None where the heuristic has to answer"""
+        return self._posterior(hazard).get(position)
+
+    def _posterior(self, hazard):
+        """Cached exact posterior {cell: probability} for hazard, computed on first use"""
+        posterior = self.posteriors.get(hazard)
+        if posterior is None:
+            posterior = self._compute_posterior(hazard)
+            self.posteriors = {**self.posteriors, hazard: posterior}
+        return posterior
+
+    def _compute_posterior(self, hazard):
+        """Exact posterior for every unvisited cell given the breeze (P) or stench (W) percepts
+
+        Pits are independent with prior pit_probability; there are exactly wumpus_count
+        Wumpuses placed uniformly. Only frontier cells (unknown cells next to a breeze /
+        stench) are enumerated, one connected component at a time, and the components are
+        combined through their hazard-count distributions, so the cost is exponential in
+        the largest component rather than in the whole frontier.
+        """
+        if hazard == 'P':
+            positive, negative, max_hazards = self.breeze_cells, self.no_breeze_cells, None
+        else:
+            positive, negative, max_hazards = self.stench_cells, self.no_stench_cells, self.wumpus_count
+
+        posterior = {}
+        cleared = self.visited | self.safe_cells
+        for cell in negative:
+            cleared.update(self.get_adjacent_cells(cell))
+        for cell in cleared:
+            posterior[cell] = 0.0
+
+        # each breeze / stench says "at least one of these unknown cells holds the hazard"
+        constraints = set()
+        for cell in positive:
+            scope = frozenset(adj for adj in self.get_adjacent_cells(cell) if adj not in cleared)
+            if scope:
+                constraints.add(scope)
+
+        # union-find over frontier cells that share a constraint
+        parent = {}
+
+        def find(cell):
+            while parent[cell] != cell:
+                parent[cell] = parent[parent[cell]]
+                cell = parent[cell]
+            return cell
+
+        for scope in constraints:
+            for cell in scope:
+                parent.setdefault(cell, cell)
+            first = find(next(iter(scope)))
+            for cell in scope:
+                parent[find(cell)] = first
+
+        components = {}
+        for scope in constraints:
+            components.setdefault(find(next(iter(scope))), []).append(scope)
+
+        previous_cache = self.component_cache.get(hazard, {})
+        cache = {}
+        tables = []
+        skipped = set()
+        for scopes in components.values():
+            key = frozenset(scopes)
+            cells = sorted(set().union(*scopes))
+            table = cache.get(key) or previous_cache.get(key)
+            if table is None:
+                if self._enumeration_size(len(cells), max_hazards) > 2 ** self.max_component_size:
+                    skipped.update(cells)
+                    continue
+                table = self._enumerate_component(cells, scopes, max_hazards)
+                self.enumerations += 1
+            cache[key] = table
+            tables.append((cells, table))
+        self.component_cache = {**self.component_cache, hazard: cache}
+
+        frontier = set(parent)
+        rest = [(i, j) for i in range(self.N) for j in range(self.N)
+                if (i, j) not in cleared and (i, j) not in frontier]
+
+        if hazard == 'P':
+            self._combine_independent(posterior, tables, rest)
+        elif not self._combine_counted(posterior, tables, len(rest) + len(skipped), rest):
+            # no placement of wumpus_count Wumpuses explains the stenches (one moved or died)
+            return {cell: 0.0 for cell in cleared}
+
+        for cell in skipped:
+            posterior.pop(cell, None)
+        return posterior
+
+    @staticmethod
+    def _enumeration_size(n, max_hazards):
+        if max_hazards is None or max_hazards >= n:
+            return 2 ** n
+        return sum(comb(n, m) for m in range(max_hazards + 1))
+
+    @staticmethod
+    def _enumerate_component(cells, scopes, max_hazards):
+        """Count hazard placements on cells satisfying every scope, grouped by number of hazards
+
+        Returns {m: (placements, per-cell counts)}: how many valid placements use m hazards
+        and, for each cell, in how many of those it holds one.
+        """
+        index = {cell: k for k, cell in enumerate(cells)}
+        # a constraint is checked as soon as its last cell has been assigned
+        closing = [[] for _ in cells]
+        for scope in scopes:
+            members = [index[cell] for cell in scope]
+            closing[max(members)].append(members)
+
+        n = len(cells)
+        placements = {}
+        counts = {}
+        assignment = [False] * n
+
+        def extend(k, m):
+            if k == n:
+                placements[m] = placements.get(m, 0) + 1
+                row = counts.setdefault(m, [0] * n)
+                for position in range(n):
+                    if assignment[position]:
+                        row[position] += 1
+                return
+            for value in (False, True):
+                if value and max_hazards is not None and m >= max_hazards:
+                    break
+                assignment[k] = value
+                if all(any(assignment[c] for c in members) for members in closing[k]):
+                    extend(k + 1, m + value)
+            assignment[k] = False
+
+        extend(0, 0)
+        return {m: (placements[m], tuple(counts[m])) for m in placements}
+
+    def _combine_independent(self, posterior, tables, rest):
+        p = self.pit_probability
+        q = 1 - p
+        for cells, table in tables:
+            n = len(cells)
+            weights = {m: p ** m * q ** (n - m) for m in table}
+            total = sum(table[m][0] * weights[m] for m in table)
+            for position, cell in enumerate(cells):
+                posterior[cell] = sum(table[m][1][position] * weights[m] for m in table) / total
+        for cell in rest:
+            posterior[cell] = p
+
+    def _combine_counted(self, posterior, tables, rest_size, rest):
+        """Exactly wumpus_count Wumpuses: the frontier components and the rest share the count"""
+        k = self.wumpus_count
+        polynomials = [[table[m][0] if m in table else 0 for m in range(k + 1)] for _, table in tables]
+
+        def multiply(a, b):
+            product = [0] * (k + 1)
+            for x, ax in enumerate(a):
+                if ax:
+                    for y in range(k + 1 - x):
+                        product[x + y] += ax * b[y]
+            return product
+
+        def product_of(polys):
+            result = [1] + [0] * k
+            for poly in polys:
+                result = multiply(result, poly)
+            return result
+
+        everything = product_of(polynomials)
+        total = sum(everything[s] * comb(rest_size, k - s) for s in range(k + 1))
+        if total == 0:
+            return False
+
+        for index, (cells, table) in enumerate(tables):
+            others = product_of(polynomials[:index] + polynomials[index + 1:])
+            for position, cell in enumerate(cells):
+                weight = 0
+                for m, (_, per_cell) in table.items():
+                    if m <= k and per_cell[position]:
+                        weight += per_cell[position] * sum(
+                            others[s] * comb(rest_size, k - m - s) for s in range(k + 1 - m))
+                posterior[cell] = weight / total
+
+        if rest_size:
+            rest_weight = sum(everything[s] * comb(rest_size - 1, k - s - 1) for s in range(k))
+            for cell in rest:
+                posterior[cell] = rest_weight / total
+        return True
+
+    def risk_grid(self):
+        """Read-only N x N arrays 'wumpus', 'pit' and 'total' for every cell, cached until the next percept"""
+        if self.grid is None:
+            estimates = self.particle_filter.estimate() if self.mode == "particles" else None
+            if estimates is not None:
+                wumpus, pit, total = (self._with_known_cells(array) for array in estimates)
+            else:
+                if self.mode == "exact":
+                    wumpus, pit = self._exact_grids()
+                else:
+                    wumpus, pit = self._heuristic_grids()
+                total = 1 - (1 - wumpus) * (1 - pit)
+            grid = {'wumpus': wumpus, 'pit': pit, 'total': total}
+            for array in grid.values():
+                array.setflags(write=False)
+            self.grid = grid
+        return self.grid
+
+    def risk_interval(self, position, z=1.96):
+        """Confidence interval (low, high) for calculate_total_risk(position)
+
+        Only particles mode has sampling error; it gives a Wilson score interval using the
+        number of distinct particles as the sample size. Other modes return (risk, risk).
+        """
+        risk = self.calculate_total_risk(position)
+        i, j = position
+        if (self.mode != "particles" or not (0 <= i < self.N and 0 <= j < self.N)
+                or position in self.visited or position in self.safe_cells
+                or position in self.dangerous_cells):
+            return risk, risk
+        interval = self.particle_filter.interval(position, z)
+        return interval if interval is not None else (risk, risk)
+
+    def _with_known_cells(self, array):
+        """Copy of a particle estimate with the visited / safe / dangerous overrides applied"""
+        array = np.array(array, dtype=float)
+        array[self._cell_mask(self.dangerous_cells)] = 1.0
+        array[self._cell_mask(self.visited | self.safe_cells)] = 0.0
+        return array
+
+    def _cell_mask(self, cells):
+        mask = np.zeros((self.N, self.N), dtype=bool)
+        for i, j in cells:
+            mask[i, j] = True
+        return mask
+
+    @staticmethod
+    def _neighbour_count(mask):
+        """Number of 4-neighbours of every cell that are set in mask"""
+        counts = np.zeros(mask.shape, dtype=np.int64)
+        counts[1:, :] += mask[:-1, :]
+        counts[:-1, :] += mask[1:, :]
+        counts[:, 1:] += mask[:, :-1]
+        counts[:, :-1] += mask[:, 1:]
+        return counts
+
+    def _heuristic_grids(self):
+        """Same numbers as calculate_wumpus_probability / calculate_pit_probability, for all cells at once"""
+        known = self._cell_mask(self.visited | self.safe_cells)
+        dangerous = self._cell_mask(self.dangerous_cells)
+        stench = self._cell_mask(self.stench_cells)
+        breeze = self._cell_mask(self.breeze_cells)
+        # a neighbour counts as a stench (breeze) if it ever had one, as in the per-cell loop
+        no_stench = self._cell_mask(self.no_stench_cells) & ~stench
+        no_breeze = self._cell_mask(self.no_breeze_cells) & ~breeze
+
+        unvisited = int((~known).sum())
+        base = 1.0 / unvisited if unvisited else 0.0
+        wumpus = base * (1 + self._neighbour_count(stench) * 2)
+        wumpus /= 1 + self._neighbour_count(no_stench) * 0.5
+        pit = 0.2 * (1 + self._neighbour_count(breeze) * 3)
+        pit /= 1 + self._neighbour_count(no_breeze) * 2
+
+        wumpus = np.minimum(wumpus, 1.0)
+        pit = np.minimum(pit, 1.0)
+        for grid in (wumpus, pit):
+            grid[dangerous] = 1.0
+            grid[known] = 0.0
+        return wumpus, pit
+
+    def _exact_grids(self):
+        # cells without an exact posterior keep the heuristic value, as in the per-cell methods
+        wumpus, pit = self._heuristic_grids()
+        fixed = self.visited | self.safe_cells | self.dangerous_cells
+        for grid, hazard in ((wumpus, 'W'), (pit, 'P')):
+            for position, probability in self._posterior(hazard).items():
+                if position not in fixed:
+                    grid[position] = probability
+        return wumpus, pit
+
     def calculate_total_risk(self, position):
         """Calculate total risk (death probability) at given position"""
+        i, j = position
+        if 0 <= i < self.N and 0 <= j < self.N:
+            return float(self.risk_grid()['total'][i, j])
+
         wumpus_prob = self.calculate_wumpus_probability(position)
         pit_prob = self.calculate_pit_probability(position)
         
@@ -0,0 +1,169 @@
+"""
+SAT entailment backend for the Wumpus World knowledge base
+"""
+from env_simulator.kb import KnowledgeBase, PIT, WUMPUS, BREEZE, STENCH, POS, NEG
+from env_simulator.sat_solver import SATSolver
+
+
+class SATKnowledgeBase(KnowledgeBase):
+    """KnowledgeBase that proves frontier cells safe or deadly by SAT entailment
+
+    The percepts and P/W facts are compiled into CNF (a breeze is the clause "one of the
+    adjacent cells has a pit", plus an at-most-k constraint on Wumpuses). After the rule
+    engine runs, every unknown P/W atom next to a breeze or stench is tested under an
+    assumption: if KB + W(x) is UNSAT then ~W(x) is entailed, if KB + ~W(x) is UNSAT then
+    W(x) is. Conclusions go back into the fact table, so every query method is unchanged.
+    """
+
+    def __init__(self, N=8, wumpus=2):
+        self.solver = None
+        self.encoded = None
+        self.pending_atoms = []
+        self.frontier = set()
+        self.sat_calls = 0
+        super().__init__(N, wumpus)
+
+    def copy(self):
+        clone = super().copy()
+        # the solver only ever gains clauses, so the clone rebuilds its own from the shared facts
+        clone.solver = None
+        clone.encoded = None
+        clone.pending_atoms = []
+        clone.frontier = set()
+        return clone
+
+    __copy__ = copy
+
+    def add_literal(self, literal, justification=None):
+        if not super().add_literal(literal, justification):
+            return False
+        self.pending_atoms.append(literal >> 1)
+        return True
+
+    def remove_literal(self, literal):
+        if not super().remove_literal(literal):
+            return False
+        # clauses only ever accumulate in the solver, so a retraction means rebuilding it
+        self.solver = None
+        return True
+
+    def retract_literal(self, literal):
+        removed = super().retract_literal(literal)
+        if removed:
+            # SAT conclusions (empty justification) rest on the whole CNF, so they all go and get re-proved
+            for entailed in [l for l, premises in self.justifications.items() if not premises]:
+                removed += super().retract_literal(entailed)
+        return removed
+
+    def _infer(self, incremental):
+        # one inference pass runs the rules and the SAT queries to a joint fixpoint
+        super()._infer(incremental)
+        while self._deduce_frontier():
+            super()._infer(incremental)
+
+    def _build_solver(self):
+        self.solver = SATSolver(len(self.truth))
+        self.encoded = bytearray(len(self.truth))
+        self.frontier = set()
+        self.pending_atoms = [atom for atom, bits in enumerate(self.truth) if bits]
+        self._add_wumpus_limit()
+
+    def _add_wumpus_limit(self):
+        """At most self.wumpus W atoms are true, using the sequential counter encoding"""
+        solver = self.solver
+        xs = [(WUMPUS * self.NN + cell) << 1 for cell in range(self.NN)]
+        k = self.wumpus
+        n = len(xs)
+        if k <= 0:
+            for x in xs:
+                solver.add_clause([x ^ 1])
+            return
+        if k >= n:
+            return
+
+        base = solver.new_vars((n - 1) * k)
+
+        def s(i, j):
+            # true when at least j + 1 of the first i + 1 cells hold a Wumpus
+            return (base + i * k + j) << 1
+
+        solver.add_clause([xs[0] ^ 1, s(0, 0)])
+        for j in range(1, k):
+            solver.add_clause([s(0, j) ^ 1])
+        for i in range(1, n - 1):
+            solver.add_clause([xs[i] ^ 1, s(i, 0)])
+            solver.add_clause([s(i - 1, 0) ^ 1, s(i, 0)])
+            for j in range(1, k):
+                solver.add_clause([xs[i] ^ 1, s(i - 1, j - 1) ^ 1, s(i, j)])
+                solver.add_clause([s(i - 1, j) ^ 1, s(i, j)])
+            solver.add_clause([xs[i] ^ 1, s(i - 1, k - 1) ^ 1])
+        solver.add_clause([xs[n - 1] ^ 1, s(n - 2, k - 1) ^ 1])
+
+    def _sync_solver(self):
+        """Send the facts added since the last call to the solver as clauses"""
+        if self.solver is None:
+            self._build_solver()
+        solver = self.solver
+        NN = self.NN
+        for atom in self.pending_atoms:
+            bits = self.truth[atom] & ~self.encoded[atom]
+            if not bits:
+                continue
+            self.encoded[atom] |= bits
+            predicate, cell = divmod(atom, NN)
+
+            if predicate == PIT or predicate == WUMPUS:
+                if bits & POS:
+                    solver.add_clause([atom << 1])
+                if bits & NEG:
+                    solver.add_clause([atom << 1 | 1])
+            elif predicate == BREEZE or predicate == STENCH:
+                target = (PIT if predicate == BREEZE else WUMPUS) * NN
+                i, j = divmod(cell, self.N)
+                neighbours = [target + ni * self.N + nj for ni, nj in self.get_adjacent_cells(i, j)]
+                if bits & POS:
+                    solver.add_clause([n << 1 for n in neighbours])
+                    self.frontier.update(neighbours)
+                if bits & NEG:
+                    for n in neighbours:
+                        solver.add_clause([n << 1 | 1])
+        self.pending_atoms = []
+
+    def _deduce_frontier(self):
+        """Add every frontier P/W literal the CNF entails, returns True if any fact was added"""
+        self._sync_solver()
+        solver = self.solver
+        self.sat_calls += 1
+        if not solver.solve():
+            # contradictory facts (e.g. a stale stench after a kill) entail everything, leave them to the rules
+            return False
+
+        truth = self.truth
+        self.frontier = {atom for atom in self.frontier if not truth[atom]}
+        # a polarity seen in any model is satisfiable, so only the other one still needs a query
+        seen = set()
+
+        def record_model():
+            model = solver.model
+            for atom in self.frontier:
+                seen.add(atom << 1 if model[atom << 1] == 1 else atom << 1 | 1)
+
+        record_model()
+        entailed = []
+        for atom in sorted(self.frontier):
+            for literal in (atom << 1, atom << 1 | 1):
+                if literal in seen:
+                    continue
+                self.sat_calls += 1
+                if solver.solve([literal]):
+                    record_model()
+                else:
+                    entailed.append(literal ^ 1)
+                    solver.add_clause([literal ^ 1])
+                    break
+
+        added = False
+        for literal in entailed:
+            if self.add_literal(literal, ()):
+                added = True
+        return added
@@ -0,0 +1,263 @@
+"""
+Small incremental CDCL SAT solver used by the SAT knowledge base backend
+
+Literals use the same encoding as KnowledgeBase: literal = var * 2 + negated,
+so the negation of a literal is literal ^ 1.
+"""
+
+TRUE = 1
+FALSE = -1
+UNASSIGNED = 0
+
+
+class SATSolver:
+    """CDCL solver with two watched literals, 1UIP clause learning and solving under assumptions"""
+
+    def __init__(self, num_vars=0):
+        self.num_vars = 0
+        self.values = []       # values[literal] -> TRUE / FALSE / UNASSIGNED
+        self.level = []        # decision level of each assigned var
+        self.reason = []       # clause that implied each var, None for decisions
+        self.watches = []      # watches[literal] -> clauses watching that literal
+        self.order = []        # vars in the order they first appeared in a clause
+        self.order_pos = []
+        self.clauses = []
+        self.learnts = []
+        self.trail = []
+        self.trail_lim = []
+        self.qhead = 0
+        self.next_decision = 0
+        self.ok = True
+        self.model = None
+        self.conflicts = 0
+        self.decisions = 0
+        self.propagations = 0
+        self.new_vars(num_vars)
+
+    def new_vars(self, count):
+        """Allocate count new variables and return the first one"""
+        first = self.num_vars
+        self.num_vars += count
+        self.values.extend([UNASSIGNED] * (2 * count))
+        self.level.extend([0] * count)
+        self.reason.extend([None] * count)
+        self.watches.extend([] for _ in range(2 * count))
+        self.order_pos.extend([-1] * count)
+        return first
+
+    def value(self, literal):
+        return self.values[literal]
+
+    def decision_level(self):
+        return len(self.trail_lim)
+
+    def add_clause(self, literals):
+        """Add a clause at decision level 0, returns False once the formula is known to be UNSAT"""
+        if not self.ok:
+            return False
+        self._cancel_until(0)
+
+        literals = set(literals)
+        for literal in literals:
+            self._track_var(literal >> 1)
+        clause = []
+        for literal in literals:
+            if literal ^ 1 in literals:
+                return True  # tautology
+            value = self.values[literal]
+            if value == TRUE:
+                return True  # already satisfied at level 0
+            if value == UNASSIGNED:
+                clause.append(literal)
+
+        if not clause:
+            self.ok = False
+            return False
+        if len(clause) == 1:
+            self._enqueue(clause[0], None)
+            if self._propagate() is not None:
+                self.ok = False
+            return self.ok
+
+        self.clauses.append(clause)
+        self._attach(clause)
+        return True
+
+    def solve(self, assumptions=()):
+        """Return True if the clauses are satisfiable with every assumption literal true"""
+        self.model = None
+        if not self.ok:
+            return False
+        self._cancel_until(0)
+        if self._propagate() is not None:
+            self.ok = False
+            return False
+
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                if self.decision_level() == 0:
+                    self.ok = False
+                    return False
+                learnt, backtrack_level = self._analyze(conflict)
+                self._cancel_until(backtrack_level)
+                if len(learnt) == 1:
+                    self._enqueue(learnt[0], None)
+                else:
+                    self.learnts.append(learnt)
+                    self._attach(learnt)
+                    self._enqueue(learnt[0], learnt)
+                continue
+
+            level = self.decision_level()
+            if level < len(assumptions):
+                literal = assumptions[level]
+                value = self.values[literal]
+                self.trail_lim.append(len(self.trail))
+                if value == FALSE:
+                    self._cancel_until(0)
+                    return False
+                if value == UNASSIGNED:
+                    self._enqueue(literal, None)
+                continue
+
+            var = self._pick_branch_var()
+            if var is None:
+                self.model = list(self.values)
+                self._cancel_until(0)
+                return True
+            self.decisions += 1
+            self.trail_lim.append(len(self.trail))
+            # most cells hold neither pit nor wumpus, so try the negative phase first
+            self._enqueue(var << 1 | 1, None)
+
+    def model_value(self, literal):
+        """Truth value of literal in the last model found by solve()"""
+        if self.model is None:
+            return None
+        return self.model[literal] == TRUE
+
+    def _track_var(self, var):
+        if self.order_pos[var] < 0:
+            self.order_pos[var] = len(self.order)
+            self.order.append(var)
+
+    def _attach(self, clause):
+        self.watches[clause[0]].append(clause)
+        self.watches[clause[1]].append(clause)
+
+    def _enqueue(self, literal, reason):
+        var = literal >> 1
+        self.values[literal] = TRUE
+        self.values[literal ^ 1] = FALSE
+        self.level[var] = len(self.trail_lim)
+        self.reason[var] = reason
+        self.trail.append(literal)
+
+    def _propagate(self):
+        values = self.values
+        watches = self.watches
+        trail = self.trail
+        while self.qhead < len(trail):
+            false_literal = trail[self.qhead] ^ 1
+            self.qhead += 1
+            self.propagations += 1
+            watchers = watches[false_literal]
+            i = j = 0
+            end = len(watchers)
+            while i < end:
+                clause = watchers[i]
+                i += 1
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], false_literal
+                first = clause[0]
+                if values[first] == TRUE:
+                    watchers[j] = clause
+                    j += 1
+                    continue
+
+                for k in range(2, len(clause)):
+                    if values[clause[k]] != FALSE:
+                        clause[1], clause[k] = clause[k], false_literal
+                        watches[clause[1]].append(clause)
+                        break
+                else:
+                    watchers[j] = clause
+                    j += 1
+                    if values[first] == FALSE:
+                        while i < end:
+                            watchers[j] = watchers[i]
+                            j += 1
+                            i += 1
+                        del watchers[j:]
+                        self.qhead = len(trail)
+                        return clause
+                    self._enqueue(first, clause)
+            del watchers[j:]
+        return None
+
+    def _analyze(self, conflict):
+        """First-UIP conflict analysis, returns (learnt clause, backtrack level)"""
+        seen = set()
+        learnt = [None]
+        counter = 0
+        literal = None
+        clause = conflict
+        index = len(self.trail) - 1
+        current_level = self.decision_level()
+
+        while True:
+            for q in (clause if literal is None else clause[1:]):
+                var = q >> 1
+                if var not in seen and self.level[var] > 0:
+                    seen.add(var)
+                    if self.level[var] == current_level:
+                        counter += 1
+                    else:
+                        learnt.append(q)
+            while (self.trail[index] >> 1) not in seen:
+                index -= 1
+            literal = self.trail[index]
+            index -= 1
+            clause = self.reason[literal >> 1]
+            seen.discard(literal >> 1)
+            counter -= 1
+            if counter == 0:
+                break
+
+        learnt[0] = literal ^ 1
+        if len(learnt) == 1:
+            return learnt, 0
+        # watch the literal from the highest remaining level second, so it is the first to become unassigned
+        best = max(range(1, len(learnt)), key=lambda k: self.level[learnt[k] >> 1])
+        learnt[1], learnt[best] = learnt[best], learnt[1]
+        return learnt, self.level[learnt[1] >> 1]
+
+    def _cancel_until(self, level):
+        if self.decision_level() <= level:
+            return
+        values = self.values
+        order_pos = self.order_pos
+        start = self.trail_lim[level]
+        for literal in self.trail[start:]:
+            values[literal] = UNASSIGNED
+            values[literal ^ 1] = UNASSIGNED
+            var = literal >> 1
+            self.reason[var] = None
+            position = order_pos[var]
+            if 0 <= position < self.next_decision:
+                self.next_decision = position
+        del self.trail[start:]
+        del self.trail_lim[level:]
+        self.qhead = len(self.trail)
+
+    def _pick_branch_var(self):
+        values = self.values
+        order = self.order
+        while self.next_decision < len(order):
+            var = order[self.next_decision]
+            if values[var << 1] == UNASSIGNED:
+                return var
+            self.next_decision += 1
+        return None
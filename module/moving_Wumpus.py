@@ -2,6 +2,8 @@
 import random
 from copy import deepcopy
 
+from env_simulator.events import log
+
 def move_wumpus(game_map, current_position, pit_positions, other_wumpus_positions):
     """
     Move Wumpus to a valid cell - Wumpuses have limited local knowledge
@@ -70,7 +72,7 @@ def update_wumpus_position(agent, environment, wumpus_positions, pit_positions,
         
         # Double-check for collision with already moved Wumpuses
         while new_pos in other_wumpus and new_pos != w_pos:
-            print(f"🚨 Collision detected at {new_pos}, trying alternative move...")
+            log.debug("wumpus", "🚨 Collision detected at {new_pos}, trying alternative move...", new_pos=new_pos)
             # Try all other valid positions
             directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
             alternative_found = False
@@ -83,72 +85,20 @@ def update_wumpus_position(agent, environment, wumpus_positions, pit_positions,
                     break
             
             if not alternative_found:
-                print(f"⚠️ No collision-free move found for Wumpus {idx}, staying at {w_pos}")
+                log.debug("wumpus", "⚠️ No collision-free move found for Wumpus {idx}, staying at {w_pos}", idx=idx, w_pos=w_pos)
                 new_pos = w_pos
                 break
         
         if new_pos != w_pos:
-            print(f"Wumpus moved from {w_pos} to {new_pos}")
-            
-            # Update environment through proper interface
-            # Remove Wumpus from old position
-            if 'W' in environment.game_map[w_pos[0]][w_pos[1]]:
-                environment.game_map[w_pos[0]][w_pos[1]].remove('W')
-            
-            # Add Wumpus to new position
-            if 'W' not in environment.game_map[new_pos[0]][new_pos[1]]:
-                environment.game_map[new_pos[0]][new_pos[1]].append('W')
+            log.debug("wumpus", "Wumpus moved from {w_pos} to {new_pos}", w_pos=w_pos, new_pos=new_pos)
             
-            # Update stench patterns through environment
-            update_stench_patterns(environment, w_pos, new_pos)
+            # Update environment through proper interface: moves the Wumpus and
+            # its stench, keeping stench that another Wumpus still causes
+            environment.relocate_wumpus(w_pos, new_pos)
         
         # Update the position in our tracking list
         new_positions[idx] = new_pos
 
-    print("Wumpus positions updated:", new_positions)
+    log.debug("wumpus", "Wumpus positions updated: {new_positions}", new_positions=new_positions)
     return new_positions
 
-
-def update_stench_patterns(environment, old_pos, new_pos):
-    """Update stench patterns when Wumpus moves"""
-    N = len(environment.game_map)
-    
-    # Remove stench around old position (if no other Wumpus there)
-    old_adjacent = get_adjacent_positions(old_pos, N)
-    for adj_pos in old_adjacent:
-        i, j = adj_pos
-        if 'S' not in environment.game_map[i][j]:
-            continue  # No stench to remove
-            
-        # Check if any other Wumpus can cause stench here
-        has_other_wumpus_nearby = False
-        other_adjacent = get_adjacent_positions(adj_pos, N)
-        for other_adj in other_adjacent:
-            if other_adj != old_pos and 'W' in environment.game_map[other_adj[0]][other_adj[1]]:
-                has_other_wumpus_nearby = True
-                break
-        
-        # Remove stench only if no other Wumpus causes it
-        if not has_other_wumpus_nearby:
-            environment.game_map[i][j].remove('S')
-            print(f"Removed stench at {adj_pos} (no more Wumpus nearby)")
-    
-    # Add stench around new position
-    new_adjacent = get_adjacent_positions(new_pos, N)
-    for adj_pos in new_adjacent:
-        i, j = adj_pos
-        if 'S' not in environment.game_map[i][j]:
-            environment.game_map[i][j].append('S')
-            print(f"Added stench at {adj_pos} (Wumpus moved nearby)")
-        # If stench already exists, no need to add again
-
-
-def get_adjacent_positions(position, N):
-    """Get valid adjacent positions"""
-    i, j = position
-    adjacent = []
-    for di, dj in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-        ni, nj = i + di, j + dj
-        if 0 <= ni < N and 0 <= nj < N:
-            adjacent.append((ni, nj))
-    return adjacent
@@ -0,0 +1,301 @@
+"""
+Headless batch runner: plays agents on many maps without the Tk UI
+
+Maps come either from JSON files in the testcases/map format or from
+WumpusWorldGenerator. Each episode builds a fresh environment and agent, calls step()
+in a tight loop until the agent stops or the step cap is hit, and reports the score,
+the number of steps and the wall time. Agent events are not recorded at all unless
+--verbose (echo them) or --log-jsonl (write them to a file) is given. With --workers
+the maps are played in a process pool.
+
+Run from the repository root:
+    python run_episodes.py --maps "testcases/map/*.json" --agent KnowledgeBaseSafeAgent
+    python run_episodes.py --generate 100 --size 8 --wumpus 2 --agent IntelligentAgent RandomAgent --format csv
+    python run_episodes.py --generate 1000 --workers 8
+    python run_episodes.py --generate 200 --workers 8 --scaling
+    python run_episodes.py --generate 200 --execution-mode macro
+    python run_episodes.py --generate 200 --environment array
+"""
+import argparse
+import copy
+import csv
+import glob
+import json
+import multiprocessing
+import os
+import queue
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from agent.agent import Agent, KB_BACKENDS
+from agent.intelligent_agent import IntelligentAgent
+from agent.kb_safe_agent import KnowledgeBaseSafeAgent, EXECUTION_MODES
+from agent.kb_safe_moving_wumpus_agent import KnowledgeBaseSafeMovingWumpusAgent
+from agent.random_agent import RandomAgent
+from env_simulator.array_environment import ArrayWumpusEnvironment
+from env_simulator.environment import WumpusEnvironment
+from env_simulator.events import log, DEBUG, INFO, SILENT
+from env_simulator.generateMap import WumpusWorldGenerator
+from env_simulator.risk_calculator import RISK_MODES
+
+AGENT_TYPES = {
+    "RandomAgent": RandomAgent,
+    "KnowledgeBaseSafeAgent": KnowledgeBaseSafeAgent,
+    "KnowledgeBaseSafeMovingWumpusAgent": KnowledgeBaseSafeMovingWumpusAgent,
+    "IntelligentAgent": IntelligentAgent,
+}
+
+ENVIRONMENT_TYPES = {
+    "lists": WumpusEnvironment,
+    "array": ArrayWumpusEnvironment,
+}
+
+RESULT_FIELDS = ["map", "agent", "score", "steps", "alive", "gold", "home", "seconds"]
+
+
+def map_specs(patterns=None, count=0, size=8, wumpus=2, pits_probability=0.2, seed=0):
+    """Small picklable descriptions of the maps to play, turned into maps by build_episode
+
+    Either every JSON map file matching patterns (paths or globs), or count maps from
+    WumpusWorldGenerator where map k is generated with NumPy seed seed + k.
+    """
+    if patterns:
+        specs = []
+        for pattern in patterns:
+            matches = sorted(glob.glob(pattern))
+            if not matches:
+                raise FileNotFoundError(f"no map file matches {pattern!r}")
+            specs.extend({'path': path} for path in matches)
+        return specs
+    return [{'size': size, 'wumpus': wumpus, 'pits_probability': pits_probability, 'seed': seed + k}
+            for k in range(count)]
+
+
+def build_episode(spec):
+    """Map, Wumpus and pit positions for one map spec"""
+    if 'path' in spec:
+        with open(spec['path'], 'r') as f:
+            data = json.load(f)
+        return {
+            'name': os.path.basename(spec['path']),
+            'map': data['map'],
+            'wumpus_positions': [tuple(pos) for pos in data['wumpus_positions']],
+            'pit_positions': [tuple(pos) for pos in data['pit_positions']],
+        }
+    np.random.seed(spec['seed'])
+    game_map, wumpus_positions, pit_positions = WumpusWorldGenerator(
+        N=spec['size'], wumpus=spec['wumpus'], pits_probability=spec['pits_probability']).generate_map()
+    return {
+        'name': f"gen{spec['size']}x{spec['size']}_{spec['seed']}",
+        'map': game_map,
+        'wumpus_positions': wumpus_positions,
+        'pit_positions': pit_positions,
+    }
+
+
+def configure_events(verbose=False, log_path=None):
+    """Batch runs are silent: agent events are only recorded for --verbose (echoed) or --log-jsonl"""
+    if verbose:
+        log.configure(level=DEBUG, echo=True, path=log_path)
+    elif log_path is not None:
+        log.configure(level=INFO, capacity=0, path=log_path)
+    else:
+        log.configure(level=SILENT, capacity=0)
+
+
+def run_episode(episode, agent_name, max_steps=500, seed=0, kb_backend="rules", risk_mode="heuristic",
+                execution_mode="step", environment_type="lists"):
+    """Play one agent on one map and return its RESULT_FIELDS as a dict
+
+    execution_mode only applies to agents that have one (the KB-safe agents).
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    # agents and moving Wumpuses edit the map in place, so every episode gets its own copy
+    # (the array environment encodes the map into a new grid anyway)
+    game_map = episode['map'] if environment_type == "array" else copy.deepcopy(episode['map'])
+    environment = ENVIRONMENT_TYPES[environment_type](game_map, list(episode['wumpus_positions']),
+                                                      list(episode['pit_positions']))
+    start = time.perf_counter()
+    agent = Agent(environment, N=len(episode['map']), kb_backend=kb_backend, risk_mode=risk_mode)
+    step_agent = AGENT_TYPES[agent_name](agent)
+    if hasattr(step_agent, 'execution_mode'):
+        step_agent.execution_mode = execution_mode
+    steps = 0
+    while steps < max_steps:
+        can_continue, _ = step_agent.step()
+        steps += 1
+        if not can_continue:
+            break
+    seconds = time.perf_counter() - start
+
+    return {
+        'map': episode['name'],
+        'agent': agent_name,
+        'score': agent.score,
+        'steps': steps,
+        'alive': agent.alive,
+        'gold': agent.gold_obtain,
+        'home': agent.alive and agent.position == (0, 0),
+        'seconds': seconds,
+    }
+
+
+def run_serial(specs, agent_names, options, verbose=False, log_path=None):
+    """Yield results one episode at a time in this process"""
+    configure_events(verbose, log_path)
+    for spec in specs:
+        episode = build_episode(spec)
+        for agent_name in agent_names:
+            yield run_episode(episode, agent_name, **options)
+
+
+def _init_worker(seed):
+    # run_episode reseeds before every episode, this only covers anything done before the first one
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+def _run_shard(shard, agent_names, options, results, verbose, log_path):
+    """Worker: build every map in shard and put one result per (map, agent) on the results queue"""
+    if log_path is not None:
+        # one JSONL file per worker process, so lines from different workers never interleave
+        root, ext = os.path.splitext(log_path)
+        log_path = f"{root}.{os.getpid()}{ext}"
+    for result in run_serial(shard, agent_names, options, verbose, log_path):
+        results.put(result)
+    log.close()
+    return len(shard) * len(agent_names)
+
+
+def run_parallel(specs, agent_names, options, workers, seed=0, verbose=False, log_path=None):
+    """Yield results as worker processes finish them, in completion order
+
+    The map specs are cut into about four contiguous shards per worker so slow maps
+    do not leave workers idle. Workers build the maps and agents themselves and stream
+    each result back through a queue, so neither side holds the whole batch. Every
+    episode is seeded the same way as in run_serial, so results do not depend on the
+    number of workers.
+    """
+    shard_size = max(1, -(-len(specs) // (workers * 4)))
+    shards = [specs[k:k + shard_size] for k in range(0, len(specs), shard_size)]
+    expected = len(specs) * len(agent_names)
+    with multiprocessing.Manager() as manager:
+        results = manager.Queue()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(seed,)) as pool:
+            futures = [pool.submit(_run_shard, shard, agent_names, options, results, verbose, log_path) for shard in shards]
+            received = 0
+            while received < expected:
+                try:
+                    result = results.get(timeout=0.5)
+                except queue.Empty:
+                    for future in futures:
+                        if future.done() and future.exception() is not None:
+                            raise future.exception()
+                    continue
+                received += 1
+                yield result
+
+
+def measure_scaling(specs, agent_names, options, max_workers, seed=0):
+    """Episodes per second with 1..max_workers processes, and efficiency relative to one worker"""
+    rows = []
+    for workers in range(1, max_workers + 1):
+        start = time.perf_counter()
+        episodes = sum(1 for _ in run_parallel(specs, agent_names, options, workers, seed))
+        throughput = episodes / (time.perf_counter() - start)
+        rows.append((workers, throughput, throughput / (workers * rows[0][1]) if rows else 1.0))
+    return rows
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run Wumpus World agents headless on a batch of maps")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--maps", nargs="+", metavar="PATTERN",
+                        help="JSON map files or globs, e.g. 'testcases/map/*.json'")
+    source.add_argument("--generate", type=int, metavar="COUNT",
+                        help="number of maps to generate with WumpusWorldGenerator")
+    parser.add_argument("--size", type=int, default=8, help="generated map size N (default 8)")
+    parser.add_argument("--wumpus", type=int, default=2, help="Wumpuses per generated map (default 2)")
+    parser.add_argument("--pits", type=float, default=0.2, help="generator pit probability (default 0.2)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed for map generation and for the agents' random choices (default 0)")
+    parser.add_argument("--agent", nargs="+", choices=sorted(AGENT_TYPES), default=["KnowledgeBaseSafeAgent"],
+                        help="agent types to evaluate (default KnowledgeBaseSafeAgent)")
+    parser.add_argument("--steps", type=int, default=500, help="step cap per episode (default 500)")
+    parser.add_argument("--kb-backend", choices=sorted(KB_BACKENDS), default="rules")
+    parser.add_argument("--risk-mode", choices=RISK_MODES, default="heuristic")
+    parser.add_argument("--environment", choices=sorted(ENVIRONMENT_TYPES), default="lists",
+                        help="world representation: nested letter lists or a NumPy bit-flag grid (default lists)")
+    parser.add_argument("--execution-mode", choices=EXECUTION_MODES, default="step",
+                        help="KB-safe agents: 'macro' walks a committed path home without replanning (default step)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes, more than 1 runs the maps in a process pool (default 1)")
+    parser.add_argument("--scaling", action="store_true",
+                        help="only report episodes/s and scaling efficiency for 1..--workers processes")
+    parser.add_argument("--format", choices=["table", "csv"], default="table")
+    parser.add_argument("--verbose", action="store_true", help="echo every agent event (DEBUG and up)")
+    parser.add_argument("--log-jsonl", metavar="PATH",
+                        help="append agent events (INFO and up) to this JSONL file, one file per worker process")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    specs = map_specs(args.maps, args.generate or 0, args.size, args.wumpus, args.pits, args.seed)
+    options = {'max_steps': args.steps, 'seed': args.seed, 'kb_backend': args.kb_backend,
+               'risk_mode': args.risk_mode, 'execution_mode': args.execution_mode,
+               'environment_type': args.environment}
+
+    if args.scaling:
+        print(f"{'workers':>7} {'episodes/s':>10} {'efficiency':>10}")
+        for workers, throughput, efficiency in measure_scaling(specs, args.agent, options, args.workers, args.seed):
+            print(f"{workers:>7} {throughput:>10.2f} {efficiency:>10.2f}")
+        return
+
+    if args.format == "csv":
+        writer = csv.DictWriter(sys.stdout, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+    else:
+        header = f"{'map':<24} {'agent':<34} {'score':>6} {'steps':>5} {'alive':>5} {'gold':>5} {'home':>5} {'seconds':>8}"
+        print(header)
+        print("-" * len(header))
+
+    if args.workers > 1:
+        results = run_parallel(specs, args.agent, options, args.workers, args.seed, args.verbose, args.log_jsonl)
+    else:
+        results = run_serial(specs, args.agent, options, args.verbose, args.log_jsonl)
+
+    # running totals per agent: episodes, score, survived, gold, seconds
+    totals = {agent_name: [0, 0, 0, 0, 0.0] for agent_name in args.agent}
+    start = time.perf_counter()
+    for result in results:
+        total = totals[result['agent']]
+        total[0] += 1
+        total[1] += result['score']
+        total[2] += result['alive']
+        total[3] += result['gold']
+        total[4] += result['seconds']
+        if args.format == "csv":
+            writer.writerow(result)
+        else:
+            print(f"{result['map']:<24} {result['agent']:<34} {result['score']:>6} {result['steps']:>5} "
+                  f"{str(result['alive']):>5} {str(result['gold']):>5} {str(result['home']):>5} {result['seconds']:>8.3f}")
+        sys.stdout.flush()
+    elapsed = time.perf_counter() - start
+
+    if args.format == "table":
+        print()
+        for agent_name, (episodes, score, survived, gold, seconds) in totals.items():
+            print(f"{agent_name}: {episodes} episodes, mean score {score / max(episodes, 1):.1f}, "
+                  f"survived {survived}, gold {gold}, total {seconds:.2f}s")
+        episodes = sum(total[0] for total in totals.values())
+        print(f"{episodes} episodes in {elapsed:.2f}s on {args.workers} worker(s): {episodes / elapsed:.1f} episodes/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,34 @@
 import heapq
-from agent.agent import Agent2
+from agent.agent import Agent2, DIRECTION, MOVE
 
 def agent_state(agent: Agent2):
     return (agent.position, agent.direction, agent.gold_obtain, agent.arrow_hit)
 
-def dijkstra(environment_map, agent: Agent2):
+def move_cost(risk):
+    """Cost of stepping into a cell with the given death risk"""
+    if risk == 0.0:
+        # Known safe cell - low cost
+        return 1
+    elif risk >= 0.9:
+        # Very dangerous - very high cost
+        return 1000
+    elif risk >= 0.5:
+        # Moderately dangerous - high cost
+        return 50
+    # Low risk - moderate cost for exploration
+    return int(1 + risk * 20)  # 1-21 based on risk
+
+def dijkstra(environment_map, agent: Agent2, packed=True):
     """
     Risk-based Dijkstra pathfinding that uses risk calculations instead of direct map access
+
+    Returns the list of Agent2 nodes from agent to (0, 0) holding the gold, or None.
+    With packed=True the search runs over integer states (see dijkstra_packed); otherwise
+    every expansion clones Agent2 nodes through turn_left/turn_right/move_forward/grab_gold.
     """
+    if packed:
+        return dijkstra_packed(environment_map, agent)
+
     q = [(0, agent)]
     total_cost = {agent_state(agent): 0}
     parent = {agent_state(agent): None}
@@ -45,20 +66,7 @@ def dijkstra(environment_map, agent: Agent2):
             if 0 <= ni < node.N and 0 <= nj < node.N:
                 # Use risk calculator instead of direct map access
                 risk = node.risk_calculator.calculate_total_risk((ni, nj))
-                
-                if risk == 0.0:
-                    # Known safe cell - low cost
-                    neighbors.append((1, new_node))
-                elif risk >= 0.9:
-                    # Very dangerous - very high cost
-                    neighbors.append((1000, new_node))
-                elif risk >= 0.5:
-                    # Moderately dangerous - high cost
-                    neighbors.append((50, new_node))
-                else:
-                    # Low risk - moderate cost for exploration
-                    move_cost = int(1 + risk * 20)  # 1-21 based on risk
-                    neighbors.append((move_cost, new_node))
+                neighbors.append((move_cost(risk), new_node))
 
         # Add gold grabbing action
         grab_node = node.grab_gold()
@@ -77,3 +85,85 @@ def dijkstra(environment_map, agent: Agent2):
                 heapq.heappush(q, (new_cost, neighbor))
 
     return None
+
+
+def dijkstra_packed(environment_map, agent: Agent2):
+    """
+    Same search as dijkstra over integer states: state = (cell * 4 + direction) * 2 + gold
+
+    Nothing the search can do changes the KB or the risk calculator, so the step cost of
+    every cell, the forward-move table and the gold cells are computed once up front and
+    an expansion only pushes ints. Agent2 nodes are built for the returned path only.
+    """
+    N = agent.N
+    start_cell = agent.position[0] * N + agent.position[1]
+    start = (start_cell * 4 + DIRECTION[agent.direction]) << 1 | bool(agent.gold_obtain)
+
+    if not agent.alive:
+        return [agent] if start_cell == 0 and agent.gold_obtain else None
+
+    costs = [move_cost(agent.risk_calculator.calculate_total_risk((i, j))) for i in range(N) for j in range(N)]
+    # forward[cell * 4 + direction] -> cell in front, or -1 at the border
+    forward = []
+    for i in range(N):
+        for j in range(N):
+            for d in range(4):
+                di, dj = MOVE[DIRECTION[d]]
+                ni, nj = i + di, j + dj
+                forward.append(ni * N + nj if 0 <= ni < N and 0 <= nj < N else -1)
+    gold_cells = {i * N + j for i in range(N) for j in range(N) if agent.kb.is_premise_true(f"G{(i, j)}")}
+
+    q = [(0, start)]
+    total_cost = {start: 0}
+    parent = {start: None}
+
+    while q:
+        cost, state = heapq.heappop(q)
+
+        # Goal check: reached (0,0) with gold
+        if state >> 3 == 0 and state & 1:
+            states = []
+            while state is not None:
+                states.append(state)
+                state = parent[state]
+            return _build_path(agent, states[::-1])
+
+        if total_cost[state] < cost:
+            continue
+
+        gold = state & 1
+        heading = state >> 1
+        cell, d = heading >> 2, heading & 3
+        base = cell << 2
+        neighbors = [
+            (1, (base | (d - 1) & 3) << 1 | gold),
+            (1, (base | (d + 1) & 3) << 1 | gold),
+        ]
+        ahead = forward[heading]
+        if ahead >= 0:
+            neighbors.append((costs[ahead], (ahead << 2 | d) << 1 | gold))
+        if not gold and cell in gold_cells:
+            neighbors.append((0, state | 1))  # Free action to grab gold
+
+        for neighbor_cost, neighbor in neighbors:
+            new_cost = cost + neighbor_cost
+            if neighbor not in total_cost or new_cost < total_cost[neighbor]:
+                total_cost[neighbor] = new_cost
+                parent[neighbor] = state
+                heapq.heappush(q, (new_cost, neighbor))
+
+    return None
+
+
+def _build_path(agent: Agent2, states):
+    """Agent2 nodes for a list of packed states, the first one being agent itself"""
+    N = agent.N
+    path = [agent]
+    for state in states[1:]:
+        cell, d = divmod(state >> 1, 4)
+        node = agent.clone()
+        node.position = divmod(cell, N)
+        node.direction = DIRECTION[d]
+        node.gold_obtain = bool(state & 1)
+        path.append(node)
+    return path
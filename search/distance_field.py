@@ -0,0 +1,120 @@
+"""
+Incrementally maintained distance field over KB-safe cells, used to walk back home
+"""
+import heapq
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from search.kb_pathfinding import get_neighbors
+
+# move costs in tenths so equal costs compare exactly: 1 per move plus 0.1 for
+# entering an unvisited cell, the same weights as kb_safe_dijkstra
+VISITED_COST = 10
+UNVISITED_COST = 11
+
+
+class DistanceField:
+    """Cost of the cheapest KB-safe path from every safe cell to a fixed source cell
+
+    The KB-safe set only grows and visited cells only get cheaper to enter, so both kinds
+    of update can only lower distances; they are applied by relaxing outwards from the
+    changed cells (decrease-only dynamic SSSP) and touch just the cells whose distance
+    improves. A cell leaving the safe set (a retracted fact) triggers a full rebuild.
+    next_step(), steps_to_source() and is_reachable() are dictionary lookups.
+    """
+
+    def __init__(self, source: Tuple[int, int], grid_size: int):
+        self.source = source
+        self.grid_size = grid_size
+        self.safe: Set[Tuple[int, int]] = set()
+        self.visited: Set[Tuple[int, int]] = set()
+        self.costs: Dict[Tuple[int, int], int] = {}  # reachable cell -> cost to source in tenths
+        self.next: Dict[Tuple[int, int], Optional[Tuple[int, int]]] = {}  # neighbour on a cheapest path
+        self.hops: Dict[Tuple[int, int], int] = {}  # moves along that path
+        self.rebuilds = 0
+        self.relaxations = 0
+
+    def sync(self, safe_positions: Set[Tuple[int, int]], visited_positions: Set[Tuple[int, int]]):
+        """Bring the field up to date with the current safe and visited sets"""
+        if not self.safe <= safe_positions or not self.visited <= visited_positions:
+            self.safe = set(safe_positions)
+            self.visited = set(visited_positions)
+            self._rebuild()
+            return
+        self.add_safe(safe_positions - self.safe)
+        self.mark_visited(visited_positions - self.visited)
+
+    def add_safe(self, positions: Iterable[Tuple[int, int]]):
+        """New KB-safe cells: relax into them from their already reachable neighbours"""
+        seeds = set()
+        for pos in positions:
+            if pos in self.safe:
+                continue
+            self.safe.add(pos)
+            if pos == self.source:
+                self.costs[pos], self.next[pos], self.hops[pos] = 0, None, 0
+                seeds.add(pos)
+            seeds.update(n for n in get_neighbors(pos, self.grid_size) if n in self.costs)
+        self._relax(seeds)
+
+    def mark_visited(self, positions: Iterable[Tuple[int, int]]):
+        """Visited cells are cheaper to enter, so paths through them may improve"""
+        seeds = []
+        for pos in positions:
+            if pos in self.visited:
+                continue
+            self.visited.add(pos)
+            if pos in self.costs:
+                seeds.append(pos)
+        self._relax(seeds)
+
+    def is_reachable(self, position: Tuple[int, int]) -> bool:
+        return position in self.costs
+
+    def distance(self, position: Tuple[int, int]) -> float:
+        """Path cost to the source in kb_safe_dijkstra units, inf if unreachable"""
+        cost = self.costs.get(position)
+        return float('inf') if cost is None else cost / 10
+
+    def steps_to_source(self, position: Tuple[int, int]) -> Optional[int]:
+        return self.hops.get(position)
+
+    def next_step(self, position: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """Neighbour to move to from position, None at the source or if it is unreachable"""
+        return self.next.get(position)
+
+    def path_from(self, position: Tuple[int, int], limit: Optional[int] = None) -> Optional[List[Tuple[int, int]]]:
+        """Cells from position to the source (the first limit of them), None if unreachable"""
+        if position not in self.costs:
+            return None
+        path = [position]
+        while path[-1] != self.source and (limit is None or len(path) < limit):
+            path.append(self.next[path[-1]])
+        return path
+
+    def _enter_cost(self, position):
+        return VISITED_COST if position in self.visited else UNVISITED_COST
+
+    def _rebuild(self):
+        self.rebuilds += 1
+        self.costs, self.next, self.hops = {}, {}, {}
+        if self.source in self.safe:
+            self.costs[self.source], self.next[self.source], self.hops[self.source] = 0, None, 0
+            self._relax([self.source])
+
+    def _relax(self, seeds):
+        costs = self.costs
+        heap = [(costs[pos], pos) for pos in seeds]
+        heapq.heapify(heap)
+        while heap:
+            cost, pos = heapq.heappop(heap)
+            if cost > costs[pos]:
+                continue
+            self.relaxations += 1
+            # stepping from a neighbour into pos costs pos's entry cost
+            through = cost + self._enter_cost(pos)
+            for neighbor in get_neighbors(pos, self.grid_size):
+                if neighbor in self.safe and through < costs.get(neighbor, through + 1):
+                    costs[neighbor] = through
+                    self.next[neighbor] = pos
+                    self.hops[neighbor] = self.hops[pos] + 1
+                    heapq.heappush(heap, (through, neighbor))
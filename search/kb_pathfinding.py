@@ -5,6 +5,8 @@ import heapq
 from typing import List, Tuple, Optional, Set
 import math
 
+from agent.agent import DIRECTION, MOVE, SCORE
+
 class PathNode:
     """Node for pathfinding with KB-safe information"""
     def __init__(self, position: Tuple[int, int], g_cost: float = 0, h_cost: float = 0, parent=None):
@@ -190,12 +192,101 @@ def kb_safe_dijkstra(start: Tuple[int, int],
     
     return None  # No path found
 
+def min_turns(position: Tuple[int, int], heading: int, goal: Tuple[int, int]) -> int:
+    """Fewest turns any path from position, facing heading (a DIRECTION index), needs to reach goal"""
+    di, dj = goal[0] - position[0], goal[1] - position[1]
+    needed = set()
+    if dj:
+        needed.add(DIRECTION["E" if dj > 0 else "W"])
+    if di:
+        needed.add(DIRECTION["S" if di > 0 else "N"])
+    if not needed:
+        return 0
+    if heading in needed:
+        return len(needed) - 1
+    if len(needed) == 1 and (heading + 2) % 4 in needed:
+        return 2  # facing away: turn around first
+    return len(needed)
+
+def kb_safe_oriented_astar(start: Tuple[int, int],
+                           heading: str,
+                           goal: Tuple[int, int],
+                           kb_safe_positions: Set[Tuple[int, int]],
+                           visited_positions: Set[Tuple[int, int]],
+                           grid_size: int) -> Optional[List[str]]:
+    """
+    A* over (cell, heading) that pays for turns the way Agent does
+    
+    Moving forward costs -SCORE["move"] (plus 0.1 for entering an unvisited cell, as in
+    kb_safe_dijkstra) and each quarter turn -SCORE["turn"], so the cheapest plan is the
+    one that loses the fewest points, not just the one with the fewest moves. The
+    heuristic, Manhattan distance times the move cost plus min_turns() times the turn
+    cost, never overestimates. Costs are kept in tenths so equal plans compare exactly.
+    
+    Args:
+        start: Starting position
+        heading: Direction the agent faces at start ("E", "S", "W" or "N")
+        goal: Target position, reached facing any direction
+        kb_safe_positions: Set of KB-confirmed safe positions
+        visited_positions: Set of already visited positions
+        grid_size: Size of the grid (N x N)
+    
+    Returns:
+        List of Agent method names ("turn_left", "turn_right", "move_forward") that take
+        the agent from start to goal, or None if no path exists
+    """
+    
+    if start not in kb_safe_positions or goal not in kb_safe_positions:
+        return None
+    
+    move_cost = -10 * SCORE["move"]
+    turn_cost = -10 * SCORE["turn"]
+    
+    def heuristic(position, facing):
+        return move_cost * manhattan_distance(position, goal) + turn_cost * min_turns(position, facing, goal)
+    
+    start_state = (start, DIRECTION[heading])
+    costs = {start_state: 0}
+    previous = {start_state: None}
+    pq = [(heuristic(*start_state), 0, start_state)]
+    
+    while pq:
+        _, cost, state = heapq.heappop(pq)
+        if cost > costs[state]:
+            continue
+        position, facing = state
+        
+        if position == goal:
+            actions = []
+            while previous[state] is not None:
+                state, action = previous[state]
+                actions.append(action)
+            return actions[::-1]
+        
+        successors = [((position, (facing - 1) % 4), turn_cost, "turn_left"),
+                      ((position, (facing + 1) % 4), turn_cost, "turn_right")]
+        di, dj = MOVE[DIRECTION[facing]]
+        ahead = (position[0] + di, position[1] + dj)
+        if ahead in kb_safe_positions and 0 <= ahead[0] < grid_size and 0 <= ahead[1] < grid_size:
+            step = move_cost + (0 if ahead in visited_positions else 1)
+            successors.append(((ahead, facing), step, "move_forward"))
+        
+        for successor, step, action in successors:
+            new_cost = cost + step
+            if new_cost < costs.get(successor, new_cost + 1):
+                costs[successor] = new_cost
+                previous[successor] = (state, action)
+                heapq.heappush(pq, (new_cost + heuristic(*successor), new_cost, successor))
+    
+    return None  # No path found
+
 def find_best_kb_safe_path(start: Tuple[int, int], 
                            targets: List[Tuple[int, int]], 
                            kb_safe_positions: Set[Tuple[int, int]], 
                            visited_positions: Set[Tuple[int, int]], 
                            grid_size: int,
-                           use_astar: bool = True) -> Optional[Tuple[Tuple[int, int], List[Tuple[int, int]]]]:
+                           use_astar: bool = True,
+                           single_pass: bool = True) -> Optional[Tuple[Tuple[int, int], List[Tuple[int, int]]]]:
     """
     Find the best path to any of the target positions
     
@@ -205,12 +296,16 @@ def find_best_kb_safe_path(start: Tuple[int, int],
         kb_safe_positions: Set of KB-confirmed safe positions
         visited_positions: Set of already visited positions
         grid_size: Size of the grid
-        use_astar: Whether to use A* (True) or Dijkstra (False)
+        use_astar: Whether to use A* (True) or Dijkstra (False) for the per-target searches
+        single_pass: Score every target from one multi-target Dijkstra instead of one search per target
     
     Returns:
         Tuple of (best_target, path_to_target) or None if no path exists
     """
     
+    if single_pass:
+        return kb_safe_multi_target_search(start, targets, kb_safe_positions, visited_positions, grid_size)
+
     best_path = None
     best_target = None
     shortest_cost = float('inf')
@@ -236,3 +331,221 @@ def find_best_kb_safe_path(start: Tuple[int, int],
                 best_target = target
     
     return (best_target, best_path) if best_path else None
+
+def kb_safe_multi_target_search(start: Tuple[int, int],
+                                targets: List[Tuple[int, int]],
+                                kb_safe_positions: Set[Tuple[int, int]],
+                                visited_positions: Set[Tuple[int, int]],
+                                grid_size: int,
+                                first_only: bool = False) -> Optional[Tuple[Tuple[int, int], List[Tuple[int, int]]]]:
+    """
+    One Dijkstra from start that serves every target at once
+    
+    Uses the same move costs as kb_safe_dijkstra (1, plus 0.1 for entering an unvisited
+    cell) and the same score as find_best_kb_safe_path (path length, minus 0.5 for an
+    unvisited target, ties going to the earlier target in the list). A path with cost c
+    has at least c / 1.1 moves, so the search stops once no unsettled target can still
+    score better than the best one found.
+    
+    Args:
+        start: Starting position
+        targets: List of potential target positions
+        kb_safe_positions: Set of KB-confirmed safe positions
+        visited_positions: Set of already visited positions
+        grid_size: Size of the grid
+        first_only: Return the first target the search settles (cheapest to reach) instead of the best-scored one
+    
+    Returns:
+        Tuple of (best_target, path_to_target) or None if no path exists
+    """
+    
+    if start not in kb_safe_positions:
+        return None
+    
+    # target -> index in targets, only safe targets can be reached
+    order = {}
+    for index, target in enumerate(targets):
+        if target in kb_safe_positions and target not in order:
+            order[target] = index
+    if not order:
+        return None
+    
+    pq = [(0, start)]
+    distances = {start: 0}
+    previous = {start: None}
+    steps = {start: 0}
+    settled = set()
+    best = None  # (score, index, target)
+    remaining = len(order)
+    
+    while pq:
+        current_cost, current_pos = heapq.heappop(pq)
+        
+        if current_pos in settled:
+            continue
+        if best is not None and current_cost / 1.1 + 0.5 > best[0] + 1e-9:
+            break
+        
+        settled.add(current_pos)
+        
+        if current_pos in order:
+            score = steps[current_pos] + 1
+            if current_pos not in visited_positions:
+                score -= 0.5
+            candidate = (score, order[current_pos], current_pos)
+            if best is None or candidate < best:
+                best = candidate
+            remaining -= 1
+            if first_only or remaining == 0:
+                break
+        
+        for neighbor_pos in get_neighbors(current_pos, grid_size):
+            if neighbor_pos in settled or neighbor_pos not in kb_safe_positions:
+                continue
+            
+            new_cost = current_cost + (1 if neighbor_pos in visited_positions else 1.1)
+            
+            if neighbor_pos not in distances or new_cost < distances[neighbor_pos]:
+                distances[neighbor_pos] = new_cost
+                previous[neighbor_pos] = current_pos
+                steps[neighbor_pos] = steps[current_pos] + 1
+                heapq.heappush(pq, (new_cost, neighbor_pos))
+    
+    if best is None:
+        return None
+    
+    target = best[2]
+    path = []
+    pos = target
+    while pos is not None:
+        path.append(pos)
+        pos = previous[pos]
+    return target, path[::-1]
+
+class KBSafeDStarLite:
+    """
+    D* Lite planner towards one fixed goal that keeps its search tree between calls
+    
+    Uses the same move costs as kb_safe_dijkstra (1, plus 0.1 for entering an unvisited
+    cell), kept in tenths so equal costs compare exactly. g / rhs hold the cost from
+    each cell to the goal; when cells enter or leave the KB-safe set, or become visited,
+    only those cells and their neighbours are re-examined and the search repairs just
+    the part of the tree that changed. The agent moving only raises km, as in
+    Koenig & Likhachev's D* Lite, so the start can change freely between calls.
+    """
+    
+    def __init__(self, goal: Tuple[int, int], grid_size: int):
+        self.goal = goal
+        self.grid_size = grid_size
+        self.safe: Set[Tuple[int, int]] = set()
+        self.visited: Set[Tuple[int, int]] = set()
+        self.g = {}
+        self.rhs = {goal: 0}
+        self.queue = []
+        self.queued = {}  # cell -> key of its live queue entry, older entries are skipped
+        self.km = 0
+        self.start = None
+        self.expansions = 0
+        self._push(goal)
+    
+    def plan(self, start: Tuple[int, int],
+             kb_safe_positions: Set[Tuple[int, int]],
+             visited_positions: Set[Tuple[int, int]]) -> Optional[List[Tuple[int, int]]]:
+        """
+        Cheapest path from start to the goal through KB-safe cells
+        
+        Args:
+            start: Starting position
+            kb_safe_positions: Set of KB-confirmed safe positions
+            visited_positions: Set of already visited positions
+        
+        Returns:
+            List of positions from start to goal (a path as cheap as kb_safe_dijkstra's),
+            or None if no path exists
+        """
+        if self.start is not None and start != self.start:
+            self.km += 10 * manhattan_distance(self.start, start)
+        self.start = start
+        
+        changed = (kb_safe_positions ^ self.safe) | (visited_positions ^ self.visited)
+        if changed:
+            self.safe = set(kb_safe_positions)
+            self.visited = set(visited_positions)
+            for pos in changed:
+                self._update_vertex(pos)
+                for neighbor in get_neighbors(pos, self.grid_size):
+                    self._update_vertex(neighbor)
+        
+        if start not in self.safe or self.goal not in self.safe:
+            return None
+        self._compute_shortest_path()
+        if self.g.get(start, math.inf) == math.inf:
+            return None
+        
+        # every cell on a cheapest path has a key below the start's, so its g is exact
+        path = [start]
+        while path[-1] != self.goal:
+            current = path[-1]
+            path.append(min(get_neighbors(current, self.grid_size),
+                            key=lambda pos: self._cost(current, pos) + self.g.get(pos, math.inf)))
+        return path
+    
+    def _cost(self, pos, neighbor):
+        if pos not in self.safe or neighbor not in self.safe:
+            return math.inf
+        return 10 if neighbor in self.visited else 11
+    
+    def _key(self, pos):
+        best = min(self.g.get(pos, math.inf), self.rhs.get(pos, math.inf))
+        return (best + 10 * manhattan_distance(self.start or pos, pos) + self.km, best)
+    
+    def _push(self, pos):
+        key = self._key(pos)
+        self.queued[pos] = key
+        heapq.heappush(self.queue, (key, pos))
+    
+    def _update_vertex(self, pos):
+        if pos != self.goal:
+            self.rhs[pos] = min([self._cost(pos, neighbor) + self.g.get(neighbor, math.inf)
+                                 for neighbor in get_neighbors(pos, self.grid_size)])
+        if self.g.get(pos, math.inf) != self.rhs.get(pos, math.inf):
+            self._push(pos)
+        else:
+            self.queued.pop(pos, None)
+    
+    def _top(self):
+        """Live queue entry with the smallest key, dropping stale ones, or None"""
+        while self.queue:
+            key, pos = self.queue[0]
+            if self.queued.get(pos) == key:
+                return key, pos
+            heapq.heappop(self.queue)
+        return None
+    
+    def _compute_shortest_path(self):
+        start = self.start
+        while True:
+            top = self._top()
+            if top is None:
+                return
+            old_key, pos = top
+            start_g = self.g.get(start, math.inf)
+            if old_key >= self._key(start) and self.rhs.get(start, math.inf) == start_g:
+                return
+            heapq.heappop(self.queue)
+            del self.queued[pos]
+            self.expansions += 1
+            
+            new_key = self._key(pos)
+            g, rhs = self.g.get(pos, math.inf), self.rhs.get(pos, math.inf)
+            if old_key < new_key:
+                self._push(pos)
+            elif g > rhs:
+                self.g[pos] = rhs
+                for neighbor in get_neighbors(pos, self.grid_size):
+                    self._update_vertex(neighbor)
+            else:
+                self.g[pos] = math.inf
+                self._update_vertex(pos)
+                for neighbor in get_neighbors(pos, self.grid_size):
+                    self._update_vertex(neighbor)
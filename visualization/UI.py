@@ -9,6 +9,7 @@ from agent.agent import Agent
 from agent.kb_safe_agent import KnowledgeBaseSafeAgent
 from agent.kb_safe_moving_wumpus_agent import KnowledgeBaseSafeMovingWumpusAgent
 from agent.random_agent import RandomAgent
+from env_simulator.events import log, INFO
 import re
 import json
 import os
@@ -19,6 +20,9 @@ class WumpusWorldUI:
         self.root.title("Wumpus World Agent Visualization")
         self.root.geometry("1200x800")
         
+        # agent events go to the in-memory buffer shown in the Events tab, not to stdout
+        log.configure(level=INFO, capacity=500)
+        
         # Game state
         self.game_map = None
         self.wumpus_positions = None
@@ -216,6 +220,16 @@ class WumpusWorldUI:
         self.positive_facts_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         positive_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
+        # Agent events tab, read from the event log buffer
+        events_frame = ttk.Frame(self.kb_notebook)
+        self.kb_notebook.add(events_frame, text="Events")
+        
+        self.events_text = tk.Text(events_frame, height=8, width=50)
+        events_scrollbar = ttk.Scrollbar(events_frame, orient="vertical", command=self.events_text.yview)
+        self.events_text.configure(yscrollcommand=events_scrollbar.set)
+        self.events_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        events_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
     def load_images(self):
         try:
             self.images = {
@@ -230,6 +244,7 @@ class WumpusWorldUI:
             self.images = {}
     
     def setup_game(self):
+        log.clear()
         map_type = self.map_type_var.get()
         
         if map_type == "Testcase":
@@ -281,6 +296,10 @@ class WumpusWorldUI:
         else:
             self.step_agent = RandomAgent(self.agent)
         
+        # KB-safe agents walk a committed path home one move per step, so the UI still sees every move
+        if hasattr(self.step_agent, 'execution_mode'):
+            self.step_agent.execution_mode = 'macro'
+        
         self.current_step = 0
         self.game_finished = False
         
@@ -714,6 +733,11 @@ class WumpusWorldUI:
             if hasattr(self.step_agent, 'pathfinding_algorithm'):
                 pathfinding_info = f"\nPathfinding: {self.step_agent.pathfinding_algorithm.upper()}"
 
+            # Committed macro plan, if the agent is walking one
+            plan_info = ""
+            if state.get('committed_plan'):
+                plan_info = f"\nCommitted Plan: {len(state['committed_plan']) - 1} moves to (0,0)"
+
             # Moving Wumpus specific info
             moving_wumpus_info = ""
             if hasattr(self.step_agent, 'current_wumpus_positions'):
@@ -727,7 +751,7 @@ Wumpus Status: {living_count}/{total_count} alive
 Next Wumpus Move: {next_move} actions
 Total Actions: {action_count}"""
 
-            stats = f"""Agent Type: {self.agent_var.get()}{pathfinding_info}{moving_wumpus_info}
+            stats = f"""Agent Type: {self.agent_var.get()}{pathfinding_info}{plan_info}{moving_wumpus_info}
 Position: {state['position']}
 Direction: {draw_direction}
 Score: {state['score']}
@@ -742,6 +766,10 @@ Risk Threshold: {state.get('risk_threshold', 'N/A')}"""
             
             self.stats_text.delete(1.0, tk.END)
             self.stats_text.insert(1.0, stats)
+            
+            self.events_text.delete(1.0, tk.END)
+            self.events_text.insert(1.0, "\n".join(event.message for event in log.recent(100)))
+            self.events_text.see(tk.END)
     
     def show_final_result(self, result):
         """Show final game result as a message box"""